@@ -0,0 +1,153 @@
+"""Compare `IndexedHeap` and `BucketQueue` with `heapq` and lazy deletion.
+
+Each workload runs Dijkstra's algorithm (or Dial's, for integer weights) on
+a random sparse graph, plus a synthetic decrease-key churn, and prints the
+time taken by each queue:
+
+    pdm run python benchmarks/bench_heaps.py --vertices 200000
+
+With `heapq`, a vertex whose distance improves is pushed again and the stale
+entry is skipped when popped, so the heap holds up to one entry per edge.
+The indexed queues hold one entry per vertex and change it in place.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import math
+import random
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+from optimization.set.heaps import BucketQueue, IndexedHeap
+
+Adjacency = List[List[Tuple[int, float]]]
+
+def random_graph(n: int, degree: int, integer_weights: bool, seed: int) -> Adjacency:
+    rng = random.Random(seed)
+    adjacency: Adjacency = [[] for _ in range(n)]
+    for u in range(n):
+        for _ in range(degree):
+            w = rng.randint(1, 10) if integer_weights else rng.random()
+            adjacency[u].append((rng.randrange(n), w))
+    return adjacency
+
+def dijkstra_heapq(adjacency: Adjacency, source: int) -> List[float]:
+    dist = [math.inf] * len(adjacency)
+    dist[source] = 0
+    heap = [(0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue # stale entry
+        for v, w in adjacency[u]:
+            nd = d + w
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+def dijkstra_indexed(arity: int) -> Callable[[Adjacency, int], List[float]]:
+    def run(adjacency: Adjacency, source: int) -> List[float]:
+        dist = [math.inf] * len(adjacency)
+        dist[source] = 0
+        heap: IndexedHeap[int, float] = IndexedHeap([(source, 0)], arity=arity)
+        while heap:
+            u, d = heap.pop_min()
+            for v, w in adjacency[u]:
+                nd = d + w
+                if nd < dist[v]:
+                    dist[v] = nd
+                    heap.decrease_key(v, nd)
+        return dist
+    return run
+
+def dial_buckets(adjacency: Adjacency, source: int) -> List[float]:
+    dist = [math.inf] * len(adjacency)
+    dist[source] = 0
+    queue: BucketQueue[int] = BucketQueue([(source, 0)])
+    while queue:
+        u, d = queue.pop_min()
+        for v, w in adjacency[u]:
+            nd = d + w
+            if nd < dist[v]:
+                dist[v] = nd
+                queue.update(v, nd)
+    return dist
+
+def churn_heapq(priorities: List[float], updates: List[Tuple[int, float]]) -> List[int]:
+    current = list(priorities)
+    heap = [(p, i) for i, p in enumerate(priorities)]
+    heapq.heapify(heap)
+    for i, p in updates:
+        if p < current[i]:
+            current[i] = p
+            heapq.heappush(heap, (p, i))
+
+    order = []
+    while heap:
+        p, i = heapq.heappop(heap)
+        if p == current[i]:
+            current[i] = -math.inf # popped
+            order.append(i)
+    return order
+
+def churn_indexed(priorities: List[float], updates: List[Tuple[int, float]]) -> List[int]:
+    heap: IndexedHeap[int, float] = IndexedHeap(enumerate(priorities))
+    for i, p in updates:
+        heap.decrease_key(i, p)
+
+    order = []
+    while heap:
+        order.append(heap.pop_min()[0])
+    return order
+
+def timed(function, *args) -> Tuple[float, object]:
+    start = perf_counter()
+    result = function(*args)
+    return perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vertices", type=int, default=100_000)
+    parser.add_argument("--degree", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = dict()
+
+    graph = random_graph(args.vertices, args.degree, False, args.seed)
+    reference = None
+    for name, run in [("heapq + lazy deletion", dijkstra_heapq),
+                      ("IndexedHeap (binary)", dijkstra_indexed(2)),
+                      ("IndexedHeap (4-ary)", dijkstra_indexed(4))]:
+        seconds, dist = timed(run, graph, 0)
+        assert reference is None or dist == reference
+        reference = dist
+        results.setdefault("dijkstra, float weights", dict())[name] = seconds
+
+    graph = random_graph(args.vertices, args.degree, True, args.seed)
+    reference = None
+    for name, run in [("heapq + lazy deletion", dijkstra_heapq),
+                      ("IndexedHeap (binary)", dijkstra_indexed(2)),
+                      ("BucketQueue", dial_buckets)]:
+        seconds, dist = timed(run, graph, 0)
+        assert reference is None or dist == reference
+        reference = dist
+        results.setdefault("dijkstra, weights 1-10", dict())[name] = seconds
+
+    rng = random.Random(args.seed)
+    priorities = [rng.random() for _ in range(args.vertices)]
+    updates = [(rng.randrange(args.vertices), rng.random() * 0.5) for _ in range(4 * args.vertices)]
+    for name, run in [("heapq + lazy deletion", churn_heapq), ("IndexedHeap (binary)", churn_indexed)]:
+        results.setdefault("decrease-key churn", dict())[name] = timed(run, priorities, updates)[0]
+
+    for workload, timings in results.items():
+        print(workload)
+        fastest = min(timings.values())
+        for name, seconds in timings.items():
+            print(f"  {name:<24} {seconds:8.3f} s  {seconds / fastest:5.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Measure the memory each representation uses as graphs grow, and how fast it answers and changes.
+
+Each graph is built in a fresh process from random integer edge arrays,
+and the script reports the memory the build kept (traced by `tracemalloc`),
+its peak, the growth of peak RSS, and what `memory_usage(deep=True)` counts.
+It then times `is_adjacent` on random pairs, and `add_edge` followed by
+`remove_edge`. `SortedSet`s of the same number of integers are measured
+alongside. Finally it fits bytes per vertex and per edge to each
+representation, and seconds per operation, the costs
+`recommend_representation` uses:
+
+    pdm run python benchmarks/bench_memory.py --vertices 100 1000 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tracemalloc
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+REPRESENTATIONS = ["NaiveGraph", "AdjacencySet", "IncidenceMatrix"]
+
+# A dense incidence matrix has a float per vertex per edge, so only small ones are built
+MATRIX_LIMIT = 2**29
+
+# The terms of the time per operation that each representation's algorithms make significant:
+# scans of the edge list or of a matrix row, and copies of the whole matrix
+TIME_TERMS = {
+    ("NaiveGraph", "query"): ["edges"], ("NaiveGraph", "mutate"): ["edges"],
+    ("AdjacencySet", "query"): [], ("AdjacencySet", "mutate"): [],
+    ("IncidenceMatrix", "query"): ["edges"], ("IncidenceMatrix", "mutate"): ["pairs"],
+}
+
+# Each operation is timed until this many seconds have passed
+TIME_BUDGET = 0.2
+
+def measure(name: str, n: int, m: int) -> Dict[str, float]:
+    """Build one structure in this process and measure it."""
+    from optimization.graph.graph import Graph, NormalGraph
+    from optimization.graph import EdgeArrays, NaiveGraph, AdjacencySet, IncidenceMatrix
+    from optimization.graph.memory import sizeof
+    from optimization.set import SortedSet
+
+    rng = np.random.default_rng(0)
+    arrays = EdgeArrays(range(n), rng.integers(0, n, m), rng.integers(0, n, m))
+    values = rng.permutation(n).tolist()
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+
+    if name == "SortedSet":
+        built = SortedSet(values)
+        counted = sizeof(built)
+    else:
+        cls = Graph.from_types(NormalGraph, dict(NaiveGraph=NaiveGraph, AdjacencySet=AdjacencySet,
+                                                 IncidenceMatrix=IncidenceMatrix)[name])
+        built = cls.from_edge_arrays(arrays)
+        counted = built.memory_usage(deep=True).total
+
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss *= 1 if sys.platform == "darwin" else 1024
+    result = dict(traced=current, peak=peak, rss=rss, counted=counted)
+    if name != "SortedSet":
+        # Distinct endpoints, since not every representation removes loops it added
+        u = rng.integers(0, n, 10_000)
+        v = (u + rng.integers(1, n, 10_000)) % n
+        result.update(zip(["query", "mutate"], time_operations(built, np.stack((u, v), axis=1).tolist())))
+    return result
+
+def time_operations(graph, pairs: List[List[int]]) -> Tuple[float, float]:
+    """Seconds per `is_adjacent`, and per `add_edge` or `remove_edge`, on random pairs."""
+    seconds = []
+    for operation in ("query", "mutate"):
+        done = 0
+        start = perf_counter()
+        while done < len(pairs) and perf_counter() - start < TIME_BUDGET:
+            u, v = pairs[done]
+            if operation == "query":
+                graph.is_adjacent(u, v)
+            else:
+                graph.add_edge(u, v)
+                graph.remove_edge(graph.create_edge_from_vertices(u, v))
+            done += 1
+
+        seconds.append((perf_counter() - start) / (done if operation == "query" else 2 * done))
+
+    return seconds[0], seconds[1]
+
+def run(name: str, n: int, m: int) -> Dict[str, float]:
+    """Measure in a fresh interpreter, so earlier builds don't hide this one's peak RSS."""
+    result = subprocess.run([sys.executable, __file__, "--child", name, str(n), str(m)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+def fit_time(rows: List[Dict[str, float]], operation: str) -> List[float]:
+    """Least-squares seconds per operation: constant, per vertex, per edge and per vertex per edge."""
+    columns = dict(vertices=np.array([row["vertices"] for row in rows], dtype=float),
+                   edges=np.array([row["edges"] for row in rows], dtype=float))
+    columns["pairs"] = columns["vertices"] * columns["edges"]
+    terms = TIME_TERMS[rows[0]["name"], operation]
+
+    design = np.stack([np.ones(len(rows))] + [columns[term] for term in terms], axis=1)
+    fitted, *_ = np.linalg.lstsq(design, np.array([row[operation] for row in rows]), rcond=None)
+
+    coefficients = dict(zip(["constant"] + terms, np.maximum(fitted, 0).tolist()))
+    return [coefficients.get(term, 0.0) for term in ("constant", "vertices", "edges", "pairs")]
+
+def fit(rows: List[Dict[str, float]]) -> List[float]:
+    """Least-squares bytes per vertex, per edge and per vertex per edge."""
+    n = np.array([row["vertices"] for row in rows], dtype=float)
+    m = np.array([row["edges"] for row in rows], dtype=float)
+    zero = np.zeros_like(n)
+    terms = {"IncidenceMatrix": [n, zero, n * m], "SortedSet": [n, zero, zero]}.get(rows[0]["name"], [n, m, zero])
+
+    design = np.stack(terms, axis=1)
+    coefficients, *_ = np.linalg.lstsq(design, np.array([row["traced"] for row in rows]), rcond=None)
+    return coefficients.tolist()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vertices", type=int, nargs="+", default=[100, 1000, 10_000, 100_000])
+    parser.add_argument("--degrees", type=int, nargs="+", default=[2, 8], help="edges per vertex")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        name, n, m = args.child
+        print(json.dumps(measure(name, int(n), int(m))))
+        return
+
+    rows = []
+    print(f"{'':16} {'vertices':>9} {'edges':>9} {'traced MB':>10} {'peak MB':>9} {'RSS MB':>8} {'counted MB':>11} "
+          f"{'query us':>9} {'mutate us':>10}")
+    for n in args.vertices:
+        cases = [(name, n, d * n) for name in REPRESENTATIONS for d in args.degrees] + [("SortedSet", n, 0)]
+        for name, n, m in cases:
+            if name == "IncidenceMatrix" and 8 * n * m > MATRIX_LIMIT:
+                continue
+
+            row = dict(name=name, vertices=n, edges=m, **run(name, n, m))
+            rows.append(row)
+            print(f"{name:16} {n:9} {m:9} {row['traced'] / 1e6:10.2f} {row['peak'] / 1e6:9.2f} "
+                  f"{row['rss'] / 1e6:8.2f} {row['counted'] / 1e6:11.2f} "
+                  f"{row.get('query', 0) * 1e6:9.2f} {row.get('mutate', 0) * 1e6:10.2f}")
+
+    print("\nBytes per vertex, per edge and per vertex per edge, fitted to the traced memory:")
+    for name in REPRESENTATIONS + ["SortedSet"]:
+        measured = [row for row in rows if row["name"] == name]
+        if len(measured) >= 2:
+            print(f"  {name:16} ({', '.join(f'{c:.1f}' for c in fit(measured))})")
+
+    print("\nSeconds per operation: constant, per vertex, per edge and per vertex per edge:")
+    for name in REPRESENTATIONS:
+        measured = [row for row in rows if row["name"] == name]
+        for operation in ("query", "mutate"):
+            if len(measured) >= 2:
+                print(f"  {name:16} {operation:6} ({', '.join(f'{c:.3g}' for c in fit_time(measured, operation))})")
+
+if __name__ == "__main__":
+    main()
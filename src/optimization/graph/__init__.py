@@ -1,10 +1,64 @@
+from typing import TYPE_CHECKING
+
 from .graph import Edge, DirectedEdge, WeightedEdge, DirectedWeightedEdge
 from .graph import AbstractGraph, GraphRepresentation, GraphType
 from .graph import DirectedGraph, WeightedGraph, DirectedWeightedGraph
 
 from .naive_graph import NaiveGraph
 from .adjacency_set_graph import AdjacencySet
-from .incidence_matrix_graph import IncidenceMatrix
+
+from .cache import CachedGraph
+from .changelog import Change, ChangeLog, ObservableGraph
+from .memory import MemoryUsage, recommend_representation
+
+from . import instrumentation
 
 WeightedDirectedEdge = DirectedWeightedEdge
-WeightedDirectedGraph = DirectedWeightedGraph
\ No newline at end of file
+WeightedDirectedGraph = DirectedWeightedGraph
+
+# Array-backed names are imported on first access, so that `import optimization.graph`
+# does not load NumPy (or SciPy) for programs that only use the set-based representations
+_LAZY = {
+    "IncidenceMatrix": ".incidence_matrix_graph",
+    "EdgeArrays": ".edge_arrays",
+    "CSR": ".edge_arrays",
+    "convert": ".conversion",
+    "to_scipy_sparse": ".conversion",
+    "from_scipy_sparse": ".conversion",
+    "AttributeTable": ".attributes",
+    "AttributedGraph": ".attributes",
+    "SharedGraph": ".sharing",
+    "share": ".sharing",
+    "attach": ".sharing",
+}
+
+__all__ = [
+    "Edge", "DirectedEdge", "WeightedEdge", "DirectedWeightedEdge", "WeightedDirectedEdge",
+    "AbstractGraph", "GraphRepresentation", "GraphType",
+    "DirectedGraph", "WeightedGraph", "DirectedWeightedGraph", "WeightedDirectedGraph",
+    "NaiveGraph", "AdjacencySet",
+    "CachedGraph", "Change", "ChangeLog", "ObservableGraph",
+    "MemoryUsage", "recommend_representation",
+    "instrumentation",
+    *_LAZY,
+]
+
+if TYPE_CHECKING:
+    from .incidence_matrix_graph import IncidenceMatrix
+    from .edge_arrays import EdgeArrays, CSR
+    from .conversion import convert, to_scipy_sparse, from_scipy_sparse
+    from .attributes import AttributeTable, AttributedGraph
+    from .sharing import SharedGraph, share, attach
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+
+    value = getattr(import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -1,15 +1,36 @@
-from typing import Collection, Iterable, Set, Tuple, Dict
-from .graph import Edge, AbstractGraph, GraphRepresentation, V, DirectedGraph
+from __future__ import annotations
 
-class AdjacencySet(GraphRepresentation[V]):
-    def __init__(self, neighbor_dict: Dict[V, Set[V]]):
+from itertools import chain
+from typing import Any, Collection, Iterable, List, Set, Tuple, Dict, TYPE_CHECKING
 
-        if not isinstance(self, DirectedGraph):
-            for v1, neighbors in neighbor_dict.items():
+from .graph import Edge, AbstractGraph, GraphRepresentation, V, DirectedGraph, WeightedGraph
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .edge_arrays import EdgeArrays
+
+class AdjacencySet(GraphRepresentation[V]):
+    def __init__(self, neighbor_dict: Dict[V, Set[V]], edge_weights: Dict[Tuple[V, V], Any] | None = None, symmetric: bool = False):
+        """Args:
+            neighbor_dict: The neighbors of each vertex.
+            edge_weights: The weight of each edge, keyed by (v1, v2).
+            symmetric: For undirected graphs, whether `neighbor_dict` and
+                `edge_weights` already list every edge under both endpoints.
+        """
+
+        if not isinstance(self, DirectedGraph) and not symmetric:
+            for v1, neighbors in list(neighbor_dict.items()):
                 for v2 in neighbors:
                     neighbor_dict.setdefault(v2, set()).add(v1)
 
+            if edge_weights:
+                for (v1, v2), weight in list(edge_weights.items()):
+                    edge_weights.setdefault((v2, v1), weight)
+
         self.neighbor_dict = neighbor_dict
+        self.edge_weights: Dict[Tuple[V, V], Any] = edge_weights if edge_weights is not None else dict()
+        """The weight of each edge, keyed by (v1, v2). Undirected edges are stored under both orders."""
 
     @property
     def vertices(self) -> Iterable[V]:
@@ -42,6 +63,11 @@ class AdjacencySet(GraphRepresentation[V]):
         
         return res
 
+    def degrees(self) -> np.ndarray:
+        import numpy as np
+
+        return np.fromiter(map(len, self.neighbor_dict.values()), dtype=np.int64, count=len(self.neighbor_dict))
+
     def add_vertex(self, v: V):
         self.neighbor_dict.setdefault(v, set())
 
@@ -51,6 +77,10 @@ class AdjacencySet(GraphRepresentation[V]):
         for v1, neighbors in self.neighbor_dict.items():
             neighbors.discard(v)
 
+        if self.edge_weights:
+            for key in [key for key in self.edge_weights if v in key]:
+                del self.edge_weights[key]
+
     def add_edge(self, v1: V, v2: V, weight=None):
         if v1 not in self.neighbor_dict.keys():
             raise ValueError(f"edge[0]: {v1!r} not in vertices")
@@ -62,11 +92,31 @@ class AdjacencySet(GraphRepresentation[V]):
         if not isinstance(self, DirectedGraph):
             self.neighbor_dict[v2].add(v1)
 
+        if weight is not None:
+            self.set_edge_weight(v1, v2, weight)
+
     def remove_edge(self, edge: Edge):
         self.neighbor_dict[edge[0]].remove(edge[1])
+        self.edge_weights.pop((edge[0], edge[1]), None)
         
         if not isinstance(self, DirectedGraph):
             self.neighbor_dict[edge[1]].remove(edge[0])
+            self.edge_weights.pop((edge[1], edge[0]), None)
+
+    def get_edge_weight(self, v1: V, v2: V):
+        if not self.is_adjacent(v1, v2):
+            raise ValueError(f"no edge between {v1!r} and {v2!r}")
+
+        return self.edge_weights.get((v1, v2))
+
+    def set_edge_weight(self, v1: V, v2: V, weight):
+        if not self.is_adjacent(v1, v2):
+            raise ValueError(f"no edge between {v1!r} and {v2!r}")
+
+        self.edge_weights[v1, v2] = weight
+
+        if not isinstance(self, DirectedGraph):
+            self.edge_weights[v2, v1] = weight
 
     @property
     def vertex_count(self) -> int:
@@ -74,15 +124,89 @@ class AdjacencySet(GraphRepresentation[V]):
 
     @property
     def edge_count(self) -> int:
-        return len(self.edges)
+        arcs = sum(map(len, self.neighbor_dict.values()))
+
+        if isinstance(self, DirectedGraph):
+            return arcs
+
+        loops = sum(1 for v, neighbors in self.neighbor_dict.items() if v in neighbors)
+        return (arcs + loops) // 2
+
+    def _memory_components(self) -> List[Tuple[str, Any, str]]:
+        return super()._memory_components() + [
+            ("vertices", self.neighbor_dict, "container"),
+            ("vertices", self.neighbor_dict.keys(), "contents"),
+            ("adjacency", self.neighbor_dict.values(), "contents"),
+            ("edges", self.edge_weights, "all"),
+        ]
+
+    def to_edge_arrays(self) -> EdgeArrays[V]:
+        import numpy as np
+        from .edge_arrays import EdgeArrays, _int_table, _positions
+
+        vertices = list(self.neighbor_dict.keys())
+        degrees = np.fromiter(map(len, self.neighbor_dict.values()), dtype=np.int64, count=len(vertices))
+        neighbors = chain.from_iterable(self.neighbor_dict.values())
+
+        src = np.repeat(np.arange(len(vertices), dtype=np.int64), degrees)
+        table = _int_table(vertices)
+        if table is not None:
+            # Integer vertices are looked up all at once instead of one dict lookup each
+            dst = _positions(table, np.fromiter(neighbors, dtype=np.int64, count=int(degrees.sum())))
+        else:
+            index = {v: i for i, v in enumerate(vertices)}
+            dst = np.fromiter(map(index.__getitem__, neighbors), dtype=np.int64, count=int(degrees.sum()))
+
+        directed = isinstance(self, DirectedGraph)
+        if not directed:
+            # Each undirected edge is stored in both neighbor sets; keep one copy
+            keep = src <= dst
+            src, dst = src[keep], dst[keep]
+
+        weights = None
+        if isinstance(self, WeightedGraph):
+            weights = [self.edge_weights.get((vertices[i], vertices[j])) for i, j in zip(src.tolist(), dst.tolist())]
+
+        return EdgeArrays(vertices, src, dst, weights, directed=directed)
+
+    @classmethod
+    def from_edge_arrays(cls, arrays: EdgeArrays[V]) -> AbstractGraph[V]:
+        from .edge_arrays import _is_identity
+
+        directed = issubclass(cls, DirectedGraph)
+        csr = arrays.to_csr(symmetric=not directed)
+        ptr = csr.indptr.tolist()
+
+        if _is_identity(arrays.vertices):
+            vertices: Any = arrays.vertices
+            ids = csr.indices.tolist()
+        else:
+            vertices = list(arrays.vertices)
+            ids = [vertices[i] for i in csr.indices.tolist()]
+
+        d = {v: set(ids[ptr[i]:ptr[i + 1]]) for i, v in enumerate(vertices)}
+
+        weights = None
+        if arrays.weights is not None:
+            weights = {(vertices[i], vertices[j]): w
+                       for i, j, w in zip(arrays.src.tolist(), arrays.dst.tolist(), arrays.weights.tolist())}
+            if not directed:
+                weights.update({(v2, v1): w for (v1, v2), w in weights.items()})
+
+        return cls(d, weights, symmetric=True)
 
     @classmethod
     def from_vertices_and_edges(cls, vertices: Collection[V], edges: Collection[Edge[V]]) -> AbstractGraph[V]:
         d = {v: set() for v in vertices}
+        weights = dict()
         for edge in edges:
             d.setdefault(edge[0], set()).add(edge[1])
 
-        return cls(d)
+            weight = getattr(edge, "weight", None)
+            if weight is not None:
+                weights[edge[0], edge[1]] = weight
+
+        return cls(d, weights)
 
     @classmethod
     def _empty_graph(cls) -> AbstractGraph[V]:
@@ -0,0 +1,8 @@
+from .triangles import triangle_count, triangles, local_clustering, global_clustering, common_neighbors, jaccard
+from .directed import CycleError, Condensation, strongly_connected_components, condensation, topological_sort, is_acyclic
+from .coloring import greedy_coloring, dsatur_coloring, tabu_coloring, is_proper_coloring
+from .cores import core_numbers, degeneracy, degeneracy_ordering, k_core
+from .centrality import betweenness_centrality
+from .matching import maximum_matching, maximum_weight_matching, bipartition
+from .routing import Tour, Routes, solve_tsp, tour_cost, clarke_wright
+from .dynamic import DynamicShortestPaths, DynamicReachability
@@ -0,0 +1,49 @@
+"""Array extraction shared by the graph algorithms."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable, TypeVar
+
+import numpy as np
+
+from ..graph import AbstractGraph
+from ..edge_arrays import EdgeArrays
+
+R = TypeVar('R')
+
+def memoized(graph: AbstractGraph, key: Hashable, compute: Callable[[], R]) -> R:
+    """Compute a whole-graph result, reusing it while a `CachedGraph` is unchanged."""
+    memoize = getattr(graph, "memoize", None)
+    if memoize is None:
+        return compute()
+
+    return memoize(key, compute)
+
+def edge_arrays(graph: AbstractGraph | EdgeArrays) -> EdgeArrays:
+    if isinstance(graph, EdgeArrays):
+        return graph
+
+    return memoized(graph, ("edge_arrays",), graph.to_edge_arrays)
+
+def simple_adjacency(graph: AbstractGraph | EdgeArrays) -> Any:
+    """The 0/1 symmetric CSR adjacency of a graph, ignoring direction, loops and parallel edges."""
+    def compute():
+        import scipy.sparse
+
+        arrays = edge_arrays(graph)
+        keep = arrays.src != arrays.dst
+        src, dst = arrays.src[keep], arrays.dst[keep]
+
+        n = arrays.vertex_count
+        adjacency = scipy.sparse.coo_array((np.ones(2 * len(src), dtype=np.int64),
+                                            (np.concatenate((src, dst)), np.concatenate((dst, src)))),
+                                           shape=(n, n)).tocsr()
+        adjacency.sum_duplicates()
+        adjacency.data[:] = 1
+        adjacency.sort_indices()
+        return adjacency
+
+    if isinstance(graph, EdgeArrays):
+        return compute()
+
+    return memoized(graph, ("simple_adjacency",), compute)
@@ -0,0 +1,223 @@
+"""Betweenness centrality with Brandes' algorithm.
+
+The betweenness of a vertex is the sum, over all pairs of other vertices, of
+the fraction of shortest paths between them that pass through it. Brandes'
+algorithm finds it with one shortest-path search per source vertex, so large
+graphs are handled by sampling sources, by spreading the sources over worker
+processes, or both:
+
+>>> from optimization.graph.algorithms.centrality import betweenness_centrality
+>>> scores = betweenness_centrality(g, sample=500, workers=8, seed=0)
+
+Workers read the graph's CSR adjacency from shared memory rather than
+receiving a pickled copy, and each sends back the partial sums for its
+sources, which are added up at the end.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple, TypeVar
+
+import numpy as np
+
+from ..graph import AbstractGraph
+from ..edge_arrays import CSR, EdgeArrays
+from ..sharing import attach, share
+from ._common import edge_arrays, memoized
+
+V = TypeVar('V')
+
+def betweenness_centrality(graph: AbstractGraph[V] | EdgeArrays[V], normalized: bool = True,
+                           weighted: bool = True, sample: int | None = None, seed=None,
+                           workers: int | None = 1) -> np.ndarray:
+    """Returns the betweenness centrality of each vertex, in the order of `graph.vertices`.
+
+    Args:
+        graph: The graph. Directed graphs are searched along their arcs,
+            undirected graphs along edges in both directions. Loops are
+            ignored, and parallel edges count once, with the smallest weight.
+        normalized: Divide by the number of ordered pairs of other vertices,
+            (n - 1)(n - 2), so scores lie in [0, 1]. Otherwise each unordered
+            pair of an undirected graph is counted once.
+        weighted: Use edge weights, where the graph has them, as lengths
+            (found with Dijkstra's algorithm). Otherwise every edge has length
+            1 (found with breadth-first search). Weights must be non-negative.
+        sample: Estimate the scores from this many source vertices, chosen
+            uniformly at random, rather than from all of them.
+        seed: Seed for the random number generator used for sampling.
+        workers: The number of worker processes, or None for one per CPU.
+
+    Returns:
+        The centrality of each vertex.
+    """
+    arrays = edge_arrays(graph)
+    weighted = weighted and arrays.weights is not None
+    n = arrays.vertex_count
+
+    if weighted and np.any(arrays.weights < 0):
+        raise ValueError("Edge weights must be non-negative")
+
+    if sample is None or sample >= n:
+        sources = np.arange(n)
+    else:
+        sources = np.sort(np.random.default_rng(seed).choice(n, sample, replace=False))
+
+    def compute():
+        csr = _shortest_path_csr(arrays, weighted)
+        scores = _run(csr, sources, weighted, workers)
+
+        scale = 1.0
+        if normalized:
+            scale = 1 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+        elif not arrays.directed:
+            scale = 0.5
+        if len(sources) < n:
+            scale *= n / max(len(sources), 1)
+
+        return scores * scale
+
+    if isinstance(graph, EdgeArrays) or len(sources) < n:
+        return compute()
+
+    scores = memoized(graph, ("betweenness_centrality", normalized, weighted), compute)
+    scores.flags.writeable = False
+    return scores
+
+def _shortest_path_csr(arrays: EdgeArrays, weighted: bool) -> CSR:
+    """The adjacency searched from each source, without loops or parallel edges."""
+    n = arrays.vertex_count
+    src, dst = arrays.src, arrays.dst
+    weights = arrays.weights.astype(float) if weighted else np.ones(len(src))
+
+    if not arrays.directed:
+        src, dst, weights = np.concatenate((src, dst)), np.concatenate((dst, src)), np.concatenate((weights, weights))
+
+    keep = src != dst
+    keys = src[keep] * n + dst[keep]
+    weights = weights[keep]
+
+    # Sort by arc, then weight, and keep the lightest of each run of parallel arcs
+    order = np.lexsort((weights, keys))
+    keys, weights = keys[order], weights[order]
+    first = np.concatenate(([True], keys[1:] != keys[:-1])) if len(keys) else np.zeros(0, dtype=bool)
+    keys, weights = keys[first], weights[first]
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // max(n, 1), minlength=n), out=indptr[1:])
+
+    return CSR(indptr, keys % max(n, 1), weights if weighted else None)
+
+def _run(csr: CSR, sources: np.ndarray, weighted: bool, workers: int | None) -> np.ndarray:
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    workers = min(workers, len(sources))
+    if workers <= 1:
+        return _accumulate(csr, sources, weighted)
+
+    # A few chunks per worker balance the load when some sources reach more of the graph
+    chunks = np.array_split(sources, workers * 4)
+    with share(csr) as shared, ProcessPoolExecutor(workers) as pool:
+        partials = pool.map(_worker, [shared.handle] * len(chunks), chunks, [weighted] * len(chunks))
+        return np.sum(list(partials), axis=0)
+
+def _worker(handle: Dict[str, Any], sources: np.ndarray, weighted: bool) -> np.ndarray:
+    return _accumulate(attach(handle), sources, weighted)
+
+def _accumulate(csr: CSR, sources: np.ndarray, weighted: bool) -> np.ndarray:
+    """Sum the dependencies of every vertex on the given sources."""
+    scores = np.zeros(csr.vertex_count)
+
+    if weighted:
+        indptr, indices, data = csr.indptr.tolist(), csr.indices.tolist(), csr.data.tolist() # type: ignore
+        for s in sources.tolist():
+            _dijkstra_dependencies(indptr, indices, data, s, scores)
+    else:
+        for s in sources.tolist():
+            _bfs_dependencies(csr, s, scores)
+
+    return scores
+
+def _bfs_dependencies(csr: CSR, s: int, scores: np.ndarray):
+    """Brandes' accumulation for unit lengths, vectorized over each BFS level."""
+    indptr, indices = csr.indptr, csr.indices
+
+    dist = np.full(csr.vertex_count, -1, dtype=np.int64)
+    sigma = np.zeros(csr.vertex_count)
+    dist[s], sigma[s] = 0, 1.0
+
+    frontier = np.array([s], dtype=np.int64)
+    levels: List[Tuple[np.ndarray, np.ndarray]] = []
+    depth = 0
+
+    while len(frontier):
+        starts = indptr[frontier]
+        lengths = indptr[frontier + 1] - starts
+        offsets = np.cumsum(lengths) - lengths
+        u = np.repeat(frontier, lengths)
+        w = indices[np.repeat(starts - offsets, lengths) + np.arange(len(u))]
+
+        depth += 1
+        new = w[dist[w] < 0]
+        dist[new] = depth
+
+        # Arcs into the next level lie on shortest paths
+        on_path = dist[w] == depth
+        u, w = u[on_path], w[on_path]
+        np.add.at(sigma, w, sigma[u])
+
+        levels.append((u, w))
+        new.sort()
+        frontier = new[np.concatenate(([True], new[1:] != new[:-1]))] if len(new) else new
+
+    delta = np.zeros(csr.vertex_count)
+    for u, w in reversed(levels):
+        np.add.at(delta, u, sigma[u] / sigma[w] * (1 + delta[w]))
+
+    delta[s] = 0
+    scores += delta
+
+def _dijkstra_dependencies(indptr: List[int], indices: List[int], data: List[float], s: int, scores: np.ndarray):
+    """Brandes' accumulation for weighted lengths, with a binary heap."""
+    n = len(indptr) - 1
+    dist = [-1.0] * n
+    best: Dict[int, float] = {s: 0.0}
+    sigma = [0.0] * n
+    sigma[s] = 1.0
+    predecessors: Dict[int, List[int]] = {s: []}
+    order: List[int] = []
+
+    heap = [(0.0, s)]
+    while heap:
+        d, v = heapq.heappop(heap)
+        if dist[v] >= 0:
+            continue
+
+        dist[v] = d
+        order.append(v)
+
+        for i in range(indptr[v], indptr[v + 1]):
+            w = indices[i]
+            dw = d + data[i]
+
+            if dist[w] >= 0:
+                continue
+            if w not in best or dw < best[w]:
+                best[w] = dw
+                sigma[w] = sigma[v]
+                predecessors[w] = [v]
+                heapq.heappush(heap, (dw, w))
+            elif dw == best[w]:
+                sigma[w] += sigma[v]
+                predecessors[w].append(v)
+
+    delta = [0.0] * n
+    for w in reversed(order):
+        coefficient = (1 + delta[w]) / sigma[w]
+        for v in predecessors[w]:
+            delta[v] += sigma[v] * coefficient
+        if w != s:
+            scores[w] += delta[w]
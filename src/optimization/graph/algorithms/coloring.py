@@ -0,0 +1,256 @@
+"""Vertex coloring heuristics.
+
+Every solver returns an array holding a color `0, 1, ...` for each vertex, in
+the order of `graph.vertices`, such that adjacent vertices get different
+colors. Direction and parallel edges are ignored, and so are loops, which no
+proper coloring could satisfy.
+
+>>> from optimization.graph.algorithms.coloring import dsatur_coloring, tabu_coloring
+>>> colors = dsatur_coloring(g)
+>>> colors = tabu_coloring(g, colors, time_limit=1.0) # try to use fewer colors
+
+The colors forbidden to each vertex (those already used by its neighbors) are
+kept as a bitset in a Python integer, so the smallest free color is found in
+constant time with bit tricks rather than by scanning the neighbors.
+"""
+
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Any, List, Sequence, TypeVar
+
+import numpy as np
+
+from ..graph import AbstractGraph
+from ..edge_arrays import EdgeArrays
+from ._common import edge_arrays, simple_adjacency
+from .cores import _decomposition
+
+V = TypeVar('V')
+
+STRATEGIES = ("largest_first", "smallest_last", "random")
+
+def greedy_coloring(graph: AbstractGraph[V] | EdgeArrays[V], strategy: str | Sequence[V] = "largest_first",
+                    restarts: int = 1, seed=None) -> np.ndarray:
+    """Color vertices one at a time, giving each the smallest color not used by its neighbors.
+
+    Args:
+        graph: The graph to color.
+        strategy: The order in which vertices are colored:
+            - "largest_first": by decreasing degree.
+            - "smallest_last": the reverse of a degeneracy ordering (always
+              removing a vertex of smallest remaining degree), which uses at
+              most degeneracy + 1 colors.
+            - "random": a random order.
+            - A sequence of every vertex, colored in that order.
+        restarts: The number of random orders to try with the "random"
+            strategy. The coloring with the fewest colors is returned.
+        seed: Seed for the random number generator.
+
+    Returns:
+        The color of each vertex.
+    """
+    adjacency = simple_adjacency(graph)
+    indptr, indices = adjacency.indptr.tolist(), adjacency.indices.tolist()
+    n = len(indptr) - 1
+
+    if not isinstance(strategy, str):
+        arrays = edge_arrays(graph)
+        order = [arrays.index_of(v) for v in strategy]
+        if sorted(order) != list(range(n)):
+            raise ValueError("strategy must order every vertex exactly once")
+        return _greedy(indptr, indices, order)
+
+    if strategy == "largest_first":
+        return _greedy(indptr, indices, np.argsort(-np.diff(adjacency.indptr), kind="stable").tolist())
+    if strategy == "smallest_last":
+        return _greedy(indptr, indices, _decomposition(graph)[1][::-1].tolist())
+    if strategy != "random":
+        raise ValueError(f"Unknown strategy {strategy!r}, expected one of {STRATEGIES}")
+
+    rng = np.random.default_rng(seed)
+    best = None
+    for _ in range(max(restarts, 1)):
+        colors = _greedy(indptr, indices, rng.permutation(n).tolist())
+        if best is None or colors.max(initial=-1) < best.max(initial=-1):
+            best = colors
+
+    return best # type: ignore
+
+def dsatur_coloring(graph: AbstractGraph[V] | EdgeArrays[V]) -> np.ndarray:
+    """Color vertices greedily, always picking the vertex whose neighbors use the most distinct colors.
+
+    This is Brélaz's DSATUR heuristic. Vertices wait in a bucket queue keyed
+    by their saturation (the number of distinct colors among their
+    neighbors), so each step takes constant time plus the degree of the
+    colored vertex. Ties go to the vertex that reached its saturation most
+    recently. Among still uncolored vertices of saturation 0, that is the
+    one of highest degree, so the first vertex colored has the highest
+    degree. Unlike Brélaz's heuristic, later ties are not broken by degree,
+    which would take a heap instead of buckets.
+
+    Returns:
+        The color of each vertex.
+    """
+    adjacency = simple_adjacency(graph)
+    indptr, indices = adjacency.indptr.tolist(), adjacency.indices.tolist()
+    degrees = np.diff(adjacency.indptr)
+    n = len(degrees)
+
+    # Buckets pop their most recently inserted vertex, so insert by increasing degree
+    buckets: List[dict] = [dict() for _ in range(int(degrees.max(initial=0)) + 2)]
+    for v in np.argsort(degrees, kind="stable").tolist():
+        buckets[0][v] = None
+
+    forbidden = [0] * n
+    colors = [-1] * n
+    top = 0
+
+    for _ in range(n):
+        while not buckets[top]:
+            top -= 1
+        v, _ = buckets[top].popitem()
+
+        mask = forbidden[v]
+        color = (~mask & (mask + 1)).bit_length() - 1
+        colors[v] = color
+        bit = 1 << color
+
+        for w in indices[indptr[v]:indptr[v + 1]]:
+            if colors[w] < 0 and not forbidden[w] & bit:
+                saturation = forbidden[w].bit_count()
+                del buckets[saturation][w]
+                forbidden[w] |= bit
+                buckets[saturation + 1][w] = None
+                top = max(top, saturation + 1)
+
+    return np.asarray(colors, dtype=np.int64)
+
+def tabu_coloring(graph: AbstractGraph[V] | EdgeArrays[V], colors: Any = None, max_iterations: int = 100_000,
+                  time_limit: float | None = None, seed=None) -> np.ndarray:
+    """Try to reduce the number of colors of a proper coloring with tabu search.
+
+    Starting from `colors`, each vertex of the highest color is recolored
+    with the color fewest of its neighbors use, and TabuCol (Hertz and de Werra) moves single conflicting
+    vertices to other colors until no edge has equally colored endpoints.
+    Moving a vertex back to a color it just left is forbidden for a number of
+    iterations that grows with the number of conflicts, unless the move gives
+    the fewest conflicts seen so far. This repeats with one color fewer each
+    time until the iteration or time budget runs out.
+
+    Args:
+        graph: The graph to color.
+        colors: A proper coloring to improve. Defaults to `dsatur_coloring(graph)`.
+        max_iterations: The total number of moves allowed.
+        time_limit: Stop after this many seconds.
+        seed: Seed for the random number generator.
+
+    Returns:
+        The proper coloring with the fewest colors found.
+    """
+    adjacency = simple_adjacency(graph)
+    n = adjacency.shape[0]
+
+    best = dsatur_coloring(graph) if colors is None else np.array(colors, dtype=np.int64)
+    if best.shape != (n,):
+        raise ValueError("Need one color per vertex")
+
+    rng = np.random.default_rng(seed)
+    deadline = None if time_limit is None else perf_counter() + time_limit
+    budget = [max_iterations]
+
+    rows = np.repeat(np.arange(n), np.diff(adjacency.indptr))
+
+    k = int(best.max(initial=0))
+    while k > 1:
+        # The vertices of the highest color are independent, so each can take
+        # the color fewest of its neighbors use without affecting the others
+        over = np.flatnonzero(best == k)
+        counts = np.bincount(rows * (k + 1) + best[adjacency.indices], minlength=n * (k + 1)).reshape(n, k + 1)
+        start = best.copy()
+        start[over] = np.argmin(counts[over, :k] + rng.random((len(over), k)), axis=1)
+
+        improved = _tabucol(adjacency, start, k, budget, deadline, rng)
+        if improved is None:
+            break
+
+        best = improved
+        k = int(best.max(initial=0))
+
+    return best
+
+def is_proper_coloring(graph: AbstractGraph[V] | EdgeArrays[V], colors: Any) -> bool:
+    """True if every edge between distinct vertices has differently colored endpoints."""
+    arrays = edge_arrays(graph)
+    colors = np.asarray(colors)
+    if colors.shape != (arrays.vertex_count,):
+        raise ValueError("Need one color per vertex")
+
+    keep = arrays.src != arrays.dst
+    return not np.any(colors[arrays.src[keep]] == colors[arrays.dst[keep]])
+
+def _greedy(indptr: List[int], indices: List[int], order: List[int]) -> np.ndarray:
+    forbidden = [0] * (len(indptr) - 1)
+    colors = [-1] * (len(indptr) - 1)
+
+    for v in order:
+        mask = forbidden[v]
+        # The lowest zero bit of the mask is the smallest free color
+        color = (~mask & (mask + 1)).bit_length() - 1
+        colors[v] = color
+
+        bit = 1 << color
+        for w in indices[indptr[v]:indptr[v + 1]]:
+            forbidden[w] |= bit
+
+    return np.asarray(colors, dtype=np.int64)
+
+def _tabucol(adjacency: Any, colors: np.ndarray, k: int, budget: List[int], deadline: float | None,
+             rng: np.random.Generator) -> np.ndarray | None:
+    """Search for a proper k-coloring from `colors`, spending moves from `budget`."""
+    indptr, indices = adjacency.indptr, adjacency.indices
+    n = len(colors)
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+
+    # gamma[v, c] is the number of neighbors of v colored c
+    gamma = np.bincount(rows * k + colors[indices], minlength=n * k).reshape(n, k)
+    own = gamma[np.arange(n), colors]
+    conflicts = int(own.sum()) // 2
+    best_conflicts = conflicts
+
+    tabu = np.zeros((n, k), dtype=np.int64)
+    iteration = 0
+
+    while conflicts > 0:
+        if budget[0] <= 0 or (deadline is not None and perf_counter() > deadline):
+            return None
+        budget[0] -= 1
+        iteration += 1
+
+        conflicting = np.flatnonzero(own > 0)
+        delta = gamma[conflicting] - own[conflicting][:, None]
+        delta[np.arange(len(conflicting)), colors[conflicting]] = n
+
+        allowed = (tabu[conflicting] < iteration) | (conflicts + delta < best_conflicts)
+        delta = np.where(allowed, delta, n)
+
+        candidates = np.flatnonzero(delta.ravel() == delta.min())
+        pick = int(candidates[rng.integers(len(candidates))])
+        v, color = int(conflicting[pick // k]), pick % k
+        if delta[pick // k, color] >= n:
+            # Every move is tabu: take a random one
+            color = int((colors[v] + rng.integers(1, k)) % k)
+
+        old = colors[v]
+        conflicts += int(gamma[v, color] - gamma[v, old])
+        best_conflicts = min(best_conflicts, conflicts)
+        tabu[v, old] = iteration + int(rng.integers(10)) + int(0.6 * len(conflicting))
+
+        neighbors = indices[indptr[v]:indptr[v + 1]]
+        gamma[neighbors, old] -= 1
+        gamma[neighbors, color] += 1
+        colors[v] = color
+        own[neighbors] = gamma[neighbors, colors[neighbors]]
+        own[v] = gamma[v, color]
+
+    return colors
@@ -0,0 +1,114 @@
+"""k-core decomposition and degeneracy ordering.
+
+The k-core of a graph is its largest subgraph in which every vertex has at
+least k neighbors, and the core number of a vertex is the largest k for which
+it belongs to the k-core. Direction, loops and parallel edges are ignored.
+
+Cores are cheap to compute and make a good pruning step before expensive
+solvers: a clique of size k lies in the (k - 1)-core, and a graph whose
+largest core number is d can be colored with d + 1 colors.
+
+>>> from optimization.graph.algorithms.cores import k_core
+>>> pruned = k_core(g, 3) # a new graph of the same class
+"""
+
+from __future__ import annotations
+
+from typing import List, Tuple, TypeVar
+
+import numpy as np
+
+from ..graph import AbstractGraph
+from ..edge_arrays import EdgeArrays, vertex_array
+from ._common import edge_arrays, memoized, simple_adjacency
+
+V = TypeVar('V')
+
+def core_numbers(graph: AbstractGraph[V] | EdgeArrays[V]) -> np.ndarray:
+    """Returns the core number of each vertex, in the order of `graph.vertices`."""
+    return _decomposition(graph)[0]
+
+def degeneracy(graph: AbstractGraph[V] | EdgeArrays[V]) -> int:
+    """Returns the largest core number in the graph, or 0 if it has no vertices."""
+    return int(core_numbers(graph).max(initial=0))
+
+def degeneracy_ordering(graph: AbstractGraph[V] | EdgeArrays[V]) -> List[V]:
+    """Order the vertices by repeatedly removing a vertex of smallest remaining degree.
+
+    Each vertex has at most `degeneracy(graph)` neighbors later in the order.
+    Core numbers are non-decreasing along it.
+    """
+    order = _decomposition(graph)[1]
+    return vertex_array(edge_arrays(graph).vertices)[order].tolist()
+
+def k_core(graph: AbstractGraph[V] | EdgeArrays[V], k: int) -> AbstractGraph[V] | EdgeArrays[V]:
+    """Returns the k-core of a graph.
+
+    The original graph is left unchanged. The vertices and edges kept are
+    copied into a new graph of the same class through its `from_edge_arrays`,
+    or into new `EdgeArrays` if `graph` is one.
+    """
+    arrays = edge_arrays(graph)
+    keep = core_numbers(graph) >= k
+
+    # Renumber the surviving vertices 0, 1, ... in their original order
+    new_id = np.cumsum(keep) - 1
+    kept = np.flatnonzero(keep)
+    edges = keep[arrays.src] & keep[arrays.dst]
+
+    vertices = vertex_array(arrays.vertices)[kept].tolist()
+    core = EdgeArrays(vertices, new_id[arrays.src[edges]], new_id[arrays.dst[edges]],
+                      None if arrays.weights is None else arrays.weights[edges],
+                      directed=arrays.directed)
+
+    if isinstance(graph, EdgeArrays):
+        return core
+
+    return type(graph).from_edge_arrays(core)
+
+def _decomposition(graph: AbstractGraph | EdgeArrays) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the core numbers and the degeneracy ordering as vertex ids."""
+    def compute():
+        adjacency = simple_adjacency(graph)
+        return _batagelj_zaversnik(adjacency.indptr, adjacency.indices)
+
+    if isinstance(graph, EdgeArrays):
+        return compute()
+
+    return memoized(graph, ("core_decomposition",), compute)
+
+def _batagelj_zaversnik(indptr: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """The O(V + E) core decomposition of Batagelj and Zaversnik.
+
+    `vert` holds the vertices sorted by current degree, `pos` the position of
+    each vertex in `vert`, and `first[d]` the first position of degree d. When a
+    neighbor's degree drops, it is swapped to the front of its degree's block
+    and the block boundary moves past it, keeping `vert` sorted in O(1).
+    """
+    degrees = np.diff(indptr)
+    order = np.argsort(degrees, kind="stable")
+    position = np.empty_like(order)
+    position[order] = np.arange(len(order))
+
+    start = np.zeros(int(degrees.max(initial=0)) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(degrees)[:-1], out=start[1:])
+
+    deg, vert, pos, first = degrees.tolist(), order.tolist(), position.tolist(), start.tolist()
+    indptr, indices = indptr.tolist(), indices.tolist()
+
+    for i in range(len(vert)):
+        v = vert[i]
+        dv = deg[v]
+
+        for u in indices[indptr[v]:indptr[v + 1]]:
+            du = deg[u]
+            if du > dv:
+                pu, pw = pos[u], first[du]
+                w = vert[pw]
+                if u != w:
+                    vert[pu], vert[pw] = w, u
+                    pos[u], pos[w] = pw, pu
+                first[du] += 1
+                deg[u] = du - 1
+
+    return np.asarray(deg, dtype=np.int64), np.asarray(vert, dtype=np.int64)
@@ -0,0 +1,216 @@
+"""Strongly connected components, topological sorting and condensation.
+
+The algorithms run on a CSR adjacency extracted once from the graph, with
+explicit stacks instead of recursion, so they handle graphs with tens of
+millions of vertices without reaching Python's recursion limit. Undirected
+edges are followed in both directions.
+
+Components are numbered in topological order of the condensation: every arc
+between two components points from the lower to the higher number.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import List, NamedTuple, TypeVar
+
+import numpy as np
+
+from ..graph import AbstractGraph
+from ..edge_arrays import CSR, EdgeArrays, vertex_array
+from ._common import edge_arrays, memoized
+
+V = TypeVar('V')
+
+class CycleError(ValueError):
+    """Raised when a topological order is requested for a graph with a cycle.
+
+    Attributes:
+        cycle: The vertices of one cycle in the graph, in order. The last
+            vertex has an arc back to the first.
+    """
+
+    def __init__(self, cycle: List):
+        super().__init__(f"Graph has a cycle: {cycle!r}")
+        self.cycle = cycle
+
+
+class Condensation(NamedTuple):
+    """A graph with each strongly connected component contracted to a single vertex.
+
+    Attributes:
+        labels: The component number of each vertex, in the order of
+            `graph.vertices`.
+        components: The vertices of each component.
+        dag: The arcs between components, without duplicates, as directed
+            edge arrays over `range(len(components))`.
+    """
+    labels: np.ndarray
+    components: List[List]
+    dag: EdgeArrays[int]
+
+
+def strongly_connected_components(graph: AbstractGraph[V] | EdgeArrays[V]) -> List[List[V]]:
+    """Returns the vertices of each strongly connected component, in topological order."""
+    return condensation(graph).components
+
+def condensation(graph: AbstractGraph[V] | EdgeArrays[V]) -> Condensation:
+    """Returns the condensation DAG of the graph."""
+    def compute():
+        arrays = edge_arrays(graph)
+        labels = _tarjan(_out_csr(graph))
+        count = int(labels.max()) + 1 if len(labels) else 0
+
+        # Group vertices by label with a stable sort, keeping their relative order
+        order = np.argsort(labels, kind="stable")
+        bounds = np.cumsum(np.bincount(labels, minlength=count))[:-1]
+        vertices = vertex_array(arrays.vertices)[order]
+        components = [c.tolist() for c in np.split(vertices, bounds)] if count else []
+
+        src, dst = labels[arrays.src], labels[arrays.dst]
+        keep = src != dst
+        keys = np.sort(src[keep] * count + dst[keep])
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+
+        return Condensation(labels, components, EdgeArrays(range(count), keys // max(count, 1), keys % max(count, 1), directed=True))
+
+    if isinstance(graph, EdgeArrays):
+        return compute()
+
+    return memoized(graph, ("condensation",), compute)
+
+def topological_sort(graph: AbstractGraph[V] | EdgeArrays[V]) -> List[V]:
+    """Order the vertices so that every arc points from an earlier to a later vertex.
+
+    Uses Kahn's algorithm. Ties are broken by the order of `graph.vertices`,
+    so the result is deterministic.
+
+    Raises:
+        CycleError: The graph has a cycle, which is reported on the exception.
+    """
+    arrays = edge_arrays(graph)
+    csr = _out_csr(graph)
+    n = csr.vertex_count
+
+    indptr, indices = csr.indptr.tolist(), csr.indices.tolist()
+    in_degree = np.bincount(csr.indices, minlength=n).tolist()
+
+    queue = deque(v for v in range(n) if in_degree[v] == 0)
+    order: List[int] = []
+
+    while queue:
+        v = queue.popleft()
+        order.append(v)
+
+        for w in indices[indptr[v]:indptr[v + 1]]:
+            in_degree[w] -= 1
+            if in_degree[w] == 0:
+                queue.append(w)
+
+    vertices = vertex_array(arrays.vertices)
+    if len(order) < n:
+        cycle = _find_cycle(csr, np.asarray(in_degree) > 0)
+        raise CycleError(vertices[cycle].tolist())
+
+    return vertices[np.asarray(order, dtype=np.int64)].tolist()
+
+def is_acyclic(graph: AbstractGraph[V] | EdgeArrays[V]) -> bool:
+    """True if the graph has no cycles, counting loops and, for undirected graphs, any edge."""
+    result = condensation(graph)
+    arrays = edge_arrays(graph)
+    return len(result.components) == arrays.vertex_count and not np.any(arrays.src == arrays.dst)
+
+def _out_csr(graph: AbstractGraph | EdgeArrays) -> CSR:
+    def compute():
+        return edge_arrays(graph).to_csr()
+
+    if isinstance(graph, EdgeArrays):
+        return compute()
+
+    return memoized(graph, ("out_csr",), compute)
+
+def _tarjan(csr: CSR) -> np.ndarray:
+    """Label strongly connected components with an iterative version of Tarjan's algorithm.
+
+    Tarjan's algorithm completes components in reverse topological order, so
+    the labels are flipped at the end.
+    """
+    n = csr.vertex_count
+    indptr, indices = csr.indptr.tolist(), csr.indices.tolist()
+
+    index = [-1] * n
+    low = [0] * n
+    label = [-1] * n
+    cursor = indptr[:-1]
+
+    counter = 0
+    count = 0
+    stack: List[int] = []
+
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        work = [root]
+
+        while work:
+            v = work[-1]
+            i, end = cursor[v], indptr[v + 1]
+
+            while i < end:
+                w = indices[i]
+                i += 1
+
+                if index[w] < 0:
+                    break
+                # A visited vertex without a label is still on the stack
+                if label[w] < 0 and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                w = -1
+
+            cursor[v] = i
+            if w >= 0:
+                index[w] = low[w] = counter
+                counter += 1
+                stack.append(w)
+                work.append(w)
+                continue
+
+            work.pop()
+            if work and low[v] < low[work[-1]]:
+                low[work[-1]] = low[v]
+
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    label[w] = count
+                    if w == v:
+                        break
+                count += 1
+
+    return count - 1 - np.asarray(label, dtype=np.int64)
+
+def _find_cycle(csr: CSR, remaining: np.ndarray) -> np.ndarray:
+    """Find a cycle among the vertices Kahn's algorithm could not order.
+
+    Each of them has a predecessor that is also remaining, so walking
+    predecessors must eventually revisit a vertex.
+    """
+    rows = np.repeat(np.arange(csr.vertex_count, dtype=np.int64), csr.degrees())
+    keep = remaining[rows] & remaining[csr.indices]
+    predecessors = EdgeArrays(range(csr.vertex_count), csr.indices[keep], rows[keep], directed=True).to_csr()
+
+    seen = dict()
+    path: List[int] = []
+    v = int(np.flatnonzero(remaining)[0])
+
+    while v not in seen:
+        seen[v] = len(path)
+        path.append(v)
+        v = int(predecessors.row(v)[0])
+
+    return np.asarray(path[seen[v]:][::-1], dtype=np.int64)
@@ -0,0 +1,324 @@
+"""Single-source shortest paths and reachability kept up to date under graph updates.
+
+`DynamicShortestPaths` computes a shortest-path tree once and then repairs
+it after each mutation, touching only the vertices whose distance can have
+changed. On an `ObservableGraph` it follows the graph's mutations itself:
+
+>>> from optimization.graph.algorithms.dynamic import DynamicShortestPaths
+>>> paths = DynamicShortestPaths(g, "depot")
+>>> g.add_edge("depot", "x", 2.0)
+>>> paths.distance("x")
+2.0
+
+Updates follow Ramalingam and Reps. A new or cheaper arc that shortens the
+path to its head runs Dijkstra's algorithm outward from the head, stopping
+wherever distances do not improve. A removed or dearer tree arc walks the
+subtree below it in order of distance; a vertex with another tight incoming
+arc from outside the subtree keeps its distance and its descendants, and
+only the rest are re-settled from their unaffected in-neighbors. Once an
+update affects more than `recompute_fraction` of the vertices, the tree is
+recomputed from scratch instead.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Dict, Generic, List, Set, Tuple, TypeVar
+
+from ..graph import AbstractGraph
+from ..changelog import Change, ObservableGraph
+from ._common import edge_arrays
+
+V = TypeVar('V')
+
+class DynamicShortestPaths(Generic[V]):
+    """Distances and a shortest-path tree from one source, repaired after each graph update.
+
+    Args:
+        graph: The graph. Directed graphs are searched along their arcs,
+            undirected graphs along edges in both directions. Parallel edges
+            count with their smallest weight and loops are ignored.
+        source: The vertex the distances are measured from.
+        weighted: Use edge weights as lengths. Otherwise, or for edges
+            without a weight, every edge has length 1.
+        recompute_fraction: Recompute from scratch when an update would
+            re-settle more than this fraction of the vertices.
+
+    If `graph` is an `ObservableGraph`, the paths follow its mutations until
+    `close` is called. Otherwise each change must be passed to `apply`.
+    """
+
+    def __init__(self, graph: AbstractGraph[V], source: V, weighted: bool = True, recompute_fraction: float = 0.25):
+        self.source = source
+        self.weighted = weighted
+        self.recompute_fraction = recompute_fraction
+
+        self.recomputes = 0
+        """The number of times the tree was recomputed from scratch, including the first."""
+
+        arrays = edge_arrays(graph)
+        vertices = list(arrays.vertices)
+
+        self.directed = arrays.directed
+        self._out: Dict[V, Dict[V, List[float]]] = {v: dict() for v in vertices}
+        self._in = {v: dict() for v in vertices} if self.directed else self._out
+
+        if source not in self._out:
+            raise ValueError(f"{source!r} not a vertex in graph")
+
+        weights = arrays.weights.tolist() if weighted and arrays.weights is not None else None
+        for k, (i, j) in enumerate(zip(arrays.src.tolist(), arrays.dst.tolist())):
+            self._add_arcs(vertices[i], vertices[j], 1.0 if weights is None else weights[k])
+
+        self._dist: Dict[V, float] = dict()
+        self._parent: Dict[V, V | None] = dict()
+        self._children: Dict[V, Set[V]] = dict()
+        self._recompute()
+
+        self._graph = graph if isinstance(graph, ObservableGraph) else None
+        if self._graph is not None:
+            self._graph.add_observer(self.apply)
+
+    def close(self):
+        """Stop following the graph's mutations."""
+        if self._graph is not None:
+            self._graph.remove_observer(self.apply)
+            self._graph = None
+
+    def distance(self, v: V) -> float:
+        """Returns the length of a shortest path from the source to `v`, or infinity if there is none."""
+        if v not in self._out:
+            raise ValueError(f"{v!r} not a vertex in graph")
+        return self._dist.get(v, math.inf)
+
+    def distances(self) -> Dict[V, float]:
+        """Returns the distance of every reachable vertex."""
+        return dict(self._dist)
+
+    def parent(self, v: V) -> V | None:
+        """Returns the vertex before `v` on its shortest path, or None for the source and unreachable vertices."""
+        return self._parent.get(v)
+
+    def path_to(self, v: V) -> List[V] | None:
+        """Returns the vertices of a shortest path from the source to `v`, or None if there is none."""
+        if self.distance(v) == math.inf:
+            return None
+
+        path = [v]
+        while (p := self._parent[path[-1]]) is not None:
+            path.append(p)
+        return path[::-1]
+
+    def apply(self, change: Change):
+        """Repair the paths after one change to the graph."""
+        kind, v1, v2 = change.kind, change.v1, change.v2
+        weight = 1.0 if change.weight is None or not self.weighted else float(change.weight)
+
+        if kind == "add_vertex":
+            self._out.setdefault(v1, dict())
+            self._in.setdefault(v1, dict())
+            if v1 == self.source:
+                self._recompute()
+        elif kind == "remove_vertex":
+            self._remove_vertex(v1)
+        elif kind == "add_edge":
+            self._add_arcs(v1, v2, weight)
+            self._arcs_changed(v1, v2)
+        elif kind == "remove_edge":
+            self._remove_arcs(v1, v2, weight)
+            self._arcs_changed(v1, v2)
+        elif kind == "set_edge_weight":
+            self._remove_arcs(v1, v2, None)
+            self._add_arcs(v1, v2, weight)
+            self._arcs_changed(v1, v2)
+
+    def _add_arcs(self, u: V, v: V, weight: float):
+        if weight < 0:
+            raise ValueError("Edge weights must be non-negative")
+        if u == v:
+            return
+
+        self._out[u].setdefault(v, []).append(weight)
+        if self.directed:
+            self._in[v].setdefault(u, []).append(weight)
+        else:
+            self._out[v].setdefault(u, []).append(weight)
+
+    def _remove_arcs(self, u: V, v: V, weight: float | None):
+        """Remove one edge of the given weight, or every edge if `weight` is None."""
+        if u == v:
+            return
+
+        pairs = [(self._out[u], v), (self._in[v], u)] if self.directed else [(self._out[u], v), (self._out[v], u)]
+        for arcs, head in pairs:
+            weights = arcs.get(head, [])
+            if weight is not None and weight in weights and len(weights) > 1:
+                weights.remove(weight)
+            else:
+                arcs.pop(head, None)
+
+    def _arcs_changed(self, u: V, v: V):
+        self._arc_changed(u, v)
+        if not self.directed:
+            self._arc_changed(v, u)
+
+    def _arc_changed(self, u: V, v: V):
+        """Repair the tree after the length of the arc from u to v changed."""
+        weights = self._out[u].get(v)
+        through_u = self._dist.get(u, math.inf) + (min(weights) if weights else math.inf)
+        current = self._dist.get(v, math.inf)
+
+        if through_u < current:
+            self._decrease({v: (through_u, u)})
+        elif self._parent.get(v) == u and through_u > current:
+            self._increase(v)
+
+    def _decrease(self, improved: Dict[V, Tuple[float, V | None]]):
+        """Dijkstra's algorithm outward from vertices whose distance improved."""
+        heap = []
+        for v, (d, p) in improved.items():
+            self._settle(v, d, p)
+            heap.append((d, id(v), v))
+        heapq.heapify(heap)
+
+        dist = self._dist
+        while heap:
+            d, _, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+
+            for v, weights in self._out[u].items():
+                nd = d + min(weights)
+                if nd < dist.get(v, math.inf):
+                    self._settle(v, nd, u)
+                    heapq.heappush(heap, (nd, id(v), v))
+
+    def _increase(self, root: V):
+        """Re-settle the part of the subtree below `root` that lost its shortest paths."""
+        dist = self._dist
+        limit = self.recompute_fraction * len(self._out)
+
+        # Walk the subtree by distance, so every unaffected in-neighbor has been seen
+        affected: Set[V] = set()
+        pending = {root}
+        heap = [(dist[root], id(root), root)]
+        while heap:
+            _, _, y = heapq.heappop(heap)
+            pending.discard(y)
+
+            alternative = self._tight_parent(y, affected, pending)
+            if alternative is not None:
+                self._set_parent(y, alternative)
+                continue
+
+            affected.add(y)
+            if len(affected) > limit:
+                self._recompute()
+                return
+
+            for child in self._children.get(y, ()):
+                pending.add(child)
+                heapq.heappush(heap, (dist[child], id(child), child))
+
+        for y in affected:
+            self._set_parent(y, None)
+            del dist[y]
+
+        # Each affected vertex starts from its best arc out of the unaffected region
+        improved: Dict[V, Tuple[float, V | None]] = dict()
+        for y in affected:
+            best, via = math.inf, None
+            for x, weights in self._in[y].items():
+                d = dist.get(x, math.inf) + min(weights)
+                if d < best:
+                    best, via = d, x
+            if via is not None:
+                improved[y] = (best, via)
+
+        self._decrease(improved)
+
+    def _tight_parent(self, y: V, affected: Set[V], pending: Set[V]) -> V | None:
+        """An in-neighbor outside the subtree still on a shortest path to y, if any."""
+        d = self._dist[y]
+        for x, weights in self._in[y].items():
+            if x in affected or x in pending:
+                continue
+
+            weight = min(weights)
+            if self._dist.get(x, math.inf) + weight != d:
+                continue
+
+            # Over a zero-length arc, x may be a descendant of y not yet reached by the walk
+            if weight == 0 and self._is_descendant(x, y):
+                continue
+            return x
+
+        return None
+
+    def _is_descendant(self, x: V, y: V) -> bool:
+        while x is not None:
+            if x == y:
+                return True
+            x = self._parent.get(x)
+        return False
+
+    def _remove_vertex(self, v: V):
+        if v == self.source:
+            for u in list(self._dist):
+                self._set_parent(u, None)
+            self._dist.clear()
+        else:
+            # Cut v's subtree loose first, so it is not re-settled through v
+            for w in list(self._out[v]):
+                self._remove_arcs(v, w, None)
+                self._arc_changed(v, w)
+            for u in list(self._in[v]):
+                self._remove_arcs(u, v, None)
+
+        self._set_parent(v, None)
+        self._dist.pop(v, None)
+        self._children.pop(v, None)
+        self._out.pop(v, None)
+        self._in.pop(v, None)
+
+    def _recompute(self):
+        self.recomputes += 1
+        self._dist.clear()
+        self._parent.clear()
+        self._children.clear()
+
+        if self.source in self._out:
+            self._decrease({self.source: (0.0, None)})
+
+    def _settle(self, v: V, d: float, parent: V | None):
+        self._dist[v] = d
+        self._set_parent(v, parent)
+
+    def _set_parent(self, v: V, parent: V | None):
+        old = self._parent.get(v)
+        if old is not None:
+            self._children[old].discard(v)
+
+        self._parent[v] = parent
+        if parent is not None:
+            self._children.setdefault(parent, set()).add(v)
+
+
+class DynamicReachability(DynamicShortestPaths[V]):
+    """The vertices reachable from a source, kept up to date under graph updates.
+
+    Maintained as unweighted shortest paths, so updates far from the source's
+    breadth-first tree are cheap. Takes the same arguments as
+    `DynamicShortestPaths`, except `weighted`.
+    """
+
+    def __init__(self, graph: AbstractGraph[V], source: V, recompute_fraction: float = 0.25):
+        super().__init__(graph, source, weighted=False, recompute_fraction=recompute_fraction)
+
+    def is_reachable(self, v: V) -> bool:
+        return self.distance(v) < math.inf
+
+    def reachable(self) -> Set[V]:
+        """Returns the vertices reachable from the source, including itself."""
+        return set(self._dist)
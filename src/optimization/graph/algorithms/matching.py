@@ -0,0 +1,399 @@
+"""Maximum cardinality and maximum weight matchings.
+
+A matching is a set of edges no two of which share a vertex. Matchings are
+returned as lists of vertex pairs. Direction and parallel edges are ignored,
+and loops can never be matched.
+
+`maximum_matching` runs Hopcroft-Karp when the graph is bipartite (or a side
+of a bipartition is given) and Edmonds' blossom algorithm otherwise. Both
+work on neighbor lists extracted once per call. Their per-vertex scratch
+lists are kept per thread and reused by later calls, so running many small
+matchings does not allocate new buffers each time.
+"""
+
+from __future__ import annotations
+
+import threading
+from itertools import repeat
+from typing import Any, Iterable, List, Tuple, TypeVar
+
+import numpy as np
+
+from ..graph import AbstractGraph
+from ..edge_arrays import EdgeArrays, vertex_array
+from ._common import edge_arrays, simple_adjacency
+
+V = TypeVar('V')
+
+def maximum_matching(graph: AbstractGraph[V] | EdgeArrays[V], left: Iterable[V] | None = None) -> List[Tuple[V, V]]:
+    """Returns a matching with as many edges as possible.
+
+    Args:
+        graph: The graph.
+        left: The vertices on one side of a bipartition of the graph. If not
+            given, a bipartition is searched for, and if there is none, the
+            general (blossom) algorithm is used.
+
+    Returns:
+        The matched pairs. For bipartite graphs, the first vertex of each pair
+        is on the same side as the first vertex of `graph.vertices` (or in
+        `left`, if given).
+
+    Raises:
+        ValueError: `left` is not one side of a bipartition of the graph.
+    """
+    arrays = edge_arrays(graph)
+    adjacency = simple_adjacency(graph)
+    indptr, indices = adjacency.indptr.tolist(), adjacency.indices.tolist()
+
+    sides = _sides(arrays, indptr, indices, left)
+    if sides is None:
+        mate = _blossom(indptr, indices)
+        pairs = [(v, w) for v, w in enumerate(mate) if v < w]
+    else:
+        mate = _hopcroft_karp(indptr, indices, sides)
+        pairs = [(v, w) for v, w in enumerate(mate) if w >= 0 and not sides[v]]
+
+    vertices = vertex_array(arrays.vertices)
+    return [(vertices[v], vertices[w]) for v, w in pairs]
+
+def maximum_weight_matching(graph: AbstractGraph[V] | EdgeArrays[V], left: Iterable[V] | None = None) -> List[Tuple[V, V]]:
+    """Returns a matching of a bipartite graph with the largest total weight.
+
+    Graphs without weights count every edge as 1. Edges of weight zero or
+    less are never matched, since dropping them never lowers the total. Dense
+    graphs are solved with the Hungarian algorithm over the full weight
+    matrix (`scipy.optimize.linear_sum_assignment`). Sparse graphs are reduced
+    to a minimum weight perfect matching that may match any vertex to a dummy
+    copy of itself, which `scipy.sparse.csgraph` solves on the sparse matrix.
+
+    Args:
+        graph: The graph.
+        left: The vertices on one side of a bipartition of the graph. If not
+            given, a bipartition is searched for.
+
+    Returns:
+        The matched pairs, first vertex on the same side as the first vertex
+        of `graph.vertices` (or in `left`, if given).
+
+    Raises:
+        ValueError: The graph is not bipartite, or `left` is not one side of a
+            bipartition.
+    """
+    arrays = edge_arrays(graph)
+    adjacency = simple_adjacency(graph)
+    sides = _sides(arrays, adjacency.indptr.tolist(), adjacency.indices.tolist(), left)
+    if sides is None:
+        raise ValueError("Maximum weight matching needs a bipartite graph")
+
+    # Orient each edge from the first side to the second and keep the heaviest parallel edge
+    is_right = np.asarray(sides, dtype=bool)
+    flip = is_right[arrays.src]
+    src, dst = np.where(flip, arrays.dst, arrays.src), np.where(flip, arrays.src, arrays.dst)
+    weights = np.ones(len(src)) if arrays.weights is None else arrays.weights.astype(float)
+
+    keep = (src != dst) & (weights > 0)
+    src, dst, weights = src[keep], dst[keep], weights[keep]
+
+    left_ids, right_ids = np.flatnonzero(~is_right), np.flatnonzero(is_right)
+    row, col = np.cumsum(~is_right) - 1, np.cumsum(is_right) - 1
+    rows, cols = row[src], col[dst]
+
+    order = np.lexsort((-weights, cols, rows))
+    rows, cols, weights = rows[order], cols[order], weights[order]
+    first = np.concatenate(([True], (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1]))) if len(rows) else rows.astype(bool)
+    rows, cols, weights = rows[first], cols[first], weights[first]
+
+    if len(rows) == 0:
+        return []
+
+    shape = (len(left_ids), len(right_ids))
+    if len(rows) * 8 >= shape[0] * shape[1]:
+        matched_rows, matched_cols = _dense_assignment(rows, cols, weights, shape)
+    else:
+        matched_rows, matched_cols = _sparse_assignment(rows, cols, weights, shape)
+
+    vertices = vertex_array(arrays.vertices)
+    return list(zip(vertices[left_ids[matched_rows]].tolist(), vertices[right_ids[matched_cols]].tolist()))
+
+def bipartition(graph: AbstractGraph[V] | EdgeArrays[V]) -> Tuple[List[V], List[V]] | None:
+    """Split the vertices into two sides with every edge between them, or None if that is impossible.
+
+    Isolated vertices and the first vertex of every connected component go
+    on the first side. Loops are ignored.
+    """
+    arrays = edge_arrays(graph)
+    adjacency = simple_adjacency(graph)
+    sides = _two_color(adjacency.indptr.tolist(), adjacency.indices.tolist())
+    if sides is None:
+        return None
+
+    vertices = vertex_array(arrays.vertices)
+    is_right = np.asarray(sides, dtype=bool)
+    return vertices[~is_right].tolist(), vertices[is_right].tolist()
+
+def _sides(arrays: EdgeArrays, indptr: List[int], indices: List[int], left: Iterable[Any] | None) -> List[int] | None:
+    """Returns 0 or 1 for the side of each vertex, or None if the graph is not bipartite."""
+    if left is None:
+        return _two_color(indptr, indices)
+
+    sides = [1] * arrays.vertex_count
+    for v in left:
+        sides[arrays.index_of(v)] = 0
+
+    if any(sides[v] == sides[w] for v in range(len(sides)) for w in indices[indptr[v]:indptr[v + 1]]):
+        raise ValueError("left is not one side of a bipartition of the graph")
+
+    return sides
+
+def _two_color(indptr: List[int], indices: List[int]) -> List[int] | None:
+    n = len(indptr) - 1
+    sides = [-1] * n
+
+    for root in range(n):
+        if sides[root] >= 0:
+            continue
+
+        sides[root] = 0
+        queue = [root]
+        for v in queue:
+            other = 1 - sides[v]
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if sides[w] < 0:
+                    sides[w] = other
+                    queue.append(w)
+                elif sides[w] != other:
+                    return None
+
+    return sides
+
+
+class _Buffers(threading.local):
+    """Per-thread scratch lists, grown as needed and reused across calls."""
+
+    def get(self, name: str, n: int, fill: int) -> List[int]:
+        buffer = getattr(self, name, None)
+        if buffer is None or len(buffer) < n:
+            buffer = [fill] * n
+            setattr(self, name, buffer)
+        else:
+            buffer[:n] = repeat(fill, n)
+
+        return buffer
+
+_buffers = _Buffers()
+
+def _hopcroft_karp(indptr: List[int], indices: List[int], sides: List[int]) -> List[int]:
+    """Returns the mate of every vertex (or -1), augmenting along all shortest paths each phase.
+
+    A breadth-first search from the free left vertices layers the graph by
+    alternating path length, then depth-first searches (with explicit stacks)
+    find a maximal set of vertex-disjoint shortest augmenting paths.
+    """
+    n = len(indptr) - 1
+    unreached = n + 1
+    mate = _buffers.get("mate", n, -1)
+    dist = _buffers.get("dist", n, unreached)
+    cursor = _buffers.get("cursor", n, 0)
+    left = [v for v in range(n) if not sides[v]]
+
+    # Start from a greedy matching
+    for v in left:
+        for w in indices[indptr[v]:indptr[v + 1]]:
+            if mate[w] < 0:
+                mate[v], mate[w] = w, v
+                break
+
+    while True:
+        queue = []
+        for v in left:
+            if mate[v] < 0:
+                dist[v] = 0
+                queue.append(v)
+            else:
+                dist[v] = unreached
+
+        shortest = unreached
+        for v in queue:
+            if dist[v] >= shortest:
+                break
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                u = mate[w]
+                if u < 0:
+                    shortest = dist[v] + 1
+                elif dist[u] == unreached:
+                    dist[u] = dist[v] + 1
+                    queue.append(u)
+
+        if shortest == unreached:
+            break
+
+        for v in left:
+            cursor[v] = indptr[v]
+
+        for root in left:
+            if mate[root] >= 0:
+                continue
+
+            path, via = [root], []
+            while path:
+                v = path[-1]
+                if cursor[v] == indptr[v + 1]:
+                    # Dead end: no later search needs to come through v
+                    dist[v] = unreached
+                    path.pop()
+                    if via:
+                        via.pop()
+                    continue
+
+                w = indices[cursor[v]]
+                cursor[v] += 1
+                u = mate[w]
+
+                if u < 0:
+                    if dist[v] + 1 == shortest:
+                        via.append(w)
+                        for v, w in zip(path, via):
+                            mate[v], mate[w] = w, v
+                        break
+                elif dist[u] == dist[v] + 1:
+                    path.append(u)
+                    via.append(w)
+
+    return mate[:n]
+
+def _blossom(indptr: List[int], indices: List[int]) -> List[int]:
+    """Returns the mate of every vertex (or -1) using Edmonds' blossom algorithm.
+
+    Each free vertex roots a search for an augmenting path. Odd cycles
+    (blossoms) found along the way are contracted by pointing every vertex in
+    them at the cycle's base.
+    """
+    n = len(indptr) - 1
+    mate = _buffers.get("mate", n, -1)
+
+    for v in range(n):
+        if mate[v] < 0:
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if mate[w] < 0:
+                    mate[v], mate[w] = w, v
+                    break
+
+    for root in range(n):
+        if mate[root] >= 0 or indptr[root] == indptr[root + 1]:
+            continue
+
+        v = _augmenting_path(indptr, indices, mate, root)
+        while v >= 0:
+            parent = _buffers.parent[v]
+            following = mate[parent]
+            mate[v], mate[parent] = parent, v
+            v = following
+
+    return mate[:n]
+
+def _augmenting_path(indptr: List[int], indices: List[int], mate: List[int], root: int) -> int:
+    """Search from a free root, returning the free vertex an augmenting path ends at, or -1.
+
+    The path is recorded in `_buffers.parent`.
+    """
+    n = len(indptr) - 1
+    parent = _buffers.get("parent", n, -1)
+    base = _buffers.get("base", n, 0)
+    base[:n] = range(n)
+    in_tree = _buffers.get("in_tree", n, 0)
+
+    in_tree[root] = 1
+    queue = [root]
+
+    for v in queue:
+        for w in indices[indptr[v]:indptr[v + 1]]:
+            if base[v] == base[w] or mate[v] == w:
+                continue
+
+            if w == root or (mate[w] >= 0 and parent[mate[w]] >= 0):
+                # v and w are both outer vertices: contract the blossom they close
+                b = _lowest_common_base(mate, parent, base, v, w)
+                blossom = _buffers.get("blossom", n, 0)
+                _mark_path(mate, parent, base, blossom, v, b, w)
+                _mark_path(mate, parent, base, blossom, w, b, v)
+
+                for u in range(n):
+                    if blossom[base[u]]:
+                        base[u] = b
+                        if not in_tree[u]:
+                            in_tree[u] = 1
+                            queue.append(u)
+
+            elif parent[w] < 0:
+                parent[w] = v
+                if mate[w] < 0:
+                    return w
+
+                in_tree[mate[w]] = 1
+                queue.append(mate[w])
+
+    return -1
+
+def _lowest_common_base(mate: List[int], parent: List[int], base: List[int], v: int, w: int) -> int:
+    seen = set()
+    while True:
+        v = base[v]
+        seen.add(v)
+        if mate[v] < 0:
+            break
+        v = parent[mate[v]]
+
+    while True:
+        w = base[w]
+        if w in seen:
+            return w
+        w = parent[mate[w]]
+
+def _mark_path(mate: List[int], parent: List[int], base: List[int], blossom: List[int], v: int, b: int, child: int):
+    while base[v] != b:
+        blossom[base[v]] = blossom[base[mate[v]]] = 1
+        parent[v] = child
+        child = mate[v]
+        v = parent[mate[v]]
+
+def _dense_assignment(rows: np.ndarray, cols: np.ndarray, weights: np.ndarray,
+                      shape: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    from scipy.optimize import linear_sum_assignment
+
+    matrix = np.zeros(shape)
+    matrix[rows, cols] = weights
+    matched_rows, matched_cols = linear_sum_assignment(matrix, maximize=True)
+
+    # Pairs assigned through a zero entry are not edges
+    real = matrix[matched_rows, matched_cols] > 0
+    return matched_rows[real], matched_cols[real]
+
+def _sparse_assignment(rows: np.ndarray, cols: np.ndarray, weights: np.ndarray,
+                       shape: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce to a perfect matching in which every vertex may instead pair with its own dummy.
+
+    Rows are the left vertices followed by a dummy for each right vertex, and
+    columns the right vertices followed by a dummy for each left vertex. A
+    dummy right vertex may take any left vertex's dummy whose real vertices
+    share an edge, so the real part can be any matching. Every perfect
+    matching has the same size, so shifting all costs by a constant to keep
+    them positive (stored zeros would not count as edges) does not change
+    which one is cheapest.
+    """
+    import scipy.sparse
+    from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+    n_left, n_right = shape
+    shift = weights.max() + 1
+    left, right = np.arange(n_left), np.arange(n_right)
+
+    matrix = scipy.sparse.csr_array((
+        np.concatenate((shift - weights, np.full(n_left + n_right + len(rows), shift))),
+        (np.concatenate((rows, left, n_left + right, n_left + cols)),
+         np.concatenate((cols, n_right + left, right, n_right + rows)))),
+        shape=(n_left + n_right, n_right + n_left))
+
+    matched_rows, matched_cols = min_weight_full_bipartite_matching(matrix)
+    real = (matched_rows < n_left) & (matched_cols < n_right)
+    return matched_rows[real], matched_cols[real]
@@ -0,0 +1,569 @@
+"""Traveling salesman and vehicle routing heuristics.
+
+Edge weights are travel costs: undirected graphs give symmetric costs, and
+directed graphs asymmetric ones (the cost of `(u, v)` is the weight of the arc
+from u to v). Graphs without weights cost 1 per edge. Instances with many
+stops are usually sparse, such as the k nearest neighbors of each stop, so a
+pair of vertices without an edge between them is allowed in a tour at a
+`missing_cost`, which by default exceeds the cost of every edge combined:
+
+>>> from optimization.graph.algorithms.routing import solve_tsp
+>>> tour = solve_tsp(g, time_limit=10.0, restarts=8, workers=4, seed=0)
+>>> tour.order, tour.cost
+
+Tours are built with nearest-neighbor or Christofides-style construction and
+improved with 2-opt and Or-opt. Local search only tries moves that add an
+edge from a vertex to one of its cheapest neighbors, evaluating all of them
+at once with NumPy, and keeps a don't-look bit per vertex so that vertices
+whose surroundings have not changed are not searched again.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Any, Deque, Dict, List, Mapping, NamedTuple, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+from ..graph import AbstractGraph
+from ..edge_arrays import EdgeArrays, vertex_array
+from ._common import edge_arrays
+
+V = TypeVar('V')
+
+CONSTRUCTIONS = ("nearest_neighbor", "christofides")
+
+class Tour(NamedTuple):
+    """A closed tour through every vertex, returning from the last vertex to the first."""
+    order: List
+    cost: float
+
+
+class Routes(NamedTuple):
+    """Vehicle routes, each leaving the depot, visiting its stops in order and returning."""
+    routes: List[List]
+    cost: float
+
+
+def solve_tsp(graph: AbstractGraph[V] | EdgeArrays[V], start: V | None = None,
+              construction: str = "nearest_neighbor", local_search: bool = True, neighbors: int = 10,
+              time_limit: float | None = None, restarts: int = 1, workers: int = 1, seed=None,
+              missing_cost: float | None = None) -> Tour:
+    """Find a short tour through every vertex of the graph.
+
+    Args:
+        graph: The graph, with edge weights as costs.
+        start: The vertex the tour starts from. Defaults to the first vertex.
+        construction: How the first tour is built:
+            - "nearest_neighbor": repeatedly go to the cheapest unvisited neighbor.
+            - "christofides": a minimum spanning tree plus a greedy matching
+              of its odd-degree vertices, walked as an Euler circuit that
+              skips repeated vertices. Only for undirected graphs.
+        local_search: Improve the tour with 2-opt and Or-opt moves. Directed
+            graphs only use Or-opt moves that keep segments in their
+            direction, since reversing a segment changes its cost.
+        neighbors: The number of cheapest neighbors of each vertex that local
+            search tries to connect it to.
+        time_limit: Stop improving after this many seconds.
+        restarts: The number of tours to build and improve. Restarts after
+            the first use nearest-neighbor construction from random vertices.
+            The cheapest tour is returned.
+        workers: The number of processes to run restarts in.
+        seed: Seed for the random number generator.
+        missing_cost: The cost of travelling between vertices with no edge.
+
+    Returns:
+        The cheapest tour found.
+    """
+    arrays = edge_arrays(graph)
+    costs = _Costs(arrays, neighbors, missing_cost)
+    n = costs.n
+
+    if construction not in CONSTRUCTIONS:
+        raise ValueError(f"Unknown construction {construction!r}, expected one of {CONSTRUCTIONS}")
+    if construction == "christofides" and costs.directed:
+        raise ValueError("Christofides construction needs an undirected graph")
+
+    first = 0 if start is None else arrays.index_of(start)
+    if n == 0:
+        return Tour([], 0.0)
+
+    deadline = None if time_limit is None else perf_counter() + time_limit
+    seeds = np.random.SeedSequence(seed).spawn(max(restarts, 1))
+    tasks = [(construction if i == 0 else "nearest_neighbor", first if i == 0 else None, local_search, deadline, s)
+             for i, s in enumerate(seeds)]
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(min(workers, len(tasks)), initializer=_set_worker_costs, initargs=(costs,)) as pool:
+            tours = list(pool.map(_restart, tasks))
+    else:
+        tours = [_solve(costs, *task) for task in tasks]
+
+    tour = min(tours, key=costs.tour_cost)
+
+    # Rotate the tour to begin at the start vertex
+    tour = np.roll(tour, -int(np.flatnonzero(tour == first)[0]))
+    return Tour(vertex_array(arrays.vertices)[tour].tolist(), costs.tour_cost(tour))
+
+def tour_cost(graph: AbstractGraph[V] | EdgeArrays[V], order: Sequence[V], missing_cost: float | None = None) -> float:
+    """Returns the cost of visiting the vertices in order and returning to the first."""
+    arrays = edge_arrays(graph)
+    costs = _Costs(arrays, 0, missing_cost)
+    return costs.tour_cost(np.fromiter(map(arrays.index_of, order), dtype=np.int64))
+
+def clarke_wright(graph: AbstractGraph[V] | EdgeArrays[V], depot: V, demands: Mapping[V, float] | None = None,
+                  capacity: float = float("inf"), missing_cost: float | None = None) -> Routes:
+    """Plan vehicle routes from a depot with the Clarke-Wright savings heuristic.
+
+    Every other vertex starts on its own route. Routes are then joined end to
+    start, in order of decreasing savings `d(i, depot) + d(depot, j) - d(i, j)`
+    over the edges `(i, j)`, as long as the joined route's demand fits in a
+    vehicle.
+
+    Args:
+        graph: The graph, with edge weights as costs.
+        depot: The vertex every route starts and ends at.
+        demands: The demand of each stop. Defaults to 1 each.
+        capacity: The total demand one vehicle can serve.
+        missing_cost: The cost of travelling between vertices with no edge.
+
+    Returns:
+        The routes, without the depot at either end.
+    """
+    arrays = edge_arrays(graph)
+    costs = _Costs(arrays, 0, missing_cost)
+    n = costs.n
+    d = arrays.index_of(depot)
+
+    load = np.ones(n)
+    if demands is not None:
+        for v, demand in demands.items():
+            load[arrays.index_of(v)] = demand
+    if np.any(load > capacity):
+        raise ValueError("A stop's demand exceeds the vehicle capacity")
+
+    # Candidate joins are the edges between stops, both ways round for undirected graphs
+    i, j = costs.keys // max(n, 1), costs.keys % max(n, 1)
+    if not costs.directed:
+        i, j = np.concatenate((i, j)), np.concatenate((j, i))
+    keep = (i != d) & (j != d) & (i != j)
+    i, j = i[keep], j[keep]
+
+    depot_ids = np.full(len(i), d)
+    savings = costs(i, depot_ids) + costs(depot_ids, j) - costs(i, j)
+    order = np.argsort(-savings, kind="stable")
+    order = order[savings[order] > 0]
+
+    routes: Dict[int, Deque[int]] = {v: deque([v]) for v in range(n) if v != d}
+    route_of = list(range(n))
+    route_load = load.tolist()
+
+    for a, b in zip(i[order].tolist(), j[order].tolist()):
+        ra, rb = route_of[a], route_of[b]
+        if ra == rb or route_load[ra] + route_load[rb] > capacity:
+            continue
+
+        first, second = routes[ra], routes[rb]
+        if not costs.directed:
+            # Either route may be walked backwards
+            if first[0] == a and len(first) > 1:
+                first.reverse()
+            if second[-1] == b and len(second) > 1:
+                second.reverse()
+        if first[-1] != a or second[0] != b:
+            continue
+
+        # Relabel the shorter route's stops
+        if len(first) >= len(second):
+            first.extend(second)
+            keep_id, drop_id, moved = ra, rb, second
+        else:
+            second.extendleft(reversed(first))
+            keep_id, drop_id, moved = rb, ra, first
+
+        for v in moved:
+            route_of[v] = keep_id
+        route_load[keep_id] += route_load[drop_id]
+        del routes[drop_id]
+
+    vertices = vertex_array(arrays.vertices)
+    result, total = [], 0.0
+    for route in routes.values():
+        stops = np.fromiter(route, dtype=np.int64)
+        total += costs.tour_cost(np.concatenate(([d], stops)))
+        result.append(vertices[stops].tolist())
+
+    return Routes(result, total)
+
+
+class _Costs:
+    """Edge costs as a sorted key table for vectorized lookups, plus each vertex's cheapest neighbors."""
+
+    def __init__(self, arrays: EdgeArrays, neighbors: int, missing_cost: float | None):
+        n = self.n = arrays.vertex_count
+        self.directed = arrays.directed
+
+        src, dst = arrays.src, arrays.dst
+        weights = np.ones(len(src)) if arrays.weights is None else arrays.weights.astype(float)
+        keep = src != dst
+        src, dst, weights = src[keep], dst[keep], weights[keep]
+
+        if not self.directed:
+            src, dst = np.minimum(src, dst), np.maximum(src, dst)
+
+        # Keep the cheapest of parallel edges
+        keys = src * n + dst
+        order = np.lexsort((weights, keys))
+        keys, weights = keys[order], weights[order]
+        first = np.concatenate(([True], keys[1:] != keys[:-1])) if len(keys) else keys.astype(bool)
+        self.keys, self.values = keys[first], weights[first]
+
+        self.missing = float(np.abs(self.values).sum() + 1) if missing_cost is None else float(missing_cost)
+
+        # Neighbors of each vertex by increasing cost
+        src, dst, weights = self.keys // max(n, 1), self.keys % max(n, 1), self.values
+        if not self.directed:
+            src, dst, weights = np.concatenate((src, dst)), np.concatenate((dst, src)), np.concatenate((weights, weights))
+
+        order = np.lexsort((weights, src))
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+        self.indices, self.weights = dst[order], weights[order]
+
+        # The first `neighbors` entries of each row are the local search candidates
+        rank = np.arange(len(src)) - np.repeat(self.indptr[:-1], np.diff(self.indptr))
+        nearest = rank < neighbors
+        self.candidates_ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.minimum(np.diff(self.indptr), neighbors), out=self.candidates_ptr[1:])
+        self.candidates = self.indices[nearest]
+
+    def __call__(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """Returns the cost of travelling from each `i` to the matching `j`."""
+        if not self.directed:
+            i, j = np.minimum(i, j), np.maximum(i, j)
+
+        probes = i * self.n + j
+        if len(self.keys) == 0:
+            return np.full(len(probes), self.missing)
+
+        pos = np.minimum(np.searchsorted(self.keys, probes), len(self.keys) - 1)
+        return np.where(self.keys[pos] == probes, self.values[pos], self.missing)
+
+    def cost(self, i: int, j: int) -> float:
+        return float(self(np.array([i]), np.array([j]))[0])
+
+    def tour_cost(self, tour: np.ndarray) -> float:
+        if len(tour) < 2:
+            return 0.0
+        return float(self(tour, np.roll(tour, -1)).sum())
+
+    def candidates_of(self, v: int) -> np.ndarray:
+        return self.candidates[self.candidates_ptr[v]:self.candidates_ptr[v + 1]]
+
+
+_worker_costs: _Costs | None = None
+
+def _set_worker_costs(costs: _Costs):
+    global _worker_costs
+    _worker_costs = costs
+
+def _restart(task: Tuple) -> np.ndarray:
+    return _solve(_worker_costs, *task) # type: ignore
+
+def _solve(costs: _Costs, construction: str, start: int | None, local_search: bool,
+           deadline: float | None, seed: np.random.SeedSequence) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    if start is None:
+        start = int(rng.integers(costs.n))
+
+    if construction == "christofides":
+        tour = _christofides(costs)
+    else:
+        tour = _nearest_neighbor(costs, start)
+
+    if local_search and costs.n > 3:
+        tour = _LocalSearch(costs, tour, rng, deadline).run()
+
+    return tour
+
+def _nearest_neighbor(costs: _Costs, start: int) -> np.ndarray:
+    indptr, indices = costs.indptr.tolist(), costs.indices.tolist()
+    cursor = indptr[:-1]
+    visited = [False] * costs.n
+    visited[start] = True
+    tour = [start]
+
+    # Visited vertices that may still have unvisited neighbors, most recent last
+    pending = [start]
+    fallback = 0
+
+    def next_unvisited(v: int) -> int:
+        # Neighbors are sorted by cost and never become unvisited again, so skip them for good
+        i, end = cursor[v], indptr[v + 1]
+        while i < end and visited[indices[i]]:
+            i += 1
+        cursor[v] = i
+        return indices[i] if i < end else -1
+
+    for _ in range(costs.n - 1):
+        w = next_unvisited(tour[-1])
+
+        # Stuck: continue from the closest unvisited neighbor of the most recently visited vertex that has one
+        while w < 0 and pending:
+            w = next_unvisited(pending[-1])
+            if w < 0:
+                pending.pop()
+
+        if w < 0:
+            while visited[fallback]:
+                fallback += 1
+            w = fallback
+
+        visited[w] = True
+        tour.append(w)
+        pending.append(w)
+
+    return np.asarray(tour, dtype=np.int64)
+
+def _christofides(costs: _Costs) -> np.ndarray:
+    """Walk a spanning tree doubled up by a greedy matching of its odd-degree vertices, skipping repeats.
+
+    True Christofides uses a minimum weight perfect matching over all pairs,
+    which is out of reach at this scale. Here odd vertices are matched
+    greedily along the cheapest edges between them, and any left over are
+    paired up in depth-first order of the tree.
+    """
+    import scipy.sparse
+    from scipy.sparse.csgraph import minimum_spanning_tree
+
+    n = costs.n
+    src, dst = costs.keys // max(n, 1), costs.keys % max(n, 1)
+
+    # Shift weights so zero-cost edges are not dropped as missing entries
+    shift = 1 - min(costs.values.min(initial=0), 0)
+    matrix = scipy.sparse.coo_array((costs.values + shift, (src, dst)), shape=(n, n)).tocsr()
+    tree = minimum_spanning_tree(matrix).tocoo()
+    tree_src, tree_dst = tree.row.astype(np.int64), tree.col.astype(np.int64)
+
+    odd = np.bincount(np.concatenate((tree_src, tree_dst)), minlength=n) % 2 == 1
+    unmatched = odd.copy()
+    extra_src, extra_dst = [], []
+
+    both_odd = odd[src] & odd[dst]
+    order = np.argsort(costs.values[both_odd], kind="stable")
+    for a, b in zip(src[both_odd][order].tolist(), dst[both_odd][order].tolist()):
+        if unmatched[a] and unmatched[b]:
+            unmatched[a] = unmatched[b] = False
+            extra_src.append(a)
+            extra_dst.append(b)
+
+    # Pair the rest in depth-first order of the tree, where consecutive vertices tend to be close
+    rest = _tree_preorder(tree, n)
+    rest = rest[unmatched[rest]]
+    extra_src.extend(rest[0::2].tolist())
+    extra_dst.extend(rest[1::2].tolist())
+
+    # Hierholzer's algorithm over the combined multigraph, one circuit per component
+    a = np.concatenate((tree_src, np.asarray(extra_src, dtype=np.int64)))
+    b = np.concatenate((tree_dst, np.asarray(extra_dst, dtype=np.int64)))
+    ends = np.concatenate((a, b))
+    edge_ids = np.concatenate((np.arange(len(a)), np.arange(len(a))))
+    order = np.argsort(ends, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ends, minlength=n), out=indptr[1:])
+    incident, other = edge_ids[order].tolist(), np.concatenate((b, a))[order].tolist()
+
+    cursor = indptr[:-1].tolist()
+    end = indptr[1:].tolist()
+    used = [False] * len(a)
+    seen = [False] * n
+    tour: List[int] = []
+
+    for root in range(n):
+        if seen[root]:
+            continue
+
+        stack, circuit = [root], []
+        while stack:
+            v = stack[-1]
+            while cursor[v] < end[v] and used[incident[cursor[v]]]:
+                cursor[v] += 1
+
+            if cursor[v] == end[v]:
+                circuit.append(stack.pop())
+            else:
+                used[incident[cursor[v]]] = True
+                stack.append(other[cursor[v]])
+
+        for v in reversed(circuit):
+            if not seen[v]:
+                seen[v] = True
+                tour.append(v)
+
+    return np.asarray(tour, dtype=np.int64)
+
+
+def _tree_preorder(tree: Any, n: int) -> np.ndarray:
+    """Returns every vertex in depth-first order of a spanning forest."""
+    from scipy.sparse.csgraph import depth_first_order
+
+    tree = tree.tocsr()
+    seen = np.zeros(n, dtype=bool)
+    orders = []
+
+    for root in range(n):
+        if not seen[root]:
+            order = depth_first_order(tree, root, directed=False, return_predecessors=False)
+            seen[order] = True
+            orders.append(order)
+
+    return np.concatenate(orders) if orders else np.zeros(0, dtype=np.int64)
+
+
+class _LocalSearch:
+    """2-opt and Or-opt over an array tour, with a queue of vertices whose don't-look bit is off."""
+
+    def __init__(self, costs: _Costs, tour: np.ndarray, rng: np.random.Generator, deadline: float | None):
+        self.costs = costs
+        self.n = len(tour)
+        self.tour = tour.copy()
+        self.pos = np.empty(self.n, dtype=np.int64)
+        self.pos[self.tour] = np.arange(self.n)
+        self.deadline = deadline
+
+        self.queue: Deque[int] = deque(rng.permutation(self.n).tolist())
+        self.queued = [True] * self.n
+
+    def run(self) -> np.ndarray:
+        while self.queue:
+            if self.deadline is not None and perf_counter() > self.deadline:
+                break
+
+            v = self.queue.popleft()
+            self.queued[v] = False
+
+            improved = False
+            if not self.costs.directed:
+                improved = self._two_opt(v)
+            if not improved:
+                improved = self._or_opt(v)
+            if improved:
+                self._wake(v)
+
+        return self.tour
+
+    def _wake(self, *vertices: int):
+        for v in vertices:
+            if not self.queued[v]:
+                self.queued[v] = True
+                self.queue.append(v)
+
+    def _succ(self, positions: np.ndarray) -> np.ndarray:
+        return self.tour[(positions + 1) % self.n]
+
+    def _pred(self, positions: np.ndarray) -> np.ndarray:
+        return self.tour[positions - 1]
+
+    def _two_opt(self, a: int) -> bool:
+        """Try replacing two tour edges with an edge from `a` to a candidate and the edge closing the loop."""
+        c = self.costs.candidates_of(a)
+        if len(c) == 0:
+            return False
+
+        i = self.pos[a]
+        b, p = int(self.tour[(i + 1) % self.n]), int(self.tour[i - 1])
+        pc = self.pos[c]
+        d, e = self._succ(pc), self._pred(pc)
+
+        costs = self.costs
+        ac = costs(np.full(len(c), a), c)
+        # a -> b ... c -> d becomes a -> c ... b -> d
+        after = ac + costs(np.full(len(c), b), d) - costs.cost(a, b) - costs(c, d)
+        # e -> c ... p -> a becomes e -> p ... c -> a
+        before = ac + costs(e, np.full(len(c), p)) - costs.cost(p, a) - costs(e, c)
+        after[(c == b) | (d == a)] = 0
+        before[(c == p) | (e == a)] = 0
+
+        k = int(np.argmin(np.minimum(after, before)))
+        if min(after[k], before[k]) >= -1e-9:
+            return False
+
+        ck = int(c[k])
+        if after[k] <= before[k]:
+            self._reverse(i + 1, self.pos[ck])
+            self._wake(a, b, ck, int(d[k]))
+        else:
+            self._reverse(self.pos[ck], i - 1)
+            self._wake(a, p, ck, int(e[k]))
+
+        return True
+
+    def _reverse(self, lo: int, hi: int):
+        """Reverse the tour from position `lo` forward to position `hi`, wrapping around."""
+        n = self.n
+        length = (hi - lo) % n + 1
+
+        # Reversing the rest of the tour gives the same cycle, walked the other way
+        if 2 * length > n:
+            lo, hi, length = hi + 1, lo - 1, n - length
+
+        idx = (lo + np.arange(length)) % n
+        self.tour[idx] = self.tour[idx[::-1]]
+        self.pos[self.tour[idx]] = idx
+
+    def _or_opt(self, v: int) -> bool:
+        """Try moving a segment of up to three vertices starting at `v` next to a candidate of one of its ends."""
+        costs = self.costs
+        n = self.n
+        i = self.pos[v]
+
+        for length in (1, 2, 3):
+            if length + 2 > n:
+                break
+
+            segment = self.tour[(i + np.arange(length)) % n]
+            s0, s1 = int(segment[0]), int(segment[-1])
+            p, nx = int(self.tour[i - 1]), int(self.tour[(i + length) % n])
+            removed = costs.cost(p, s0) + costs.cost(s1, nx) - costs.cost(p, nx)
+
+            # Candidates of either end may become the segment's new predecessor or successor
+            near = np.concatenate((costs.candidates_of(s0), costs.candidates_of(s1)))
+            if len(near) == 0:
+                continue
+            x = np.concatenate((near, self._pred(self.pos[near])))
+            px = self.pos[x]
+            y = self._succ(px)
+
+            # Insert the segment between x and its successor y, forwards or backwards
+            inside = ((px - i) % n < length) | (((px + 1) % n - i) % n < length)
+            forward = costs(x, np.full(len(x), s0)) + costs(np.full(len(x), s1), y) - costs(x, y)
+            options = [forward]
+            if not costs.directed:
+                options.append(costs(x, np.full(len(x), s1)) + costs(np.full(len(x), s0), y) - costs(x, y))
+
+            gains = np.stack(options) - removed
+            gains[:, inside | (x == p)] = np.inf
+
+            flat = int(np.argmin(gains))
+            if gains.flat[flat] >= -1e-9:
+                continue
+
+            backwards, k = divmod(flat, len(x))
+            self._move(i, length, int(x[k]), bool(backwards))
+            self._wake(p, nx, s0, s1, int(x[k]), int(y[k]))
+            return True
+
+        return False
+
+    def _move(self, i: int, length: int, x: int, backwards: bool):
+        """Move the segment at positions i, ..., i + length - 1 to just after vertex `x`."""
+        rotated = np.roll(self.tour, -i)
+        segment, rest = rotated[:length], rotated[length:]
+        if backwards:
+            segment = segment[::-1]
+
+        at = int(np.flatnonzero(rest == x)[0]) + 1
+        self.tour = np.concatenate((rest[:at], segment, rest[at:]))
+        self.pos[self.tour] = np.arange(self.n)
@@ -0,0 +1,290 @@
+"""Columnar vertex and edge attributes.
+
+`AttributedGraph` is a mixin that composes ahead of any representation and
+gives the graph two `AttributeTable`s, `vertex_attrs` and `edge_attrs`:
+
+>>> from optimization.graph import AdjacencySet
+>>> from optimization.graph.graph import Graph, NormalGraph
+>>> from optimization.graph.attributes import AttributedGraph
+>>> g = Graph.from_types(NormalGraph, AdjacencySet, AttributedGraph).from_str("a-b b-c")
+>>> g.edge_attrs.add_column("capacity", dtype=np.int32, default=1)
+>>> g.edge_attrs.set("capacity", [("a", "b")], 10)
+>>> g.edge_attrs.filter("capacity", lambda c: c > 5)
+[('a', 'b')]
+
+Each table interns its keys (vertices, or `(v1, v2)` pairs for edges) to
+integer row ids and stores every attribute as one NumPy column indexed by
+row, rather than as fields on per-vertex or per-edge Python objects. Rows
+freed by removals are reused, so the columns do not grow under churn.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, List, Tuple, TypeVar
+
+import numpy as np
+
+from .graph import AbstractGraph, DirectedGraph, Edge
+
+V = TypeVar('V')
+K = TypeVar('K', bound=Hashable)
+
+AGGREGATIONS = ("sum", "mean", "min", "max", "count")
+
+class AttributeTable(Generic[K]):
+    """Named NumPy columns over a set of keys, each key interned to an integer row.
+
+    Args:
+        keys: The initial keys.
+        symmetric: Keys are pairs, and `(a, b)` and `(b, a)` name the same row.
+            Used for the edges of undirected graphs.
+    """
+
+    def __init__(self, keys: Iterable[K] = (), symmetric: bool = False):
+        self.symmetric = symmetric
+        self._ids: Dict[K, int] = dict()
+        self._keys: List[K | None] = []
+        self._free: List[int] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._columns: Dict[str, np.ndarray] = dict()
+        self._defaults: Dict[str, Any] = dict()
+
+        self.add_many(keys)
+
+    def __len__(self) -> int:
+        return len(self._keys) - len(self._free)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._ids
+
+    def keys(self) -> List[K]:
+        """Returns the keys, in row order. Columns returned by `get` follow this order."""
+        return [self._keys[row] for row in np.flatnonzero(self._alive).tolist()] # type: ignore
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._columns)
+
+    def ids(self, keys: Iterable[K]) -> np.ndarray:
+        """Returns the row of each key. Raises a ValueError for unknown keys."""
+        try:
+            return np.fromiter(map(self._ids.__getitem__, keys), dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"{e.args[0]!r} has no attributes") from None
+
+    def add_column(self, name: str, dtype: Any = float, default: Any = 0):
+        """Add a column, filled with `default` for every existing and future key.
+
+        Raises a ValueError if the column already exists.
+        """
+        if name in self._columns:
+            raise ValueError(f"Column {name!r} already exists")
+
+        self._columns[name] = np.full(len(self._alive), default, dtype=dtype)
+        self._defaults[name] = default
+
+    def remove_column(self, name: str):
+        del self._columns[name]
+        del self._defaults[name]
+
+    def get(self, name: str, keys: Iterable[K] | None = None) -> np.ndarray:
+        """Returns a column's values for the given keys, or for every key in `keys()` order."""
+        column = self._column(name)
+        if keys is None:
+            return column[self._alive]
+
+        return column[self.ids(keys)]
+
+    def set(self, name: str, keys: Iterable[K], values: Any):
+        """Set a column's values for the given keys. A single value is broadcast to every key."""
+        self._column(name)[self.ids(keys)] = values
+
+    def filter(self, name: str, predicate: Callable[[np.ndarray], np.ndarray]) -> List[K]:
+        """Returns the keys where `predicate`, applied to the whole column at once, is true.
+
+        >>> table.filter("cost", lambda cost: (cost > 1) & (cost < 5))
+        """
+        mask = np.asarray(predicate(self._column(name)), dtype=bool) & self._alive
+        return [self._keys[row] for row in np.flatnonzero(mask).tolist()] # type: ignore
+
+    def aggregate(self, name: str, how: str = "sum", by: str | None = None) -> Any:
+        """Reduce a column, either entirely or within groups of equal values of another column.
+
+        Args:
+            name: The column to reduce.
+            how: One of "sum", "mean", "min", "max" or "count".
+            by: A column (such as category codes) to group the keys by.
+
+        Returns:
+            The reduced value, or with `by`, a (groups, values) pair of arrays
+            holding each distinct value of the `by` column and its result.
+        """
+        if how not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {how!r}, expected one of {AGGREGATIONS}")
+
+        values = self.get(name)
+        if by is None:
+            if how == "count":
+                return len(values)
+            return getattr(np, how)(values) if len(values) else np.nan
+
+        groups, inverse = np.unique(self.get(by), return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(groups))
+
+        if how == "count":
+            return groups, counts
+        if how in ("sum", "mean"):
+            sums = np.bincount(inverse, weights=values, minlength=len(groups))
+            return groups, sums if how == "sum" else sums / counts
+
+        # Sort by group so each group's values are contiguous for reduceat
+        order = np.argsort(inverse, kind="stable")
+        starts = np.cumsum(counts) - counts
+        return groups, getattr(np, f"{how}imum").reduceat(values[order], starts)
+
+    def add(self, key: K) -> int:
+        """Intern a key, giving it default values if it is new. Returns its row."""
+        row = self._ids.get(key)
+        if row is not None:
+            return row
+
+        if self._free:
+            row = self._free.pop()
+            self._keys[row] = key
+            for name, column in self._columns.items():
+                column[row] = self._defaults[name]
+        else:
+            row = len(self._keys)
+            self._keys.append(key)
+            self._reserve(row + 1)
+
+        self._alive[row] = True
+        self._ids[key] = row
+        if self.symmetric:
+            self._ids[key[::-1]] = row # type: ignore
+
+        return row
+
+    def add_many(self, keys: Iterable[K]) -> np.ndarray:
+        """Intern many keys at once. Returns their rows."""
+        keys = list(keys)
+        if self._free:
+            return np.fromiter(map(self.add, keys), dtype=np.int64, count=len(keys))
+
+        # New keys take consecutive rows at the end, which already hold default values
+        start = len(self._keys)
+        for key in keys:
+            if key not in self._ids:
+                self._ids[key] = len(self._keys)
+                if self.symmetric:
+                    self._ids.setdefault(key[::-1], len(self._keys)) # type: ignore
+                self._keys.append(key)
+
+        self._reserve(len(self._keys))
+        self._alive[start:len(self._keys)] = True
+        return self.ids(keys)
+
+    def remove(self, key: K):
+        """Forget a key and free its row. Raises a ValueError for unknown keys."""
+        row = self._ids.pop(key, None)
+        if row is None:
+            raise ValueError(f"{key!r} has no attributes")
+
+        stored = self._keys[row]
+        if self.symmetric:
+            self._ids.pop(stored[::-1], None) # type: ignore
+            self._ids.pop(stored, None)
+
+        self._keys[row] = None
+        self._alive[row] = False
+        self._free.append(row)
+
+    def discard(self, key: K):
+        if key in self._ids:
+            self.remove(key)
+
+    def _column(self, name: str) -> np.ndarray:
+        column = self._columns.get(name)
+        if column is None:
+            raise KeyError(f"No column {name!r}")
+        return column
+
+    def _reserve(self, size: int):
+        """Grow the columns geometrically to hold at least `size` rows."""
+        capacity = len(self._alive)
+        if size <= capacity:
+            return
+
+        capacity = max(size, 2 * capacity, 16)
+        self._alive = _grown(self._alive, capacity, False)
+        for name, column in self._columns.items():
+            self._columns[name] = _grown(column, capacity, self._defaults[name])
+
+def _grown(array: np.ndarray, capacity: int, fill: Any) -> np.ndarray:
+    grown = np.full(capacity, fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class AttributedGraph(AbstractGraph[V]):
+    """Mixin giving a graph columnar vertex and edge attributes that follow its mutations.
+
+    Edges are keyed by their `(v1, v2)` vertex pair, either way round for
+    undirected graphs, so parallel edges share attributes. Mutations must go
+    through the graph's methods for the tables to stay in sync.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.vertex_attrs: AttributeTable[V] = AttributeTable(self.vertices)
+        """The attributes of each vertex."""
+
+        arrays = super().to_edge_arrays()
+        vertices = arrays.vertices
+        self.edge_attrs: AttributeTable[Tuple[V, V]] = AttributeTable(
+            ((vertices[i], vertices[j]) for i, j in zip(arrays.src.tolist(), arrays.dst.tolist())),
+            symmetric=not isinstance(self, DirectedGraph))
+        """The attributes of each edge, keyed by `(v1, v2)`."""
+
+    def add_vertex(self, v: V):
+        super().add_vertex(v)
+        self.vertex_attrs.add(v)
+
+    def remove_vertex(self, v: V):
+        if isinstance(self, DirectedGraph):
+            incident = [key for key in self.edge_attrs.keys() if v in key]
+        else:
+            # Some representations (IncidenceMatrix) leave v out of its own neighbors, even with a loop
+            incident = [(v, w) for w in super().neighbors_of(v)] + [(v, v)]
+
+        super().remove_vertex(v)
+        self.vertex_attrs.discard(v)
+        for key in incident:
+            self.edge_attrs.discard(key)
+
+    def add_edge(self, v1: V, v2: V, weight=None):
+        super().add_edge(v1, v2, weight)
+        self.edge_attrs.add((v1, v2))
+
+    def remove_edge(self, edge: Edge[V]):
+        super().remove_edge(edge)
+        v1, v2 = edge[0], edge[1]
+        if not super().is_adjacent(v1, v2):
+            self.edge_attrs.discard((v1, v2))
+
+    def _extra_state(self) -> Dict[str, Any]:
+        state = super()._extra_state()
+        state.update(vertex_attrs=self.vertex_attrs, edge_attrs=self.edge_attrs)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        super().__setstate__(state)
+        self.vertex_attrs = state["vertex_attrs"]
+        self.edge_attrs = state["edge_attrs"]
+
+    def _memory_components(self) -> List[Tuple[str, Any, str]]:
+        return super()._memory_components() + [
+            ("attributes", self.vertex_attrs, "all"),
+            ("attributes", self.edge_attrs, "all"),
+        ]
@@ -0,0 +1,81 @@
+"""Vectorized batch queries over a CSR adjacency, shared by array-backed representations."""
+
+from __future__ import annotations
+
+from typing import Dict, Generic, Iterable, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+from .edge_arrays import EdgeArrays, vertex_array
+from .conversion import to_scipy_sparse
+
+V = TypeVar('V')
+
+class SparseAdjacency(Generic[V]):
+    """A CSR adjacency built once from a graph's edge arrays.
+
+    Args:
+        arrays: The graph's edge arrays.
+        symmetric_neighbors: Report both in- and out-neighbors of directed
+            graphs from `degrees` and `neighbors_of_many`.
+        loops_are_neighbors: Report a vertex with a loop as its own neighbor.
+    """
+
+    def __init__(self, arrays: EdgeArrays[V], symmetric_neighbors: bool = False, loops_are_neighbors: bool = True):
+        self.vertices = vertex_array(arrays.vertices)
+        self.index: Dict[V, int] = {v: i for i, v in enumerate(arrays.vertices)}
+
+        adjacency = to_scipy_sparse(arrays, "csr", weighted=False)
+        adjacency.sum_duplicates()
+        adjacency.sort_indices()
+        self.adjacency = adjacency
+
+        neighbors = adjacency
+        if arrays.directed and symmetric_neighbors:
+            neighbors = (adjacency + adjacency.T).tocsr()
+        if not loops_are_neighbors:
+            neighbors = neighbors.tolil()
+            neighbors.setdiag(0)
+            neighbors = neighbors.tocsr()
+            neighbors.eliminate_zeros()
+        neighbors.sort_indices()
+        self.neighbors = neighbors
+
+        n = len(self.vertices)
+        rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(adjacency.indptr))
+        self._keys = rows * n + adjacency.indices
+
+    def indices_of(self, vs: Iterable[V]) -> np.ndarray:
+        """Map vertices to row indices, raising a ValueError for unknown vertices."""
+        try:
+            return np.fromiter(map(self.index.__getitem__, vs), dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"{e.args[0]!r} not a vertex in graph") from None
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.neighbors.indptr)
+
+    def is_adjacent_many(self, src: Iterable[V], dst: Iterable[V]) -> np.ndarray:
+        i, j = self.indices_of(src), self.indices_of(dst)
+        if len(i) != len(j):
+            raise ValueError("src and dst must have the same length")
+
+        # Row-major keys of a sorted CSR matrix are sorted, so membership is a binary search
+        probes = i * len(self.vertices) + j
+        pos = np.minimum(np.searchsorted(self._keys, probes), max(len(self._keys) - 1, 0))
+
+        if len(self._keys) == 0:
+            return np.zeros(len(probes), dtype=bool)
+        return self._keys[pos] == probes
+
+    def neighbors_of_many(self, vs: Iterable[V]) -> Tuple[np.ndarray, np.ndarray]:
+        idx = self.indices_of(vs)
+        indptr, indices = self.neighbors.indptr, self.neighbors.indices
+
+        starts = indptr[idx]
+        lengths = indptr[idx + 1] - starts
+        offsets = np.zeros(len(idx) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return offsets, self.vertices[indices[positions]]
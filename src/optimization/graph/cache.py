@@ -0,0 +1,175 @@
+"""Version-stamped caching of graph query results.
+
+`CachedGraph` is a mixin that composes ahead of any representation:
+
+>>> from optimization.graph import AdjacencySet, IncidenceMatrix
+>>> from optimization.graph.graph import Graph, NormalGraph
+>>> from optimization.graph.cache import CachedGraph
+>>> cls = Graph.from_types(NormalGraph, IncidenceMatrix, CachedGraph)
+
+Every `add_*`/`remove_*`/`set_edge_weight` call bumps the graph's mutation
+version and stamps the vertices it touched. A cached per-vertex result stays
+valid until one of its vertices is touched, and a whole-graph result (such as
+connected components or distances) stays valid until the next mutation.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, NamedTuple, Set, Tuple, TypeVar, TYPE_CHECKING
+
+from .graph import AbstractGraph, DirectedGraph, Edge
+
+if TYPE_CHECKING:
+    import numpy as np
+
+V = TypeVar('V')
+R = TypeVar('R')
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    version: int
+
+
+class QueryCache:
+    """A bounded least-recently-used map from query keys to stamped results."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Tuple[int, Tuple[Any, ...], Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Tuple[int, Tuple[Any, ...], Any] | None:
+        """Returns the (stamp, vertices, result) entry for `key` and marks it recently used."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, stamp: int, vertices: Tuple[Any, ...], result: Any):
+        self._entries[key] = (stamp, vertices, result)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachedGraph(AbstractGraph[V]):
+    """Mixin caching `neighbors_of`, `degree` and derived results until the graph changes.
+
+    Mutations must go through the graph's methods to be seen by the cache.
+    """
+
+    cache_size = 4096
+    """The maximum number of cached results per graph."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self._version = 0
+        self._touched: Dict[V, int] = dict()
+        self._touched_all = 0
+        self._query_cache = QueryCache(self.cache_size)
+
+    @property
+    def version(self) -> int:
+        """The number of mutations made through the graph's methods."""
+        return self._version
+
+    def memoize(self, key: Hashable, compute: Callable[[], R], vertices: Iterable[V] | None = None) -> R:
+        """Return the cached result for `key`, or compute and cache it.
+
+        Args:
+            key: Identifies the query, e.g. `("distances", source)`.
+            compute: Computes the result on a miss.
+            vertices: The vertices whose neighborhoods the result depends on.
+                The result is kept until one of them is touched. If None, the
+                result depends on the whole graph and is kept until the next
+                mutation.
+
+        Returns:
+            The (possibly cached) result.
+        """
+        entry = self._query_cache.get(key)
+        if entry is not None and self._is_valid(entry[0], entry[1]):
+            self._query_cache.hits += 1
+            return entry[2]
+
+        self._query_cache.misses += 1
+        result = compute()
+        self._query_cache.put(key, self._version, None if vertices is None else tuple(vertices), result) # type: ignore
+        return result
+
+    def neighbors_of(self, v: V) -> Set[V]:
+        return self.memoize(("neighbors_of", v), lambda: super(CachedGraph, self).neighbors_of(v), (v,))
+
+    def degree(self, v: V) -> int:
+        return self.memoize(("degree", v), lambda: super(CachedGraph, self).degree(v), (v,))
+
+    def degrees(self) -> np.ndarray:
+        degrees = self.memoize("degrees", lambda: super(CachedGraph, self).degrees())
+        degrees.flags.writeable = False
+        return degrees
+
+    def cache_info(self) -> CacheInfo:
+        cache = self._query_cache
+        return CacheInfo(cache.hits, cache.misses, cache.maxsize, len(cache), self._version)
+
+    def cache_clear(self):
+        """Drop every cached result and reset the hit and miss counters."""
+        self._query_cache.clear()
+        self._query_cache.hits = self._query_cache.misses = 0
+
+    def _is_valid(self, stamp: int, vertices: Tuple[V, ...] | None) -> bool:
+        if vertices is None:
+            return stamp == self._version
+        if self._touched_all > stamp:
+            return False
+
+        return all(self._touched.get(v, 0) <= stamp for v in vertices)
+
+    def _touch(self, *vertices: V):
+        self._version += 1
+        for v in vertices:
+            self._touched[v] = self._version
+
+    def _touch_all(self):
+        self._version += 1
+        self._touched_all = self._version
+        self._touched.clear()
+
+    def add_vertex(self, v: V):
+        super().add_vertex(v)
+        self._touch(v)
+
+    def remove_vertex(self, v: V):
+        if isinstance(self, DirectedGraph):
+            # Vertices with an edge into v are not known without a full scan
+            super().remove_vertex(v)
+            self._touch_all()
+        else:
+            neighbors = list(super().neighbors_of(v))
+            super().remove_vertex(v)
+            self._touch(v, *neighbors)
+
+    def add_edge(self, v1: V, v2: V, weight=None):
+        super().add_edge(v1, v2, weight)
+        self._touch(v1, v2)
+
+    def remove_edge(self, edge: Edge[V]):
+        super().remove_edge(edge)
+        self._touch(edge[0], edge[1])
+
+    def set_edge_weight(self, v1: V, v2: V, weight):
+        super().set_edge_weight(v1, v2, weight) # type: ignore
+        self._touch(v1, v2)
@@ -0,0 +1,327 @@
+"""An append-only log of graph mutations, for consumers that follow a graph incrementally.
+
+`ObservableGraph` is a mixin that composes ahead of any representation and
+records every `add_*`/`remove_*`/`set_edge_weight` call in a bounded
+`ChangeLog`, as well as passing it to any registered observers:
+
+>>> from optimization.graph import AdjacencySet
+>>> from optimization.graph.graph import Graph, NormalGraph
+>>> from optimization.graph.changelog import ObservableGraph, apply_changes
+>>> g = Graph.from_types(NormalGraph, AdjacencySet, ObservableGraph).from_str("a-b")
+>>> g.add_edge("b", "a")
+>>> list(g.changes.iter_changes(since=0))
+[Change(seq=1, kind='add_edge', v1='b', v2='a', weight=None)]
+
+A replica that last saw sequence number `seq` catches up by replaying
+`g.changes.iter_changes(since=seq)` with `apply_changes`, or by decoding
+batches produced by `encode_changes` on the other side of a process or
+network boundary, rather than copying the whole graph again.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, TypeVar
+
+from .graph import AbstractGraph, Edge
+
+V = TypeVar('V')
+
+KINDS = ("add_vertex", "remove_vertex", "add_edge", "remove_edge", "set_edge_weight")
+"""The kinds of change, in the order of their codes in encoded batches."""
+
+_CODES = {kind: code for code, kind in enumerate(KINDS)}
+
+class Change(NamedTuple):
+    """One mutation of a graph.
+
+    `v2` is None for vertex changes, and `weight` is None for unweighted edges.
+    """
+    seq: int
+    kind: str
+    v1: Any
+    v2: Any = None
+    weight: Any = None
+
+
+class ChangeLogOverflow(LookupError):
+    """Raised when the changes asked for have already been dropped from a log's ring buffer.
+
+    A consumer that falls this far behind must copy the whole graph again.
+    """
+
+
+class ChangeLog:
+    """A bounded ring buffer of the most recent changes, numbered from 1.
+
+    Args:
+        capacity: The number of changes kept. Older changes are overwritten.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self._buffer: List[Change | None] = [None] * capacity
+        self._next_seq = 1
+        self._waiters: List[Any] = []
+
+    @property
+    def last_seq(self) -> int:
+        """The sequence number of the latest change, or 0 if there are none."""
+        return self._next_seq - 1
+
+    @property
+    def first_seq(self) -> int:
+        """The sequence number of the oldest change still in the buffer."""
+        return max(self._next_seq - self.capacity, 1)
+
+    def __len__(self) -> int:
+        return self._next_seq - self.first_seq
+
+    def append(self, kind: str, v1, v2=None, weight=None) -> Change:
+        """Record a change, giving it the next sequence number."""
+        change = Change(self._next_seq, kind, v1, v2, weight)
+        self._buffer[change.seq % self.capacity] = change
+        self._next_seq += 1
+
+        if self._waiters:
+            waiters, self._waiters = self._waiters, []
+            for waiter in waiters:
+                waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+
+        return change
+
+    def iter_changes(self, since: int = 0) -> Iterator[Change]:
+        """Yield the changes after sequence number `since`, including any made while iterating.
+
+        Raises a ChangeLogOverflow if some of them have been dropped, either
+        before or during iteration.
+        """
+        seq = since + 1
+        while seq < self._next_seq:
+            if seq < self.first_seq:
+                raise ChangeLogOverflow(f"Changes since {since} have been dropped, the oldest kept is {self.first_seq}")
+
+            yield self._buffer[seq % self.capacity] # type: ignore
+            seq += 1
+
+    def subscribe(self, since: int | None = None) -> Subscription:
+        """Follow the log from sequence number `since`, by default from its latest change."""
+        return Subscription(self, self.last_seq if since is None else since)
+
+    def batches(self, since: int = 0, size: int = 4096) -> Iterator[bytes]:
+        """Yield the changes after `since` encoded by `encode_changes`, at most `size` per batch."""
+        batch: List[Change] = []
+        for change in self.iter_changes(since):
+            batch.append(change)
+            if len(batch) == size:
+                yield encode_changes(batch)
+                batch = []
+
+        if batch:
+            yield encode_changes(batch)
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class Subscription:
+    """A cursor into a `ChangeLog`.
+
+    Iterating yields the changes made since the last one seen and stops once
+    caught up, so a consumer can poll with a plain `for` loop. Iterating with
+    `async for` instead waits for new changes and never stops:
+
+    >>> async for change in graph.changes.subscribe():
+    ...     replica_apply(change)
+    """
+
+    def __init__(self, log: ChangeLog, since: int):
+        self.log = log
+        self.seq = since
+        """The sequence number of the latest change seen."""
+
+    def __iter__(self) -> Iterator[Change]:
+        for change in self.log.iter_changes(self.seq):
+            self.seq = change.seq
+            yield change
+
+    def poll(self) -> List[Change]:
+        """Returns the changes made since the last one seen."""
+        return list(self)
+
+    def __aiter__(self) -> Subscription:
+        return self
+
+    async def __anext__(self) -> Change:
+        # Imported here so that graphs never followed asynchronously don't pay for asyncio
+        import asyncio
+
+        while self.seq >= self.log.last_seq:
+            waiter = asyncio.get_running_loop().create_future()
+            self.log._waiters.append(waiter)
+            await waiter
+
+        return next(iter(self))
+
+
+def encode_changes(changes: Iterable[Change]) -> bytes:
+    """Serialize a batch of changes compactly.
+
+    Vertices are interned, so each change is stored as a one-byte kind code
+    and two integer vertex ids. If every weight is a number, the weights are
+    stored as a float column and decoded as floats.
+
+    The columns are NumPy arrays and the vertex table is JSON, so batches
+    can be decoded from untrusted peers. Vertices must be JSON values
+    (strings, numbers, booleans and None) or tuples of them, and weights
+    numbers or JSON values.
+    """
+    import io
+    import json
+    import zlib
+
+    import numpy as np
+
+    changes = list(changes)
+    seqs = np.fromiter((c.seq for c in changes), dtype=np.int64, count=len(changes))
+    kinds = np.fromiter((_CODES[c.kind] for c in changes), dtype=np.uint8, count=len(changes))
+
+    ids: dict = {None: -1}
+    ends = np.fromiter((ids.setdefault(v, len(ids) - 1) for c in changes for v in (c.v1, c.v2)),
+                       dtype=np.int64, count=2 * len(changes))
+    del ids[None]
+
+    weights: Any = [c.weight for c in changes]
+    numeric = all(type(w) in (int, float) or w is None for w in weights)
+
+    # Sequence numbers are usually consecutive, which differences make cheap to compress
+    columns = [np.diff(seqs).astype(np.int32), kinds, ends.astype(np.int32 if len(ids) < 2**31 else np.int64)]
+    if numeric:
+        columns.append(np.array([np.nan if w is None else w for w in weights], dtype=np.float64))
+
+    header = json.dumps(dict(first=int(seqs[0]) if len(seqs) else 0, vertices=list(ids),
+                             weights=None if numeric else weights)).encode()
+
+    buffer = io.BytesIO()
+    buffer.write(len(header).to_bytes(4, "little"))
+    buffer.write(header)
+    for column in columns:
+        np.save(buffer, column, allow_pickle=False)
+
+    return zlib.compress(buffer.getvalue())
+
+def decode_changes(data: bytes) -> List[Change]:
+    """Returns the changes serialized by `encode_changes`.
+
+    Raises a ValueError if `data` is not such a batch.
+    """
+    import io
+    import json
+    import zlib
+
+    import numpy as np
+
+    try:
+        buffer = io.BytesIO(zlib.decompress(data))
+        header = json.loads(buffer.read(int.from_bytes(buffer.read(4), "little")))
+        gaps, kinds, ends = (np.load(buffer, allow_pickle=False) for _ in range(3))
+        weights = header["weights"]
+        if weights is None:
+            weights = [None if np.isnan(w) else w for w in np.load(buffer, allow_pickle=False).tolist()]
+        first, vertices = header["first"], [_hashable(v) for v in header["vertices"]]
+    except (zlib.error, ValueError, KeyError, TypeError, EOFError) as e:
+        raise ValueError("Not a batch of changes encoded by encode_changes") from e
+
+    seqs = np.concatenate(([first], first + np.cumsum(gaps))).tolist() if len(kinds) else []
+    lookup = vertices + [None] # id -1 is None
+    ends = ends.tolist()
+
+    return [Change(seq, KINDS[code], lookup[ends[2 * i]], lookup[ends[2 * i + 1]], weights[i])
+            for i, (seq, code) in enumerate(zip(seqs, kinds.tolist()))]
+
+def _hashable(value: Any) -> Any:
+    # JSON turns tuples into lists, which cannot be vertices
+    return tuple(map(_hashable, value)) if isinstance(value, list) else value
+
+def apply_changes(graph: AbstractGraph[V], changes: Iterable[Change]) -> int:
+    """Replay changes onto a graph, e.g. a replica. Returns the sequence number of the last one."""
+    seq = 0
+    for change in changes:
+        kind, v1, v2, weight = change.kind, change.v1, change.v2, change.weight
+        if kind == "add_vertex":
+            graph.add_vertex(v1)
+        elif kind == "remove_vertex":
+            graph.remove_vertex(v1)
+        elif kind == "add_edge":
+            graph.add_edge(v1, v2, weight)
+        elif kind == "remove_edge":
+            graph.remove_edge(graph.create_edge_from_vertices(v1, v2, weight))
+        else:
+            graph.set_edge_weight(v1, v2, weight) # type: ignore
+
+        seq = change.seq
+
+    return seq
+
+
+class ObservableGraph(AbstractGraph[V]):
+    """Mixin recording every mutation in a `ChangeLog` and passing it to observers.
+
+    Mutations must go through the graph's methods to be recorded. Removing a
+    vertex is recorded as one change, which removes its edges when replayed.
+    """
+
+    change_log_size = 65536
+    """The number of changes kept in each graph's log."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.changes = ChangeLog(self.change_log_size)
+        """The most recent mutations of the graph."""
+
+        self._observers: List[Callable[[Change], Any]] = []
+        self._nesting = 0
+
+    def add_observer(self, observer: Callable[[Change], Any]):
+        """Call `observer` with each change, after it is made."""
+        self._observers.append(observer)
+
+    def remove_observer(self, observer: Callable[[Change], Any]):
+        """Stop calling `observer`. Raises a ValueError if it is not registered."""
+        self._observers.remove(observer)
+
+    def _record(self, mutate: Callable[[], Any], kind: str, v1, v2=None, weight=None):
+        """Make a mutation and record it, unless the representation made it as part of another."""
+        self._nesting += 1
+        try:
+            mutate()
+        finally:
+            self._nesting -= 1
+
+        if self._nesting:
+            return
+
+        change = self.changes.append(kind, v1, v2, weight)
+        for observer in self._observers:
+            observer(change)
+
+    def add_vertex(self, v: V):
+        self._record(lambda: super(ObservableGraph, self).add_vertex(v), "add_vertex", v)
+
+    def remove_vertex(self, v: V):
+        self._record(lambda: super(ObservableGraph, self).remove_vertex(v), "remove_vertex", v)
+
+    def add_edge(self, v1: V, v2: V, weight=None):
+        self._record(lambda: super(ObservableGraph, self).add_edge(v1, v2, weight), "add_edge", v1, v2, weight)
+
+    def remove_edge(self, edge: Edge[V]):
+        self._record(lambda: super(ObservableGraph, self).remove_edge(edge),
+                     "remove_edge", edge[0], edge[1], getattr(edge, "weight", None))
+
+    def set_edge_weight(self, v1: V, v2: V, weight):
+        self._record(lambda: super(ObservableGraph, self).set_edge_weight(v1, v2, weight), # type: ignore
+                     "set_edge_weight", v1, v2, weight)
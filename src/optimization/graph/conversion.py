@@ -0,0 +1,108 @@
+"""Conversion between graph representations and SciPy sparse matrices.
+
+Every conversion goes through `EdgeArrays`, integer endpoint arrays over a
+vertex table. Each representation exports itself with `to_edge_arrays` and
+imports with `from_edge_arrays`, so converting never materializes `Edge`
+objects unless the target representation stores them:
+
+>>> from optimization.graph import AdjacencySet, IncidenceMatrix
+>>> g2 = convert(g, IncidenceMatrix) # or g.to(IncidenceMatrix)
+
+A new representation joins the engine by implementing those two methods.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence, TypeVar
+
+import numpy as np
+
+from .graph import AbstractGraph, DirectedGraph, WeightedGraph, GraphType, Graph, graph_type_of
+from .edge_arrays import EdgeArrays
+
+V = TypeVar('V')
+
+def convert(graph: AbstractGraph[V], target_cls: type) -> AbstractGraph[V]:
+    """Convert a graph to another representation.
+
+    Args:
+        graph: The graph to convert.
+        target_cls: The class of the new graph. A bare representation such as
+            `AdjacencySet` is composed with the graph type of `graph` (e.g.
+            `DirectedGraph`) first.
+
+    Returns:
+        A new graph with the same vertices, edges and weights.
+    """
+    if not issubclass(target_cls, GraphType):
+        target_cls = Graph.from_types(graph_type_of(graph), target_cls)
+
+    return target_cls.from_edge_arrays(graph.to_edge_arrays())
+
+def to_scipy_sparse(graph: AbstractGraph[V] | EdgeArrays[V], format: str = "csr", weighted: bool = True) -> Any:
+    """Build the adjacency matrix of a graph as a `scipy.sparse` array.
+
+    Rows and columns follow the order of `graph.vertices` (or the vertex table
+    of an `EdgeArrays`). Undirected edges are stored in both directions.
+
+    Args:
+        graph: A graph, or its edge arrays.
+        format: The sparse format to return, such as "csr", "csc" or "coo".
+        weighted: Use edge weights, where the graph has them, as the entries.
+            Otherwise every edge is stored as 1.
+
+    Returns:
+        A square sparse array.
+    """
+    import scipy.sparse
+
+    arrays = graph if isinstance(graph, EdgeArrays) else graph.to_edge_arrays()
+    n = arrays.vertex_count
+
+    src, dst = arrays.src, arrays.dst
+    if weighted and arrays.weights is not None:
+        data = arrays.weights.astype(float)
+    else:
+        data = np.ones(arrays.edge_count)
+
+    if not arrays.directed:
+        mirror = src != dst
+        src, dst = np.concatenate((src, dst[mirror])), np.concatenate((dst, src[mirror]))
+        data = np.concatenate((data, data[mirror]))
+
+    return scipy.sparse.coo_array((data, (src, dst)), shape=(n, n)).asformat(format)
+
+def from_scipy_sparse(cls: type, matrix: Any, vertices: Sequence[V] | None = None) -> AbstractGraph[V]:
+    """Construct a graph from an adjacency matrix.
+
+    Args:
+        cls: The class of the new graph. Directed classes read every entry;
+            undirected classes read the lower triangle including the diagonal.
+            Weighted classes take their edge weights from the entries.
+        matrix: A square `scipy.sparse` matrix or array, or a dense array.
+        vertices: The vertex for each row. Defaults to `range(n)`.
+
+    Returns:
+        A new graph.
+    """
+    import scipy.sparse
+
+    coo = scipy.sparse.coo_array(matrix)
+    if len(coo.shape) != 2 or coo.shape[0] != coo.shape[1]:
+        raise ValueError("Adjacency matrix is not square!")
+
+    coo.sum_duplicates()
+    keep = coo.data != 0
+    if not issubclass(cls, DirectedGraph):
+        keep &= coo.row >= coo.col
+
+    n = coo.shape[0]
+    if vertices is None:
+        vertices = range(n)
+    elif len(vertices) != n:
+        raise ValueError("Need one vertex per row of the adjacency matrix")
+
+    weights = coo.data[keep] if issubclass(cls, WeightedGraph) else None
+    arrays = EdgeArrays(vertices, coo.row[keep], coo.col[keep], weights, directed=issubclass(cls, DirectedGraph))
+
+    return cls.from_edge_arrays(arrays)
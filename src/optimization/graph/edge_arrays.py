@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from typing import Any, Collection, Dict, Iterable, Iterator, NamedTuple, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+V = TypeVar('V')
+
+class CSR(NamedTuple):
+    """Compressed sparse row adjacency over integer vertex ids.
+
+    The neighbors of vertex `i` are `indices[indptr[i]:indptr[i + 1]]`, and
+    `data` (if present) holds the weight of each of those arcs.
+    """
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray | None = None
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.indptr) - 1
+
+    def degrees(self) -> np.ndarray:
+        """Returns the number of stored arcs leaving each vertex."""
+        return np.diff(self.indptr)
+
+    def row(self, i: int) -> np.ndarray:
+        """Returns the neighbor ids of vertex `i`."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+
+class EdgeArrays(Collection[Tuple[V, V]]):
+    """The edges of a graph as two integer endpoint arrays over a vertex table.
+
+    Edge `k` connects `vertices[src[k]]` and `vertices[dst[k]]`. Iterating
+    yields 2-tuples of vertex objects, so an `EdgeArrays` can be handed
+    directly to any representation's `from_vertices_and_edges`:
+
+    >>> from optimization.graph import AdjacencySet
+    >>> arrays = EdgeArrays(["a", "b", "c"], [0, 1], [1, 2])
+    >>> AdjacencySet.from_vertices_and_edges(arrays.vertices, arrays)
+
+    Args:
+        vertices: The vertex table. Integer ids index into it.
+        src: The id of the first endpoint of each edge.
+        dst: The id of the second endpoint of each edge.
+        weights: An optional weight for each edge.
+        directed: Whether each edge points from `src` to `dst`.
+    """
+
+    def __init__(self, vertices: Sequence[V], src: Any, dst: Any, weights: Any = None, directed: bool = False):
+        self.vertices = vertices
+        self.src = np.asarray(src, dtype=np.int64)
+        self.dst = np.asarray(dst, dtype=np.int64)
+        self.weights = None if weights is None else np.asarray(weights)
+        self.directed = directed
+
+        if self.src.shape != self.dst.shape or self.src.ndim != 1:
+            raise ValueError("src and dst must be 1D arrays of equal length")
+
+        if self.weights is not None and self.weights.shape != self.src.shape:
+            raise ValueError("weights must have one entry per edge")
+
+        self._index: Dict[V, int] | None = None
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.vertices)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.src)
+
+    def index_of(self, v: V) -> int:
+        """Returns the integer id of vertex `v`.
+
+        Raises a ValueError if `v` is not in the vertex table.
+        """
+        if _is_identity(self.vertices):
+            if isinstance(v, (int, np.integer)) and 0 <= v < len(self.vertices):
+                return int(v)
+        else:
+            if self._index is None:
+                self._index = {u: i for i, u in enumerate(self.vertices)}
+            if v in self._index:
+                return self._index[v]
+
+        raise ValueError(f"{v!r} not a vertex in graph")
+
+    def __len__(self) -> int:
+        return self.edge_count
+
+    def __iter__(self) -> Iterator[Tuple[V, V]]:
+        if _is_identity(self.vertices):
+            return zip(self.src.tolist(), self.dst.tolist())
+
+        vertices = self.vertices
+        return ((vertices[i], vertices[j]) for i, j in zip(self.src.tolist(), self.dst.tolist()))
+
+    def __contains__(self, edge: object) -> bool:
+        try:
+            v1, v2 = edge # type: ignore
+            i, j = self.index_of(v1), self.index_of(v2)
+        except (TypeError, ValueError):
+            return False
+
+        hits = (self.src == i) & (self.dst == j)
+        if not self.directed:
+            hits |= (self.src == j) & (self.dst == i)
+
+        return bool(hits.any())
+
+    def to_csr(self, symmetric: bool | None = None) -> CSR:
+        """Build a CSR adjacency from the endpoint arrays.
+
+        Args:
+            symmetric: Store every edge in both directions. Defaults to true
+                for undirected edges.
+
+        Returns:
+            The CSR adjacency, with neighbor ids sorted within each row.
+        """
+        if symmetric is None:
+            symmetric = not self.directed
+
+        src, dst, weights = self.src, self.dst, self.weights
+        if symmetric:
+            src, dst = np.concatenate((src, dst)), np.concatenate((dst, src))
+            if weights is not None:
+                weights = np.concatenate((weights, weights))
+
+        order = np.lexsort((dst, src))
+        indptr = np.zeros(self.vertex_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=self.vertex_count), out=indptr[1:])
+
+        return CSR(indptr, dst[order], None if weights is None else weights[order])
+
+
+def vertex_array(vertices: Iterable[Any]) -> np.ndarray:
+    """Pack vertices into a NumPy array: numeric vertices keep a numeric dtype, anything else is stored as objects."""
+    vertices = list(vertices)
+    arr = np.asarray(vertices) if vertices else np.empty(0, dtype=np.int64)
+
+    if arr.ndim == 1 and arr.dtype.kind in "biuf":
+        return arr
+
+    arr = np.empty(len(vertices), dtype=object)
+    arr[:] = vertices
+    return arr
+
+def _int_table(vertices: Sequence[Any]) -> np.ndarray | None:
+    """The vertices as an int64 array, if they are all Python ints that fit."""
+    if not all(type(v) is int for v in vertices):
+        return None
+
+    try:
+        return np.asarray(vertices, dtype=np.int64)
+    except OverflowError:
+        return None
+
+def _positions(table: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """The index in `table`, an array of distinct numbers, of each of `values`, which must all be in it."""
+    n = len(table)
+    if n and table[0] == 0 and table[-1] == n - 1 and np.array_equal(table, np.arange(n)):
+        return values.astype(np.int64, copy=False)
+
+    order = np.argsort(table, kind="stable")
+    return order[np.searchsorted(table, values, sorter=order)]
+
+def _is_identity(vertices: Sequence[Any]) -> bool:
+    """True if the vertex table maps every id to itself."""
+    return isinstance(vertices, range) and vertices.start == 0 and vertices.step == 1
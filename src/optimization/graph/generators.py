@@ -0,0 +1,296 @@
+"""Random and structured graph generators.
+
+Every generator builds its edges with vectorized NumPy calls and returns an
+`EdgeArrays` over the vertex table `range(n)`, so results can be bulk-loaded
+into any representation or turned into a CSR adjacency without creating an
+`Edge` object per edge:
+
+>>> from optimization.graph import AdjacencySet
+>>> from optimization.graph.generators import erdos_renyi
+>>> arrays = erdos_renyi(1000, 0.01, seed=42)
+>>> g = AdjacencySet.from_vertices_and_edges(arrays.vertices, arrays)
+
+Randomized generators take a `seed`, which is anything accepted by
+`numpy.random.default_rng`, so results are reproducible.
+"""
+
+from __future__ import annotations
+
+from itertools import product
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .edge_arrays import EdgeArrays
+
+_CHUNK = 1 << 22
+
+def erdos_renyi(n: int, p: float, seed=None, directed: bool = False) -> EdgeArrays[int]:
+    """Generate a G(n, p) random graph.
+
+    Rather than flipping a coin for each of the O(n^2) vertex pairs, the gaps
+    between successive selected pairs are drawn from a geometric
+    distribution, so the cost is proportional to the number of edges.
+
+    Args:
+        n: The number of vertices.
+        p: The probability that each pair of vertices is connected.
+        seed: Seed for the random number generator.
+        directed: Consider ordered pairs and return directed edges.
+
+    Returns:
+        The edges of the graph.
+    """
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if not 0 <= p <= 1:
+        raise ValueError("p must be a probability")
+
+    rng = np.random.default_rng(seed)
+    pairs = n * (n - 1) if directed else n * (n - 1) // 2
+
+    if p == 0 or pairs == 0:
+        positions = np.empty(0, dtype=np.int64)
+    else:
+        # Draw geometric gaps in chunks sized to the expected edge count
+        expected = pairs * p
+        chunk = int(min(_CHUNK, expected + 5 * np.sqrt(expected) + 16))
+        found = []
+        last = -1
+
+        while last < pairs:
+            gaps = rng.geometric(p, size=chunk)
+            steps = last + np.cumsum(gaps)
+            found.append(steps[steps < pairs])
+            last = int(steps[-1])
+
+        positions = np.concatenate(found)
+
+    if directed:
+        src, dst = np.divmod(positions, n - 1) if n > 1 else (positions, positions)
+        dst += dst >= src
+    else:
+        dst, src = _unrank_lower_triangle(positions)
+
+    return EdgeArrays(range(n), src, dst, directed=directed)
+
+def barabasi_albert(n: int, m: int, seed=None) -> EdgeArrays[int]:
+    """Generate a Barabási–Albert preferential attachment graph.
+
+    The graph starts as a star on `m + 1` vertices. Each later vertex attaches
+    to `m` earlier vertices chosen with probability proportional to degree.
+    Choosing a uniformly random entry of the endpoint list is exactly
+    degree-proportional, and since that entry always precedes the new vertex
+    every choice can be drawn up front and resolved with a few vectorized
+    pointer-jumping passes. Repeated choices by the same vertex are merged, so
+    a vertex can occasionally attach with fewer than `m` edges.
+
+    Args:
+        n: The number of vertices.
+        m: The number of edges each new vertex attaches with.
+        seed: Seed for the random number generator.
+
+    Returns:
+        The edges of the graph.
+    """
+    if m < 1 or m >= n:
+        raise ValueError("m must satisfy 1 <= m < n")
+
+    rng = np.random.default_rng(seed)
+
+    new_vertices = np.arange(m + 1, n, dtype=np.int64)
+    seeds = m # edges of the initial star
+
+    # Endpoint list: edge k occupies positions 2k and 2k + 1
+    ends = np.empty(2 * (seeds + m * len(new_vertices)), dtype=np.int64)
+    ends[0:2 * seeds:2] = 0
+    ends[1:2 * seeds:2] = np.arange(1, m + 1)
+    ends[2 * seeds::2] = np.repeat(new_vertices, m)
+
+    # Each new edge copies a uniformly chosen earlier endpoint
+    earlier = 2 * m * (np.repeat(new_vertices, m) - m)
+    refs = (rng.random(len(earlier)) * earlier).astype(np.int64)
+
+    pending = (refs >= 2 * seeds) & (refs % 2 == 1)
+    while pending.any():
+        refs[pending] = refs[(refs[pending] - 1) // 2 - seeds]
+        pending[pending] = (refs[pending] >= 2 * seeds) & (refs[pending] % 2 == 1)
+
+    ends[2 * seeds + 1::2] = ends[refs]
+
+    # Repeated choices can only come from the same vertex, so sort within each vertex's block
+    src, dst = ends[0::2], ends[1::2]
+    dst[seeds:].reshape(-1, m).sort(axis=1)
+    keep = np.ones(len(dst), dtype=bool)
+    keep[seeds:].reshape(-1, m)[:, 1:] = np.diff(dst[seeds:].reshape(-1, m), axis=1) != 0
+
+    return EdgeArrays(range(n), src[keep], dst[keep])
+
+def random_regular(n: int, d: int, seed=None, max_rounds: int = 1000) -> EdgeArrays[int]:
+    """Generate a random simple d-regular graph.
+
+    Stubs are paired by the configuration model. Pairs forming self-loops or
+    parallel edges are released, together with as many randomly chosen good
+    pairs, and re-paired until the graph is simple.
+
+    Args:
+        n: The number of vertices.
+        d: The degree of every vertex.
+        seed: Seed for the random number generator.
+        max_rounds: The number of repair rounds to attempt before giving up.
+
+    Returns:
+        The edges of the graph.
+    """
+    if not 0 <= d < n:
+        raise ValueError("d must satisfy 0 <= d < n")
+    if (n * d) % 2:
+        raise ValueError("n * d must be even")
+
+    rng = np.random.default_rng(seed)
+    pairs = rng.permutation(np.repeat(np.arange(n, dtype=np.int64), d)).reshape(-1, 2)
+
+    for _ in range(max_rounds):
+        pairs.sort(axis=1)
+        keys = pairs[:, 0] * n + pairs[:, 1]
+
+        bad = _repeats(keys) | (pairs[:, 0] == pairs[:, 1])
+
+        n_bad = int(bad.sum())
+        if n_bad == 0:
+            return EdgeArrays(range(n), pairs[:, 0], pairs[:, 1])
+
+        good = np.flatnonzero(~bad)
+        release = np.concatenate((np.flatnonzero(bad), rng.choice(good, size=min(n_bad, len(good)), replace=False)))
+        pairs[release] = rng.permutation(pairs[release].ravel()).reshape(-1, 2)
+
+    raise ValueError(f"could not generate a simple {d}-regular graph on {n} vertices")
+
+def grid_graph(shape: Sequence[int], periodic: bool = False) -> EdgeArrays[int]:
+    """Generate a grid (lattice) graph of any dimension.
+
+    Vertex ids are the row-major flattening of grid coordinates, so
+    `grid_graph((rows, cols))` connects `r * cols + c` to its four neighbors.
+
+    Args:
+        shape: The number of vertices along each axis, e.g. `(rows, cols)` for
+            a 2D grid or `(x, y, z)` for a 3D grid.
+        periodic: Wrap around each axis longer than two vertices (a torus).
+
+    Returns:
+        The edges of the graph.
+    """
+    shape = tuple(shape)
+    if any(s < 0 for s in shape):
+        raise ValueError("grid dimensions must be non-negative")
+
+    n = int(np.prod(shape, dtype=np.int64))
+    ids = np.arange(n, dtype=np.int64).reshape(shape)
+    src, dst = [], []
+
+    for axis, size in enumerate(shape):
+        lo = [slice(None)] * len(shape)
+        hi = [slice(None)] * len(shape)
+        lo[axis] = slice(0, size - 1)
+        hi[axis] = slice(1, size)
+        src.append(ids[tuple(lo)].ravel())
+        dst.append(ids[tuple(hi)].ravel())
+
+        if periodic and size > 2:
+            src.append(np.take(ids, size - 1, axis=axis).ravel())
+            dst.append(np.take(ids, 0, axis=axis).ravel())
+
+    if not src:
+        return EdgeArrays(range(n), [], [])
+
+    return EdgeArrays(range(n), np.concatenate(src), np.concatenate(dst))
+
+def random_geometric(n: int, radius: float, dim: int = 2, seed=None,
+                     return_positions: bool = False) -> EdgeArrays[int] | Tuple[EdgeArrays[int], np.ndarray]:
+    """Generate a random geometric graph in the unit cube.
+
+    Points are placed uniformly at random and every pair at Euclidean distance
+    at most `radius` is connected. Points are binned into cells at least
+    `radius` wide, so only pairs in neighboring cells are ever compared.
+
+    Args:
+        n: The number of vertices.
+        radius: The connection distance.
+        dim: The dimension of the unit cube.
+        seed: Seed for the random number generator.
+        return_positions: Also return the `(n, dim)` array of point positions.
+
+    Returns:
+        The edges of the graph, and the positions if requested.
+    """
+    if radius < 0:
+        raise ValueError("radius must be non-negative")
+
+    rng = np.random.default_rng(seed)
+    positions = rng.random((n, dim))
+
+    # Cells at least radius wide, but no more cells than a few per point
+    cells_per_axis = int(min(1 / radius if radius > 0 else np.inf, max(1, (4 * n) ** (1 / dim))))
+    cells_per_axis = max(cells_per_axis, 1)
+    grid = (cells_per_axis,) * dim
+
+    cells = np.minimum((positions * cells_per_axis).astype(np.int64), cells_per_axis - 1)
+    cell_ids = np.ravel_multi_index(cells.T, grid)
+
+    order = np.argsort(cell_ids, kind='stable')
+    positions_sorted = positions[order]
+    cells_sorted = cells[order]
+    counts = np.bincount(cell_ids, minlength=cells_per_axis ** dim)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    src, dst = [], []
+    block = max(1, _CHUNK // max(1, 3 ** dim * max(1, n // cells_per_axis ** dim)))
+
+    for offset in product((-1, 0, 1), repeat=dim):
+        # Visit each unordered pair of neighboring cells once
+        if offset < (0,) * dim:
+            continue
+
+        for lo in range(0, n, block):
+            hi = min(n, lo + block)
+            other = cells_sorted[lo:hi] + offset
+            valid = np.all((other >= 0) & (other < cells_per_axis), axis=1)
+
+            i = np.arange(lo, hi)[valid]
+            other_ids = np.ravel_multi_index(other[valid].T, grid)
+            reps = counts[other_ids]
+
+            i = np.repeat(i, reps)
+            j = np.repeat(starts[other_ids] - np.cumsum(reps) + reps, reps) + np.arange(reps.sum())
+
+            if not any(offset):
+                keep = j > i
+                i, j = i[keep], j[keep]
+
+            close = np.sum((positions_sorted[i] - positions_sorted[j]) ** 2, axis=1) <= radius ** 2
+            src.append(order[i[close]])
+            dst.append(order[j[close]])
+
+    arrays = EdgeArrays(range(n), np.concatenate(src) if src else [], np.concatenate(dst) if dst else [])
+
+    if return_positions:
+        return arrays, positions
+    return arrays
+
+def _repeats(keys: np.ndarray) -> np.ndarray:
+    """Mark every occurrence of a key after its first."""
+    order = np.argsort(keys, kind='stable')
+    repeats = np.zeros(len(keys), dtype=bool)
+    repeats[order[1:]] = keys[order[1:]] == keys[order[:-1]]
+    return repeats
+
+def _unrank_lower_triangle(k: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Map linear indices of the strict lower triangle to `(row, col)` pairs."""
+    k = np.asarray(k, dtype=np.int64)
+    row = ((1 + np.sqrt(1 + 8 * k.astype(np.float64))) // 2).astype(np.int64)
+
+    # Correct any rounding error in the square root
+    row -= row * (row - 1) // 2 > k
+    row += (row + 1) * row // 2 <= k
+
+    return row, k - row * (row - 1) // 2
@@ -1,16 +1,27 @@
 from __future__ import annotations
 
-from typing import TypeVar, Generic, Collection, Tuple, Set, Iterable, Dict, Any
+from typing import TypeVar, Generic, Collection, Tuple, Set, Iterable, Dict, Any, Callable, List, TYPE_CHECKING
 
 import warnings
 
 import re
 
+import itertools
+
 from abc import ABCMeta, abstractmethod
 
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .edge_arrays import EdgeArrays
+    from .memory import MemoryUsage
+
 V = TypeVar('V')
 W = TypeVar('W')
 
+_subclass_hooks: List[Callable[[type], None]] = list()
+"""Callbacks run on every newly defined graph class (used by instrumentation)."""
+
 class Edge(Generic[V]):
     """Represents an (undirected) edge in a graph.
     
@@ -166,6 +177,12 @@ class DirectedWeightedEdge(DirectedEdge[V], WeightedEdge[V, W]):
         return f"DirectedWeightedEdge(v1={self.v1!r}, v2={self.v2!r}, weight={self.weight}, label={self._label!r})"
 
 class AbstractGraph(Generic[V], metaclass=ABCMeta):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        for hook in _subclass_hooks:
+            hook(cls)
+
     @abstractmethod
     def is_adjacent(self, v1: V, v2: V) -> bool:
         """Returns true if v1 and v2 are adjacent.
@@ -196,6 +213,45 @@ class AbstractGraph(Generic[V], metaclass=ABCMeta):
         """Returns the neighboring vertices of v."""
         pass
 
+    def degree(self, v: V) -> int:
+        """Returns the number of neighbors of v."""
+        return len(self.neighbors_of(v))
+
+    def degrees(self) -> np.ndarray:
+        """Returns the degree of every vertex, in the order of `vertices`."""
+        import numpy as np
+
+        return np.fromiter(map(self.degree, self.vertices), dtype=np.int64)
+
+    def is_adjacent_many(self, src: Iterable[V], dst: Iterable[V]) -> np.ndarray:
+        """Returns a boolean array, true where `src[i]` and `dst[i]` are adjacent.
+
+        Raises a ValueError if any vertex is not in the graph.
+        """
+        import numpy as np
+
+        src, dst = list(src), list(dst)
+        if len(src) != len(dst):
+            raise ValueError("src and dst must have the same length")
+
+        return np.fromiter(map(self.is_adjacent, src, dst), dtype=bool, count=len(src))
+
+    def neighbors_of_many(self, vs: Iterable[V]) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the neighbors of many vertices as a CSR-style (offsets, values) pair.
+
+        The neighbors of `vs[i]` are `values[offsets[i]:offsets[i + 1]]`.
+        Raises a ValueError if any vertex is not in the graph.
+        """
+        import numpy as np
+        from .edge_arrays import vertex_array
+
+        neighbors = [self.neighbors_of(v) for v in vs]
+
+        offsets = np.zeros(len(neighbors) + 1, dtype=np.int64)
+        np.cumsum([len(n) for n in neighbors], out=offsets[1:])
+
+        return offsets, vertex_array(itertools.chain.from_iterable(neighbors))
+
     @abstractmethod
     def add_vertex(self, v: V):
         """Add vertex v to the graph"""
@@ -314,6 +370,94 @@ class AbstractGraph(Generic[V], metaclass=ABCMeta):
         return cls.from_vertices_and_edges(vertices, edges)
             
     
+    def memory_usage(self, deep: bool = True) -> MemoryUsage:
+        """Returns the bytes this graph uses, by component. See `optimization.graph.memory`.
+
+        Args:
+            deep: Also count the vertex, edge and weight objects the graph
+                holds, rather than only the containers and arrays holding them.
+        """
+        from .memory import graph_memory_usage
+
+        return graph_memory_usage(self, deep)
+
+    def _memory_components(self) -> List[Tuple[str, Any, str]]:
+        """The (component, object, part) triples `memory_usage` counts. Mixins add their own.
+
+        `part` is "all" for the object and what it holds, "container" for the
+        object alone, or "contents" for the objects it yields but not itself.
+        Attributes not listed are counted as "other".
+        """
+        return []
+
+    def __reduce__(self):
+        """Pickle the graph as its edge arrays. See `optimization.graph.sharing`."""
+        from .sharing import reduce_graph
+
+        return reduce_graph(self)
+
+    def _extra_state(self) -> Dict[str, Any]:
+        """State other than the vertices and edges that pickling keeps. Mixins add their own."""
+        return dict()
+
+    def __setstate__(self, state: Dict[str, Any]):
+        """Restore the state from `_extra_state` onto an unpickled graph."""
+        pass
+
+    def to_edge_arrays(self) -> EdgeArrays[V]:
+        """Export the graph as integer endpoint arrays over a vertex table.
+
+        This is the intermediate form every conversion between representations
+        goes through. Representations override it with faster exports; this
+        version reads `edges`.
+        """
+        from .edge_arrays import EdgeArrays
+
+        vertices = list(self.vertices)
+        index = {v: i for i, v in enumerate(vertices)}
+        edges = list(self.edges)
+
+        weights = None
+        if isinstance(self, WeightedGraph):
+            weights = [self.get_edge_weight(v1, v2) for v1, v2 in edges]
+
+        return EdgeArrays(vertices,
+                          [index[v1] for v1, _ in edges],
+                          [index[v2] for _, v2 in edges],
+                          weights,
+                          directed=isinstance(self, DirectedGraph))
+
+    @classmethod
+    def from_edge_arrays(cls, arrays: EdgeArrays[V]) -> AbstractGraph[V]:
+        """Construct a graph from integer endpoint arrays over a vertex table.
+
+        Representations override this with faster imports; this version builds
+        an edge object per edge and calls `from_vertices_and_edges`.
+        """
+        return cls.from_vertices_and_edges(list(arrays.vertices), cls._edges_from_arrays(arrays))
+
+    @classmethod
+    def _edges_from_arrays(cls, arrays: EdgeArrays[V]) -> List[Edge[V]]:
+        """Build an edge object of this graph's edge type for each edge in the arrays."""
+        edge_type = getattr(cls, "EDGE_TYPE", Edge)
+        vertices = arrays.vertices
+
+        if arrays.weights is None:
+            weights: Iterable[Any] = itertools.repeat(None)
+        else:
+            weights = arrays.weights.tolist()
+
+        return [edge_type.from_args(vertices[i], vertices[j], w)
+                for i, j, w in zip(arrays.src.tolist(), arrays.dst.tolist(), weights)]
+
+    def to(self, target_cls: type) -> AbstractGraph[V]:
+        """Convert this graph to another representation.
+
+        See `optimization.graph.conversion.convert`.
+        """
+        from .conversion import convert
+        return convert(self, target_cls)
+
     @classmethod
     @abstractmethod
     def _empty_graph(cls) -> AbstractGraph[V]:
@@ -359,8 +503,32 @@ class DirectedWeightedGraph(DirectedGraph[V], WeightedGraph[V, W]):
     EDGE_TYPE = DirectedWeightedEdge
 
 class Graph(GraphType[V], GraphRepresentation[V]):
+    _composed: Dict[Tuple[type, ...], type] = dict()
+
     @classmethod
-    def from_types(cls, type_, repr_) -> type:
-        name = f"{type_}_{repr_}"
-        return type(name, (type_, repr_), dict())
+    def from_types(cls, type_, repr_, *mixins) -> type:
+        """Compose a graph type (e.g. `WeightedGraph`) with a representation (e.g. `AdjacencySet`).
+
+        The representation comes first in the method resolution order, so the
+        methods it implements (such as `get_edge_weight`) take precedence over
+        the abstract declarations of the graph type. Mixins (such as
+        `CachedGraph`) come before both, so they can wrap the representation's
+        methods. The same class is returned for the same arguments.
+        """
+        key = (type_, repr_, *mixins)
+        if key not in cls._composed:
+            name = "_".join(base.__name__ for base in (type_, repr_, *mixins))
+            cls._composed[key] = type(name, (*mixins, repr_, type_), dict())
+
+        return cls._composed[key]
+
+def graph_type_of(graph: AbstractGraph | type) -> type:
+    """Returns the most specific graph type (e.g. `DirectedGraph`) a graph or graph class belongs to."""
+    cls = graph if isinstance(graph, type) else type(graph)
+
+    for type_ in (DirectedWeightedGraph, DirectedGraph, WeightedGraph, NormalGraph):
+        if issubclass(cls, type_):
+            return type_
+
+    return NormalGraph
     
\ No newline at end of file
@@ -1,13 +1,27 @@
-from typing import Collection, Set, Tuple, List
+from typing import Any, Collection, Set, Tuple, List
 import numpy as np
 
-from .graph import AbstractGraph, GraphRepresentation, Edge, V
+from .graph import AbstractGraph, GraphRepresentation, Edge, V, DirectedGraph, WeightedGraph
+from .edge_arrays import EdgeArrays
+from .batch import SparseAdjacency
 
 class IncidenceMatrix(GraphRepresentation[V]):
-    def __init__(self, vertices: List[V], matrix: np.typing.ArrayLike):
+    """A graph stored as a vertex-by-edge matrix.
+
+    Each column has a nonzero entry in the rows of the edge's endpoints. In
+    directed graphs the source's entry is -1 and the destination's +1 (a
+    loop has a single +1), so the matrix keeps the direction of each edge.
+    """
+
+    def __init__(self, vertices: List[V], matrix: np.typing.ArrayLike, weights: np.typing.ArrayLike | None = None):
         # TODO: maybe make vertices a one-to-one mapping in the future, so that there's no possibility of duplicate vertices
         self._vertices = vertices
         self.matrix = np.array(matrix)
+
+        self.weights = None if weights is None else np.array(weights, dtype=float)
+        """The weight of the edge in each column, or None if the graph is unweighted."""
+
+        self._sparse_adjacency: Tuple[np.ndarray, SparseAdjacency[V]] | None = None
         
     @property
     def vertices(self) -> List[V]:
@@ -17,21 +31,21 @@ class IncidenceMatrix(GraphRepresentation[V]):
     def edges(self) -> Set[Edge[V]]:
         edges: Set[Edge[V]] = set()
 
-        for j, col in enumerate(self.matrix.T):
-            indices = np.where(col)[0]
-            edge = Edge(self.vertices[indices[0]], self.vertices[indices[1]])
+        for i, j in zip(*self._endpoints()):
+            edge = Edge(self.vertices[i], self.vertices[j])
             edges.add(edge)
 
         return edges
 
     def is_adjacent(self, v1: V, v2: V) -> bool:
-        return np.any(self.matrix[self.get_vertex_index(v1)] * self.matrix[self.get_vertex_index(v2)]) # type: ignore
+        return bool(self.get_edge_index(Edge(v1, v2)))
 
     def neighbors_of(self, v: V) -> Set[V]:
         # product of incidence matrix and vertex row gives number of connections to each vertex
-        neighbors = list(np.where(self.matrix @ self.matrix[self.get_vertex_index(v)] >= 1)[0])
+        incidence = self.matrix != 0 # directed graphs have -1 entries
+        neighbors = list(np.where(incidence @ incidence[self.get_vertex_index(v)])[0])
         neighbors = set(map(lambda i: self.vertices[i], neighbors))
-        neighbors.remove(v) # remove self from neighbor list (TODO: removes loops, which we would want to keep)
+        neighbors.discard(v) # remove self from neighbor list (TODO: removes loops, which we would want to keep)
         return neighbors
 
     def add_vertex(self, v: V):
@@ -43,16 +57,67 @@ class IncidenceMatrix(GraphRepresentation[V]):
     def remove_vertex(self, v: V):
         idx = self.get_vertex_index(v)
         self._vertices.remove(v)
-        self.matrix =  np.concat((self.matrix[:idx], self.matrix[idx+1:]))
+
+        # Drop the vertex's edges too, or their other endpoints would read as loops
+        kept = self.matrix[idx] == 0
+        self.matrix =  np.concat((self.matrix[:idx], self.matrix[idx+1:]))[:, kept]
+        if self.weights is not None:
+            self.weights = self.weights[kept]
 
     def add_edge(self, v1: V, v2: V, weight = None):
         self.matrix = np.pad(self.matrix, ((0, 0), (0, 1)), mode='constant', constant_values='0')
         self.matrix[self.get_vertex_index(v1), -1] = self.matrix[self.get_vertex_index(v2), -1] = 1
+        if isinstance(self, DirectedGraph) and v1 != v2:
+            self.matrix[self.get_vertex_index(v1), -1] = -1
+
+        if weight is not None and self.weights is None:
+            self.weights = np.full(self.edge_count - 1, np.nan)
+        if self.weights is not None:
+            self.weights = np.append(self.weights, np.nan if weight is None else weight)
 
     def remove_edge(self, edge: Edge[V]):
-        idx = self.get_edge_index(edge).pop()
+        idx = self._single_edge_index(edge[0], edge[1])
         self.matrix =  np.concat((self.matrix[:, :idx], self.matrix[:, idx+1:]), axis=1)
+
+        if self.weights is not None:
+            self.weights = np.delete(self.weights, idx)
+
+    def get_edge_weight(self, v1: V, v2: V):
+        idx = self._single_edge_index(v1, v2)
+        return None if self.weights is None else self.weights[idx].item()
+
+    def set_edge_weight(self, v1: V, v2: V, weight):
+        idx = self._single_edge_index(v1, v2)
+
+        if self.weights is None:
+            self.weights = np.full(self.edge_count, np.nan)
+        self.weights[idx] = weight
+
+    def _single_edge_index(self, v1: V, v2: V) -> int:
+        indices = self.get_edge_index(Edge(v1, v2))
+        if not indices:
+            raise ValueError(f"no edge between {v1!r} and {v2!r}")
+
+        return min(indices)
         
+    def degrees(self) -> np.ndarray:
+        return self._batch_queries().degrees()
+
+    def is_adjacent_many(self, src, dst) -> np.ndarray:
+        return self._batch_queries().is_adjacent_many(src, dst)
+
+    def neighbors_of_many(self, vs) -> Tuple[np.ndarray, np.ndarray]:
+        return self._batch_queries().neighbors_of_many(vs)
+
+    def _batch_queries(self) -> SparseAdjacency[V]:
+        # Every mutation replaces the matrix, so the adjacency is kept while the matrix object is unchanged
+        cached = self._sparse_adjacency
+        if cached is None or cached[0] is not self.matrix:
+            adjacency = SparseAdjacency(self.to_edge_arrays(), loops_are_neighbors=False)
+            self._sparse_adjacency = cached = (self.matrix, adjacency)
+
+        return cached[1]
+
     def get_vertex_index(self, v: V) -> int:
         """Get the incidence matrix row index of the vertex."""
         return self.vertices.index(v)
@@ -61,7 +126,18 @@ class IncidenceMatrix(GraphRepresentation[V]):
         """Get the incidence matrix column index of the provided edge."""
         v1 = self.get_vertex_index(edge.v1)
         v2 = self.get_vertex_index(edge.v2)
-        return set(np.where(self.matrix[v1] * self.matrix[v2])[0]) # type: ignore
+        row1, row2 = self.matrix[v1], self.matrix[v2]
+
+        if v1 == v2:
+            # A loop is the only nonzero entry of its column
+            matches = (row1 != 0) & (np.count_nonzero(self.matrix, axis=0) == 1)
+        elif isinstance(self, DirectedGraph):
+            # v1 holds the source entry: -1, or the lower row of an unsigned column
+            matches = (row2 > 0) & ((row1 < 0) | ((row1 > 0) & (v1 < v2)))
+        else:
+            matches = (row1 != 0) & (row2 != 0)
+
+        return set(np.where(matches)[0].tolist())
 
     @property
     def vertex_count(self) -> int:
@@ -71,18 +147,73 @@ class IncidenceMatrix(GraphRepresentation[V]):
     def edge_count(self) -> int:
         return self.matrix.shape[1]
 
+    def _memory_components(self) -> List[Tuple[str, Any, str]]:
+        return super()._memory_components() + [
+            ("vertices", self._vertices, "all"),
+            ("arrays", self.matrix, "all"),
+            ("arrays", self.weights, "all"),
+            ("arrays", self._sparse_adjacency, "all"),
+        ]
+
+    def _endpoints(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The source and destination rows of each column."""
+        # Column-major nonzeros: the rows touched by each edge, in column order
+        cols, rows = np.nonzero(self.matrix.T)
+        counts = np.bincount(cols, minlength=self.edge_count)
+        first = np.cumsum(counts) - counts
+
+        src = rows[first]
+        dst = rows[first + counts - 1] # equal to src for loops
+
+        # Without signs (undirected graphs, or matrices built by hand), edges point from the lower row
+        columns = np.arange(self.edge_count)
+        reversed_ = (self.matrix[src, columns] > 0) & (self.matrix[dst, columns] < 0)
+        return np.where(reversed_, dst, src), np.where(reversed_, src, dst)
+
+    def to_edge_arrays(self) -> EdgeArrays[V]:
+        src, dst = self._endpoints()
+        weights = self.weights if isinstance(self, WeightedGraph) else None
+
+        return EdgeArrays(list(self.vertices), src, dst, weights, directed=isinstance(self, DirectedGraph))
+
+    @classmethod
+    def _incidence(cls, vertex_count: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        columns = np.arange(len(src))
+
+        matrix = np.zeros(shape=(vertex_count, len(src)))
+        matrix[src, columns] = -1 if issubclass(cls, DirectedGraph) else 1
+        matrix[dst, columns] = 1 # after the sources, so loops get a single +1
+
+        return matrix
+
+    @classmethod
+    def from_edge_arrays(cls, arrays: EdgeArrays[V]) -> AbstractGraph[V]:
+        matrix = cls._incidence(arrays.vertex_count, arrays.src, arrays.dst)
+        return cls(list(arrays.vertices), matrix, arrays.weights)
+
     @classmethod
     def from_vertices_and_edges(cls, vertices: Collection[V], edges: Collection[Edge[V]]) -> AbstractGraph[V]:
         m = len(vertices)
         n = len(edges)
         
         vertices = list(vertices)
+        index = {v: i for i, v in enumerate(vertices)}
+
+        rows = np.empty(shape=(2, n), dtype=np.int64)
+        weights = list()
+        for i, edge in enumerate(edges):
+            try:
+                rows[0, i], rows[1, i] = index[edge[0]], index[edge[1]]
+            except KeyError as e:
+                raise ValueError(f"{e.args[0]!r} not in vertices") from None
+            weights.append(getattr(edge, "weight", None))
+
+        matrix = cls._incidence(m, rows[0], rows[1])
 
-        matrix = np.zeros(shape=(m, n))
-        for i, (v1, v2) in enumerate(edges):
-            matrix[vertices.index(v1), i] = matrix[vertices.index(v2), i] = 1
+        if all(weight is None for weight in weights):
+            return cls(vertices, matrix)
 
-        return cls(vertices, matrix)
+        return cls(vertices, matrix, [np.nan if weight is None else weight for weight in weights])
 
     @classmethod
     def _empty_graph(cls) -> AbstractGraph[V]:
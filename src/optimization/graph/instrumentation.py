@@ -0,0 +1,251 @@
+"""Opt-in call counting and timing for graph operations.
+
+While instrumentation is enabled, the public methods of `AbstractGraph` and
+every representation are swapped for wrappers that count calls, accumulate
+wall time and record input sizes (such as the degree returned by
+`neighbors_of` or the number of edges passed to `from_vertices_and_edges`).
+Disabling it puts the original functions back, so an uninstrumented graph
+runs exactly the code it would without this module.
+
+>>> from optimization.graph.instrumentation import instrumented
+>>> with instrumented() as stats:
+...     run_workload()
+>>> print(stats.to_prometheus())
+
+Setting the `OPTIMIZATION_GRAPH_INSTRUMENT` environment variable to a
+non-empty value enables instrumentation when `optimization.graph` is imported.
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from . import graph as _graph
+from .graph import AbstractGraph
+
+ENV_VAR = "OPTIMIZATION_GRAPH_INSTRUMENT"
+
+SizeFunction = Callable[[tuple, dict, Any], int]
+
+def _len_of_result(args: tuple, kwargs: dict, result: Any) -> int:
+    return len(result)
+
+def _len_of_edges(args: tuple, kwargs: dict, result: Any) -> int:
+    return len(kwargs["edges"] if "edges" in kwargs else args[-1])
+
+def _len_of_batch(args: tuple, kwargs: dict, result: Any) -> int:
+    return len(result[0]) - 1 if isinstance(result, tuple) else len(result)
+
+INSTRUMENTED_METHODS: Dict[str, SizeFunction | None] = {
+    "is_adjacent": None,
+    "get_connecting_edges": None,
+    "neighbors_of": _len_of_result,
+    "degree": None,
+    "degrees": _len_of_result,
+    "is_adjacent_many": _len_of_batch,
+    "neighbors_of_many": _len_of_batch,
+    "add_vertex": None,
+    "remove_vertex": None,
+    "add_edge": None,
+    "remove_edge": None,
+    "get_edge_weight": None,
+    "set_edge_weight": None,
+    "vertices": _len_of_result,
+    "edges": _len_of_result,
+    "vertex_count": None,
+    "edge_count": None,
+    "from_vertices_and_edges": _len_of_edges,
+    "from_edges": _len_of_edges,
+    "from_str": None,
+    "to_char_string": None,
+}
+"""Public methods that are instrumented, mapped to how the input size of a call is measured."""
+
+class MethodStats:
+    """Accumulated measurements for one method of one class."""
+
+    __slots__ = ("calls", "seconds", "max_seconds", "sized_calls", "total_size", "max_size")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.sized_calls = 0
+        self.total_size = 0
+        self.max_size = 0
+
+    def as_dict(self) -> Dict[str, int | float]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Instrumentation:
+    """Collects `MethodStats` keyed by (class name, method name)."""
+
+    def __init__(self):
+        self.stats: Dict[Tuple[str, str], MethodStats] = dict()
+
+    def record(self, owner: str, method: str, seconds: float, size: int | None = None):
+        stats = self.stats.get((owner, method))
+        if stats is None:
+            stats = self.stats[owner, method] = MethodStats()
+
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+
+        if size is not None:
+            stats.sized_calls += 1
+            stats.total_size += size
+            stats.max_size = max(stats.max_size, size)
+
+    def reset(self):
+        self.stats.clear()
+
+    def as_dict(self) -> Dict[str, Dict[str, int | float]]:
+        """Returns the measurements keyed by `"Class.method"`."""
+        return {f"{owner}.{method}": stats.as_dict() for (owner, method), stats in sorted(self.stats.items())}
+
+    def to_prometheus(self, prefix: str = "optimization_graph") -> str:
+        """Returns the measurements in the Prometheus text exposition format."""
+        metrics = [
+            ("calls_total", "counter", "Number of calls to each graph method.", "calls"),
+            ("seconds_total", "counter", "Wall time spent in each graph method.", "seconds"),
+            ("seconds_max", "gauge", "Longest single call to each graph method.", "max_seconds"),
+            ("input_size_total", "counter", "Sum of the input sizes passed to each graph method.", "total_size"),
+            ("input_size_max", "gauge", "Largest input size passed to each graph method.", "max_size"),
+        ]
+
+        lines: List[str] = []
+        for suffix, kind, help_text, field in metrics:
+            name = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+            for (owner, method), stats in sorted(self.stats.items()):
+                if field in ("total_size", "max_size") and not stats.sized_calls:
+                    continue
+                lines.append(f'{name}{{class="{owner}",method="{method}"}} {getattr(stats, field)}')
+
+        return "\n".join(lines) + "\n"
+
+
+recorder = Instrumentation()
+"""The global recorder that instrumented methods report to."""
+
+_originals: Dict[type, Dict[str, Any]] = dict()
+_depth = 0
+
+def is_enabled() -> bool:
+    return _depth > 0
+
+def enable():
+    """Swap instrumented methods into every graph class.
+
+    Calls nest: instrumentation stays on until `disable` has been called as
+    many times as `enable`.
+    """
+    global _depth
+    _depth += 1
+
+    if _depth == 1:
+        for cls in _graph_classes():
+            _instrument_class(cls)
+        _graph._subclass_hooks.append(_instrument_class)
+
+def disable():
+    """Restore the original, uninstrumented methods."""
+    global _depth
+    if _depth == 0:
+        return
+
+    _depth -= 1
+
+    if _depth == 0:
+        _graph._subclass_hooks.remove(_instrument_class)
+        for cls, originals in _originals.items():
+            for name, original in originals.items():
+                setattr(cls, name, original)
+        _originals.clear()
+
+@contextmanager
+def instrumented(reset: bool = True) -> Iterator[Instrumentation]:
+    """Enable instrumentation for the duration of a `with` block.
+
+    Args:
+        reset: Clear previously recorded measurements first.
+
+    Yields:
+        The recorder holding the measurements.
+    """
+    if reset:
+        recorder.reset()
+
+    enable()
+    try:
+        yield recorder
+    finally:
+        disable()
+
+def _graph_classes() -> Iterator[type]:
+    seen = set()
+    stack = [AbstractGraph]
+
+    while stack:
+        cls = stack.pop()
+        if cls not in seen:
+            seen.add(cls)
+            stack.extend(cls.__subclasses__())
+            yield cls
+
+def _instrument_class(cls: type):
+    originals = _originals.setdefault(cls, dict())
+
+    for name, size_of in INSTRUMENTED_METHODS.items():
+        attr = cls.__dict__.get(name)
+        if attr is None or name in originals or getattr(attr, "__isabstractmethod__", False):
+            continue
+
+        if isinstance(attr, property):
+            wrapped: Any = property(_wrap(attr.fget, cls.__qualname__, name, size_of), attr.fset, attr.fdel, attr.__doc__)
+        elif isinstance(attr, classmethod):
+            wrapped = classmethod(_wrap(attr.__func__, cls.__qualname__, name, size_of))
+        elif isinstance(attr, staticmethod):
+            wrapped = staticmethod(_wrap(attr.__func__, cls.__qualname__, name, size_of))
+        elif callable(attr):
+            wrapped = _wrap(attr, cls.__qualname__, name, size_of)
+        else:
+            continue
+
+        originals[name] = attr
+        setattr(cls, name, wrapped)
+
+def _wrap(func: Callable, owner: str, method: str, size_of: SizeFunction | None) -> Callable:
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            recorder.record(owner, method, perf_counter() - start)
+            raise
+
+        elapsed = perf_counter() - start
+
+        size = None
+        if size_of is not None:
+            try:
+                size = size_of(args, kwargs, result)
+            except (TypeError, IndexError, KeyError):
+                pass
+
+        recorder.record(owner, method, elapsed, size)
+        return result
+
+    return wrapper
+
+if os.environ.get(ENV_VAR):
+    enable()
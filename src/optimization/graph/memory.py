@@ -0,0 +1,217 @@
+"""How much memory a graph uses, and which representation to choose for a given size.
+
+`memory_usage` breaks a graph's footprint down by what the memory holds:
+
+>>> g.memory_usage()
+MemoryUsage(vertices=8456, adjacency=52704, edges=0, arrays=0, attributes=0, other=1232)
+
+Each object is counted once, under the first component that reaches it, so
+a vertex stored both in the vertex table and in neighbor sets is part of
+`vertices`. With `deep=False`, only the containers and arrays the graph
+holds are counted, not the vertex, edge and weight objects inside them.
+
+`recommend_representation` estimates the footprint of each representation,
+and the time it takes per query or change, from per-vertex and per-edge
+costs measured by `benchmarks/bench_memory.py`. It picks the fastest for a
+workload within a memory budget.
+"""
+
+from __future__ import annotations
+
+import sys
+import types
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from .graph import AbstractGraph
+
+COMPONENTS = ("vertices", "adjacency", "edges", "arrays", "attributes", "other")
+
+class MemoryUsage(NamedTuple):
+    """Bytes used by a graph, by component."""
+    vertices: int
+    """The vertex table: its container and, if deep, the vertex objects."""
+    adjacency: int
+    """Neighbor sets or lists."""
+    edges: int
+    """Edge objects, edge lists and edge weights."""
+    arrays: int
+    """NumPy buffers, such as matrices and cached CSR adjacencies."""
+    attributes: int
+    """Vertex and edge attribute tables."""
+    other: int
+    """Everything else, such as caches and change logs."""
+
+    @property
+    def total(self) -> int:
+        return sum(self)
+
+def graph_memory_usage(graph: AbstractGraph, deep: bool = True) -> MemoryUsage:
+    """The implementation of `AbstractGraph.memory_usage`."""
+    usage = dict.fromkeys(COMPONENTS, 0)
+    seen: set = set()
+
+    listed = graph._memory_components()
+    for component, obj, part in listed:
+        if part == "contents":
+            usage[component] += sum(_sizeof(item, deep, seen) for item in obj)
+        else:
+            usage[component] += _sizeof(obj, deep and part != "container", seen)
+
+    # The graph object itself, and whatever mixins and representations did not list
+    usage["other"] += sys.getsizeof(graph)
+    state = getattr(graph, "__dict__", dict())
+    usage["other"] += _sizeof(state, False, seen)
+    for value in state.values():
+        usage["other"] += _sizeof(value, deep, seen)
+
+    return MemoryUsage(**usage)
+
+def sizeof(obj: Any, deep: bool = True) -> int:
+    """The bytes used by an object and, if deep, every object it refers to, each counted once.
+
+    NumPy arrays count their buffers (a view counts the array it views), and
+    other objects their `__dict__` and `__slots__`. Classes, modules and
+    functions are not counted.
+    """
+    return _sizeof(obj, deep, set())
+
+_CONTAINERS = (dict, list, tuple, set, frozenset, deque)
+_SKIPPED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+def _sizeof(obj: Any, deep: bool, seen: set) -> int:
+    # NumPy may never have been imported, in which case nothing is an array
+    numpy = sys.modules.get("numpy")
+    ndarray = numpy.ndarray if numpy is not None else ()
+
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _SKIPPED):
+            continue
+
+        # Shallow, only containers and arrays count, not the vertices, edges and weights in them
+        if not deep and not isinstance(o, _CONTAINERS + (ndarray,)):
+            continue
+
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+
+        if isinstance(o, ndarray):
+            if o.base is not None:
+                stack.append(o.base)
+            if deep and o.dtype.hasobject:
+                stack.extend(o.ravel().tolist())
+        elif not deep:
+            continue
+        elif isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, _CONTAINERS):
+            stack.extend(o)
+        else:
+            stack.extend(_attributes(o))
+
+    return total
+
+def _attributes(obj: Any) -> List[Any]:
+    found = []
+    if hasattr(obj, "__dict__"):
+        found.append(obj.__dict__)
+
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get("__slots__", ())
+        for name in [slots] if isinstance(slots, str) else slots:
+            if hasattr(obj, name) and name not in ("__dict__", "__weakref__"):
+                found.append(getattr(obj, name))
+
+    return found
+
+
+COSTS: Dict[str, Tuple[float, float, float]] = {
+    "NaiveGraph": (74.0, 232.0, 0.0),
+    "AdjacencySet": (251.0, 183.0, 0.0),
+    "IncidenceMatrix": (37.0, 0.0, 8.0),
+}
+"""Bytes per vertex, per edge and per vertex per edge of each representation.
+
+Fitted by `benchmarks/bench_memory.py` to unweighted graphs with integer
+vertices, up to 100,000 vertices and 800,000 edges, on 64-bit CPython 3.13.
+"""
+
+TIMES: Dict[str, Dict[str, Tuple[float, float, float, float]]] = {
+    # Hash lookups
+    "AdjacencySet": {"query": (7.9e-7, 0.0, 0.0, 0.0), "mutate": (1.6e-6, 0.0, 0.0, 0.0)},
+    # Python scans of the edge list, including the duplicate check in add_edge
+    "NaiveGraph": {"query": (0.0, 0.0, 1.6e-7, 0.0), "mutate": (0.0, 0.0, 5.6e-7, 0.0)},
+    # A NumPy product of two matrix rows, and a copy of the whole matrix on every change
+    "IncidenceMatrix": {"query": (6.9e-6, 0.0, 3.5e-9, 0.0), "mutate": (0.0, 0.0, 0.0, 2.3e-9)},
+}
+"""Seconds per `is_adjacent` ("query") and per `add_edge` or `remove_edge` ("mutate").
+
+Each is a constant plus seconds per vertex, per edge and per vertex per
+edge, fitted by the same benchmark run. Only their ratios matter, which
+depend less on the machine than the seconds themselves.
+"""
+
+WORKLOADS = ("query", "mutate", "memory")
+
+class Recommendation(NamedTuple):
+    representation: type
+    estimated_bytes: int
+    estimates: Dict[str, int]
+    """The estimated bytes of every representation, by name."""
+    seconds: Dict[str, float]
+    """The estimated seconds per query (or per change, for "mutate") of every representation, by name."""
+
+def estimate_bytes(representation: str, vertex_count: int, edge_count: int) -> int:
+    """Estimates the bytes a representation uses for a graph of the given size, from `COSTS`."""
+    per_vertex, per_edge, per_pair = COSTS[representation]
+    return int(per_vertex * vertex_count + per_edge * edge_count + per_pair * vertex_count * edge_count)
+
+def estimate_seconds(representation: str, operation: str, vertex_count: int, edge_count: int) -> float:
+    """Estimates the seconds per "query" or "mutate" operation on a graph of the given size, from `TIMES`."""
+    constant, per_vertex, per_edge, per_pair = TIMES[representation][operation]
+    return constant + per_vertex * vertex_count + per_edge * edge_count + per_pair * vertex_count * edge_count
+
+def recommend_representation(vertex_count: int, edge_count: int, workload: str = "query",
+                             memory_limit: int | None = None) -> Recommendation:
+    """Pick a representation for a graph of the given size and workload.
+
+    Args:
+        vertex_count: The expected number of vertices.
+        edge_count: The expected number of edges.
+        workload: "query" for mostly adjacency lookups, "mutate" for
+            frequent additions and removals, or "memory" for the smallest
+            footprint.
+        memory_limit: Only consider representations estimated to fit in this
+            many bytes.
+
+    Returns:
+        The representation that fits with the fewest estimated seconds per
+        operation of the workload (or bytes, for "memory"), with its
+        estimated footprint. Raises a ValueError if none fits.
+
+    >>> recommend_representation(100_000, 500_000, "query").representation
+    <class 'optimization.graph.adjacency_set_graph.AdjacencySet'>
+    """
+    if workload not in WORKLOADS:
+        raise ValueError(f"Unknown workload {workload!r}; expected one of {list(WORKLOADS)}")
+
+    estimates = {name: estimate_bytes(name, vertex_count, edge_count) for name in COSTS}
+    operation = "query" if workload == "memory" else workload
+    seconds = {name: estimate_seconds(name, operation, vertex_count, edge_count) for name in TIMES}
+
+    cost = estimates if workload == "memory" else seconds
+    fitting = [name for name in sorted(cost, key=cost.__getitem__)
+               if memory_limit is None or estimates[name] <= memory_limit]
+    if not fitting:
+        raise ValueError(f"No representation fits in {memory_limit} bytes; "
+                         f"the smallest needs about {min(estimates.values())}")
+
+    # Imported by name, so IncidenceMatrix (and NumPy) load only when recommended
+    from importlib import import_module
+
+    name = fitting[0]
+    return Recommendation(getattr(import_module(__package__), name), estimates[name], estimates, seconds)
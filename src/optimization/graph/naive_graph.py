@@ -1,9 +1,13 @@
 from __future__ import annotations
-from typing import Collection, Set, List, Dict, TypeVar, Tuple, Hashable, Self
+from typing import Any, Collection, Set, List, Dict, TypeVar, Tuple, Hashable, Self, TYPE_CHECKING
 
-import numpy as np
+from .graph import Edge, AbstractGraph, GraphRepresentation, DirectedGraph, WeightedGraph
 
-from .graph import Edge, AbstractGraph, GraphRepresentation
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .edge_arrays import EdgeArrays
+    from .batch import SparseAdjacency
 
 V = TypeVar('V', bound=Hashable)
 
@@ -12,6 +16,10 @@ class NaiveGraph(GraphRepresentation[V]):
         self._vertices = set(vertices)
         self._edges = list(edges)
 
+        self._vertex_indices: Dict[V, int] | None = None
+        self._adjacency_matrix: np.typing.NDArray | None = None
+        self._sparse_adjacency: SparseAdjacency[V] | None = None
+
     @property
     def vertices(self) -> Set[V]:
         return self._vertices
@@ -49,39 +57,53 @@ class NaiveGraph(GraphRepresentation[V]):
         
     @property
     def vertex_indices(self) -> Dict[V, int]:
-        d = dict()
-        for i, v in enumerate(self._vertices):
-            d[v] = i
+        if self._vertex_indices is None:
+            self._vertex_indices = {v: i for i, v in enumerate(self._vertices)}
 
-        return d
+        return self._vertex_indices
     
     @property
     def adjacency_matrix(self) -> np.typing.NDArray:
-        matrix = np.zeros((self.vertex_count, self.vertex_count))
-        
-        for v1, v2 in self._edges:
-            matrix[self.vertex_indices[v1], self.vertex_indices[v2]] = 1
-            matrix[self.vertex_indices[v2], self.vertex_indices[v1]] = 1
+        """The dense adjacency matrix, with rows in the order of `vertex_indices`.
+
+        The matrix is cached until the graph is next modified through its
+        methods, and is returned read-only.
+        """
+        if self._adjacency_matrix is None:
+            import numpy as np
 
-        return matrix
+            arrays = self.to_edge_arrays()
+            matrix = np.zeros((self.vertex_count, self.vertex_count))
+
+            matrix[arrays.src, arrays.dst] = 1
+            if not arrays.directed:
+                matrix[arrays.dst, arrays.src] = 1
+
+            matrix.flags.writeable = False
+            self._adjacency_matrix = matrix
+
+        return self._adjacency_matrix
     
     @classmethod
-    def from_adjacency_matrix(cls, matrix: np.typing.NDArray) -> NaiveGraph[int]:
+    def from_adjacency_matrix(cls, matrix) -> NaiveGraph[int]:
+        """Construct a graph on the vertices `range(n)` from an adjacency matrix.
+
+        Accepts a dense array or a `scipy.sparse` matrix. Undirected graphs read
+        the lower triangle (including loops on the diagonal), and weighted
+        graphs take their edge weights from the matrix entries.
+        """
+        import numpy as np
+        from .conversion import from_scipy_sparse
+
+        if not hasattr(matrix, "tocoo"):
+            matrix = np.asarray(matrix)
+
         if len(matrix.shape) != 2:
             raise ValueError("Adjacency matrix is not 2D!")
         elif matrix.shape[0] != matrix.shape[1]:
             raise ValueError("Adjacency matrix is not square!")
-        
-        _vertices = range(matrix.shape[0])
-        _edges = list()
-
-        for i in _vertices:
-            for j in range(0, i):
-                if matrix[i, j]:
-                    _edges.append((i, j))
-                    
-        # TODO: remove ignore type. I have a feeling this will cause an error
-        return cls(_vertices, _edges) # type: ignore
+
+        return from_scipy_sparse(cls, matrix) # type: ignore
     
     def to_char_string(self) -> str:
         """Return a compact string representing the _edges of graphs with
@@ -105,7 +127,59 @@ class NaiveGraph(GraphRepresentation[V]):
             return False
         
         # TODO: this does not account for _edges being out of order
-        return self.__dict__ == value.__dict__
+        return self._vertices == value._vertices and self._edges == value._edges
+
+    def _memory_components(self) -> List[Tuple[str, Any, str]]:
+        return super()._memory_components() + [
+            ("vertices", self._vertices, "all"),
+            ("vertices", self._vertex_indices, "all"),
+            ("edges", self._edges, "all"),
+            ("arrays", self._adjacency_matrix, "all"),
+            ("arrays", self._sparse_adjacency, "all"),
+        ]
+
+    def to_edge_arrays(self) -> EdgeArrays[V]:
+        import numpy as np
+        from .edge_arrays import EdgeArrays
+
+        vertices = list(self._vertices)
+        index = self.vertex_indices
+
+        weights = None
+        if isinstance(self, WeightedGraph):
+            weights = [getattr(edge, "weight", None) for edge in self._edges]
+
+        # The constructor does not check that edges join known vertices
+        try:
+            src = np.fromiter((index[edge[0]] for edge in self._edges), dtype=np.int64, count=len(self._edges))
+            dst = np.fromiter((index[edge[1]] for edge in self._edges), dtype=np.int64, count=len(self._edges))
+        except KeyError as e:
+            raise ValueError(f"{e.args[0]!r} not in vertices") from None
+
+        return EdgeArrays(vertices, src, dst, weights, directed=isinstance(self, DirectedGraph))
+
+    def degrees(self) -> np.ndarray:
+        return self._batch_queries().degrees()
+
+    def is_adjacent_many(self, src, dst) -> np.ndarray:
+        return self._batch_queries().is_adjacent_many(src, dst)
+
+    def neighbors_of_many(self, vs) -> Tuple[np.ndarray, np.ndarray]:
+        return self._batch_queries().neighbors_of_many(vs)
+
+    def _batch_queries(self) -> SparseAdjacency[V]:
+        # neighbors_of scans edges in both directions, so batch neighbor queries do too
+        if self._sparse_adjacency is None:
+            from .batch import SparseAdjacency
+
+            self._sparse_adjacency = SparseAdjacency(self.to_edge_arrays(), symmetric_neighbors=True)
+
+        return self._sparse_adjacency
+
+    def _invalidate(self):
+        self._vertex_indices = None
+        self._adjacency_matrix = None
+        self._sparse_adjacency = None
 
     @classmethod
     def from_vertices_and_edges(cls, vertices: Collection[V], edges: Collection[Edge[V]]) -> NaiveGraph[V]:
@@ -122,14 +196,21 @@ class NaiveGraph(GraphRepresentation[V]):
         if v2 not in self.vertices:
             raise ValueError(f'v2: {v2!r} not in vertices')
 
-        # TODO deal with other types of edges
-        return Edge(v1, v2) in self._edges
+        try:
+            self._find_edge(v1, v2)
+        except ValueError:
+            return False
+
+        return True
 
     def add_vertex(self, v: V):
         self._vertices.add(v)
+        self._invalidate()
 
     def remove_vertex(self, v: V):
         self._vertices.remove(v)
+        self._edges = [edge for edge in self._edges if edge[0] != v and edge[1] != v]
+        self._invalidate()
 
     def add_edge(self, v1: V, v2: V, weight = None):
         if self.is_adjacent(v1, v2):
@@ -137,6 +218,23 @@ class NaiveGraph(GraphRepresentation[V]):
         else:
             edge = self.create_edge_from_vertices(v1, v2, weight)
             self._edges.append(edge)
+            self._invalidate()
 
     def remove_edge(self, edge: Edge):
         self._edges.remove(edge)
+        self._invalidate()
+
+    def get_edge_weight(self, v1: V, v2: V):
+        return self._find_edge(v1, v2).weight # type: ignore
+
+    def set_edge_weight(self, v1: V, v2: V, weight):
+        self._find_edge(v1, v2).weight = weight # type: ignore
+
+    def _find_edge(self, v1: V, v2: V) -> Edge[V]:
+        directed = isinstance(self, DirectedGraph)
+
+        for edge in self._edges:
+            if (edge[0] == v1 and edge[1] == v2) or (not directed and edge[0] == v2 and edge[1] == v1):
+                return edge
+
+        raise ValueError(f"no edge between {v1!r} and {v2!r}")
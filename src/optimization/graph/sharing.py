@@ -0,0 +1,256 @@
+"""Compact pickling and shared-memory transfer of graphs between processes.
+
+Every graph pickles as its edge arrays, made with the representation's own
+`to_edge_arrays` and rebuilt with `from_edge_arrays`, rather than as one
+object per edge, set or list. The arrays are NumPy arrays, so with pickle
+protocol 5 and a `buffer_callback` they are passed out of band.
+
+For a pool of workers, `share` copies a graph's arrays into shared memory
+once, and each worker `attach`es to them by name without copying:
+
+>>> from optimization.graph.sharing import share, attach
+>>> with share(g) as shared:
+...     results = pool.map(work, [shared.handle] * tasks)
+
+where `work` calls `attach(handle)` to get the graph's `EdgeArrays` (or,
+with `rebuild=True`, a copy of the graph itself).
+"""
+
+from __future__ import annotations
+
+import pickle
+import uuid
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Tuple, TypeVar
+
+import numpy as np
+
+from .graph import AbstractGraph, Graph
+from .edge_arrays import CSR, EdgeArrays, _int_table, _is_identity
+
+V = TypeVar('V')
+
+def reduce_graph(graph: AbstractGraph[V]) -> Tuple[Any, ...]:
+    """The `__reduce__` of every graph: its class, its edge arrays and any mixin state.
+
+    Caches and change logs are not carried over; the copy starts with empty ones.
+    """
+    arrays = graph.to_edge_arrays()
+    n, src = arrays.vertex_count, arrays.src
+
+    # Most exports list edges grouped by their first endpoint, so `src` shrinks to a count per vertex
+    if np.all(src[1:] >= src[:-1]):
+        src = ("counts", _narrow(np.bincount(src, minlength=n), len(src) + 1))
+    else:
+        src = _narrow(src, n)
+
+    payload = (_class_spec(type(graph)), _pack_vertices(arrays.vertices), src, _narrow(arrays.dst, n),
+               arrays.weights, arrays.directed)
+
+    return (_rebuild_graph, payload, graph._extra_state() or None)
+
+def _rebuild_graph(spec: Any, vertices: Any, src: Any, dst: np.ndarray, weights: np.ndarray | None,
+                   directed: bool) -> AbstractGraph:
+    vertices = _unpack_vertices(vertices)
+    if isinstance(src, tuple):
+        src = np.repeat(np.arange(len(vertices)), src[1])
+
+    return _class_of(spec).from_edge_arrays(EdgeArrays(vertices, src, dst, weights, directed=directed))
+
+def _class_spec(cls: type) -> Any:
+    """Classes composed by `Graph.from_types` have no importable name, so they are pickled as their parts."""
+    for key, composed in Graph._composed.items():
+        if composed is cls:
+            return key
+    return cls
+
+def _class_of(spec: Any) -> type:
+    return Graph.from_types(*spec) if isinstance(spec, tuple) else spec
+
+def _pack_vertices(vertices: Any) -> Any:
+    """Vertex tables as `range(n)` where they are the ids themselves, an array if they are integers, else a list."""
+    if _is_identity(vertices):
+        return vertices
+
+    vertices = list(vertices)
+    packed = _int_table(vertices) if vertices else None
+    if packed is None:
+        return vertices
+
+    n = len(packed)
+    if packed[0] == 0 and packed[-1] == n - 1 and np.array_equal(packed, np.arange(n)):
+        return range(n)
+    return _narrow(packed, packed.max() + 1) if packed.min() >= 0 else packed
+
+def _unpack_vertices(vertices: Any) -> Any:
+    return vertices.tolist() if isinstance(vertices, np.ndarray) else vertices
+
+def _narrow(ids: np.ndarray, n: int) -> np.ndarray:
+    """Non-negative integers below `n` in the smallest unsigned dtype that holds them."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n <= np.iinfo(dtype).max + 1:
+            return ids.astype(dtype)
+    return ids
+
+
+class SharedGraph:
+    """A graph's arrays copied into shared memory blocks that other processes attach to by name.
+
+    Created by `share`. The creating process owns the blocks and must `close`
+    them, or use the object as a context manager, once workers are done.
+
+    Args:
+        graph: A graph, or its `EdgeArrays` or `CSR` adjacency.
+    """
+
+    def __init__(self, graph: AbstractGraph[V] | EdgeArrays[V] | CSR):
+        self.blocks: List[shared_memory.SharedMemory] = []
+
+        self.handle: Dict[str, Any] = dict(key=uuid.uuid4().hex)
+        """A small picklable description of the blocks, to pass to `attach`."""
+
+        try:
+            if isinstance(graph, CSR):
+                self.handle["kind"] = "csr"
+                fields = dict(zip(CSR._fields, graph))
+            else:
+                if isinstance(graph, AbstractGraph):
+                    self.handle["graph"] = _class_spec(type(graph))
+                    graph = graph.to_edge_arrays()
+
+                self.handle["kind"] = "edges"
+                self.handle["directed"] = graph.directed
+                fields = dict(src=graph.src, dst=graph.dst, weights=graph.weights)
+                fields["vertices"] = self._vertex_table(graph.vertices)
+
+            for field, array in fields.items():
+                if isinstance(array, np.ndarray):
+                    array = self._pickled(array) if array.dtype.hasobject else self._share(array)
+                self.handle[field] = array
+        except BaseException:
+            self.close()
+            raise
+
+    def _vertex_table(self, vertices: Any) -> Any:
+        packed = _pack_vertices(vertices)
+        if isinstance(packed, range):
+            return ("range", len(packed))
+        if isinstance(packed, np.ndarray):
+            return packed
+
+        return self._pickled(packed)
+
+    def _pickled(self, obj: Any) -> Tuple[str, Tuple[str, Tuple[int, ...], str]]:
+        # Pickled once into a block, so the handle stays small however many tasks it is sent with
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        return ("pickle", self._share(np.frombuffer(data, dtype=np.uint8)))
+
+    def _share(self, array: np.ndarray) -> Tuple[str, Tuple[int, ...], str]:
+        if array.dtype.hasobject:
+            raise TypeError("Arrays of Python objects cannot be shared")
+
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.blocks.append(block)
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[:] = array
+        return (block.name, array.shape, array.dtype.str)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+
+    def __enter__(self) -> SharedGraph:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def share(graph: AbstractGraph[V] | EdgeArrays[V] | CSR) -> SharedGraph:
+    """Copy a graph's arrays into shared memory. Pass `.handle` to the processes that `attach` to it."""
+    return SharedGraph(graph)
+
+_attached: Dict[str, Tuple[Any, List[shared_memory.SharedMemory]]] = dict()
+"""The graphs attached in this process, kept open for later tasks."""
+
+def attach(handle: Dict[str, Any], rebuild: bool = False) -> Any:
+    """Returns the arrays shared under `handle`, reading the shared memory without copying it.
+
+    Args:
+        handle: The `handle` of a `SharedGraph`.
+        rebuild: Rather than its `EdgeArrays`, return a copy of the shared
+            graph, in its original class.
+
+    Returns:
+        A `CSR` if a CSR adjacency was shared, else an `EdgeArrays`, whose
+        arrays are read-only views of the shared memory. Vertex tables and
+        weights of Python objects (such as weights with None among them) are
+        unpickled instead.
+
+    Each process keeps only the graph it attached last. Attaching another
+    closes the previous graph's blocks, except those whose arrays are still
+    referenced, and attaching the previous graph again maps it afresh. So
+    tasks that alternate between graphs should hold on to the arrays.
+    """
+    key = handle["key"]
+    if key not in _attached:
+        # Attaching to another graph usually means the last one's tasks are done
+        _detach_all()
+        _attached[key] = _open(handle)
+
+    shared = _attached[key][0]
+    if rebuild:
+        if "graph" not in handle:
+            raise ValueError("Only a shared graph, not its arrays, can be rebuilt")
+        return _class_of(handle["graph"]).from_edge_arrays(shared)
+    return shared
+
+def _open(handle: Dict[str, Any]) -> Tuple[Any, List[shared_memory.SharedMemory]]:
+    blocks: List[shared_memory.SharedMemory] = []
+
+    def view(spec):
+        if spec is None:
+            return None
+        if spec[0] == "pickle":
+            return pickle.loads(view(spec[1]))
+
+        name, shape, dtype = spec
+        block = _open_block(name)
+        blocks.append(block)
+        array = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        return array
+
+    if handle["kind"] == "csr":
+        return CSR(*(view(handle[field]) for field in CSR._fields)), blocks
+
+    vertices = handle["vertices"]
+    if isinstance(vertices, tuple) and vertices[0] == "range":
+        vertices = range(vertices[1])
+    elif isinstance(vertices, tuple) and vertices[0] == "pickle":
+        vertices = view(vertices)
+    else:
+        vertices = view(vertices).tolist()
+
+    arrays = EdgeArrays(vertices, view(handle["src"]), view(handle["dst"]), view(handle["weights"]),
+                        directed=handle["directed"])
+    return arrays, blocks
+
+def _detach_all():
+    # Drop our views before closing the blocks; any still held elsewhere keep their block mapped
+    stale = [blocks for _, blocks in _attached.values()]
+    _attached.clear()
+
+    for blocks in stale:
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                pass
+
+def _open_block(name: str) -> shared_memory.SharedMemory:
+    try:
+        # The creating process owns the block and unlinks it
+        return shared_memory.SharedMemory(name=name, track=False) # type: ignore
+    except TypeError: # Python < 3.13
+        return shared_memory.SharedMemory(name=name)
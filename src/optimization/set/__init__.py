@@ -0,0 +1,23 @@
+from typing import TYPE_CHECKING
+
+from .sorted_set import SortedSet
+from .sorted_dict import SortedDict
+from .heaps import IndexedHeap, BucketQueue
+
+__all__ = ["SortedSet", "SortedDict", "IndexedHeap", "BucketQueue", "SortedArray"]
+
+# SortedArray needs NumPy, so it is only imported on first access
+if TYPE_CHECKING:
+    from .sorted_array import SortedArray
+
+def __getattr__(name: str):
+    if name != "SortedArray":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from .sorted_array import SortedArray
+
+    globals()[name] = SortedArray
+    return SortedArray
+
+def __dir__():
+    return sorted(set(globals()) | {"SortedArray"})
@@ -0,0 +1,297 @@
+"""Priority queues whose items can change priority in place.
+
+`IndexedHeap` is an array-backed d-ary heap with a map from each item to its
+position, so `decrease_key` and `update` find the item in O(1) and re-sift it
+in O(log n) instead of leaving a stale entry behind as `heapq` users must.
+`BucketQueue` keeps one bucket per small integer priority, for algorithms
+such as DSATUR or Dial's shortest paths whose priorities are counts or
+bounded integers.
+
+Like `SortedSet`, both iterate over their items in priority order and
+report their size with `len`.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Generic, Iterable, Iterator, List, Tuple, TypeVar
+
+T = TypeVar('T')
+P = TypeVar('P')
+
+class IndexedHeap(Generic[T, P]):
+    """A min-heap of distinct items, each with a priority that can be changed.
+
+    Args:
+        items: Initial (item, priority) pairs, heapified in O(n).
+        arity: The number of children of each node. Wider heaps are shallower,
+            which makes `decrease_key` cheaper and `pop_min` dearer.
+
+    >>> heap = IndexedHeap([("a", 5), ("b", 3)])
+    >>> heap.decrease_key("a", 1)
+    True
+    >>> heap.pop_min()
+    ('a', 1)
+    """
+
+    def __init__(self, items: Iterable[Tuple[T, P]] = (), arity: int = 2):
+        if arity < 2:
+            raise ValueError("arity must be at least 2")
+
+        self.arity = arity
+        self._items: List[T] = []
+        self._priorities: List[P] = []
+        self._pos: Dict[T, int] = dict()
+
+        for item, priority in items:
+            if item in self._pos:
+                raise ValueError(f'{item!r} is already in the heap')
+            self._pos[item] = len(self._items)
+            self._items.append(item)
+            self._priorities.append(priority)
+
+        for i in reversed(range((len(self._items) - 2) // arity + 1)):
+            self._sift_down(i)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._pos
+
+    def __iter__(self) -> Iterator[T]:
+        """Yield the items in priority order, leaving the heap unchanged."""
+        order = sorted(range(len(self._items)), key=self._priorities.__getitem__)
+        return (self._items[i] for i in order)
+
+    def priority(self, item: T) -> P:
+        """Returns an item's priority. Raises a KeyError if it is not in the heap."""
+        return self._priorities[self._pos[item]]
+
+    def push(self, item: T, priority: P):
+        """Add an item. Raises a ValueError if it is already in the heap."""
+        if item in self._pos:
+            raise ValueError(f'{item!r} is already in the heap')
+
+        self._pos[item] = len(self._items)
+        self._items.append(item)
+        self._priorities.append(priority)
+        self._sift_up(len(self._items) - 1)
+
+    def update(self, item: T, priority: P):
+        """Set an item's priority, higher or lower, pushing it if it is not in the heap."""
+        i = self._pos.get(item)
+        if i is None:
+            self.push(item, priority)
+            return
+
+        old = self._priorities[i]
+        self._priorities[i] = priority
+        if priority < old:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def decrease_key(self, item: T, priority: P) -> bool:
+        """Lower an item's priority, pushing it if it is not in the heap.
+
+        Returns False, leaving the heap unchanged, if the item already has a
+        priority no higher than `priority`. This is the relaxation step of
+        Dijkstra's and Prim's algorithms.
+        """
+        i = self._pos.get(item)
+        if i is None:
+            self.push(item, priority)
+            return True
+        if not priority < self._priorities[i]:
+            return False
+
+        self._priorities[i] = priority
+        self._sift_up(i)
+        return True
+
+    def peek_min(self) -> Tuple[T, P]:
+        """Returns the (item, priority) of lowest priority. Raises an IndexError if the heap is empty."""
+        if not self._items:
+            raise IndexError('peek from empty heap')
+        return (self._items[0], self._priorities[0])
+
+    def pop_min(self) -> Tuple[T, P]:
+        """Remove and return the (item, priority) of lowest priority. Raises an IndexError if the heap is empty."""
+        if not self._items:
+            raise IndexError('pop from empty heap')
+        return self._pop(0)
+
+    def remove(self, item: T) -> P:
+        """Remove an item and return its priority. Raises a KeyError if it is not in the heap."""
+        return self._pop(self._pos[item])[1]
+
+    def discard(self, item: T):
+        if item in self._pos:
+            self._pop(self._pos[item])
+
+    def clear(self):
+        self._items.clear()
+        self._priorities.clear()
+        self._pos.clear()
+
+    def _pop(self, i: int) -> Tuple[T, P]:
+        items, priorities = self._items, self._priorities
+        item, priority = items[i], priorities[i]
+        del self._pos[item]
+
+        # Move the last leaf into the hole and sift it whichever way it needs to go
+        last_item, last_priority = items.pop(), priorities.pop()
+        if i < len(items):
+            items[i], priorities[i] = last_item, last_priority
+            self._pos[last_item] = i
+            if i and last_priority < priorities[(i - 1) // self.arity]:
+                self._sift_up(i)
+            else:
+                self._sift_down(i)
+
+        return (item, priority)
+
+    def _sift_up(self, i: int):
+        items, priorities, pos, arity = self._items, self._priorities, self._pos, self.arity
+        item, priority = items[i], priorities[i]
+
+        while i:
+            parent = (i - 1) // arity
+            if not priority < priorities[parent]:
+                break
+            items[i], priorities[i] = items[parent], priorities[parent]
+            pos[items[i]] = i
+            i = parent
+
+        items[i], priorities[i] = item, priority
+        pos[item] = i
+
+    def _sift_down(self, i: int):
+        items, priorities, pos, arity = self._items, self._priorities, self._pos, self.arity
+        n = len(items)
+        item, priority = items[i], priorities[i]
+
+        while True:
+            first = arity * i + 1
+            if first >= n:
+                break
+
+            # The child of lowest priority
+            child = first
+            for c in range(first + 1, min(first + arity, n)):
+                if priorities[c] < priorities[child]:
+                    child = c
+            if not priorities[child] < priority:
+                break
+
+            items[i], priorities[i] = items[child], priorities[child]
+            pos[items[i]] = i
+            i = child
+
+        items[i], priorities[i] = item, priority
+        pos[item] = i
+
+
+class BucketQueue(Generic[T]):
+    """A priority queue of distinct items with small non-negative integer priorities.
+
+    Each priority has a bucket of items, so pushing and changing a priority
+    take O(1). Popping scans from the last bucket popped to the next
+    non-empty one, which is O(1) amortized when priorities move in one
+    direction, as in Dial's algorithm (popped priorities never decrease) or
+    DSATUR (priorities only increase and the maximum is popped). Items of
+    equal priority are popped most recently pushed first.
+
+    Args:
+        items: Initial (item, priority) pairs.
+    """
+
+    def __init__(self, items: Iterable[Tuple[T, int]] = ()):
+        self._buckets: List[Dict[T, None]] = []
+        self._priority: Dict[T, int] = dict()
+        self._lo = 0
+        self._hi = -1
+
+        for item, priority in items:
+            self.push(item, priority)
+
+    def __len__(self) -> int:
+        return len(self._priority)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._priority
+
+    def __iter__(self) -> Iterator[T]:
+        """Yield the items in increasing priority, leaving the queue unchanged."""
+        for bucket in self._buckets[self._lo:self._hi + 1]:
+            yield from reversed(bucket)
+
+    def priority(self, item: T) -> int:
+        """Returns an item's priority. Raises a KeyError if it is not in the queue."""
+        return self._priority[item]
+
+    def push(self, item: T, priority: int):
+        """Add an item. Raises a ValueError if it is already queued or the priority is negative."""
+        if item in self._priority:
+            raise ValueError(f'{item!r} is already in the queue')
+        self.update(item, priority)
+
+    def update(self, item: T, priority: int):
+        """Set an item's priority, pushing it if it is not in the queue."""
+        if priority < 0:
+            raise ValueError("Priorities must be non-negative")
+
+        buckets = self._buckets
+        old = self._priority.get(item)
+        if old is not None:
+            del buckets[old][item]
+        while len(buckets) <= priority:
+            buckets.append(dict())
+
+        buckets[priority][item] = None
+        self._priority[item] = priority
+        if priority < self._lo:
+            self._lo = priority
+        if priority > self._hi:
+            self._hi = priority
+
+    def pop_min(self) -> Tuple[T, int]:
+        """Remove and return an (item, priority) of lowest priority. Raises an IndexError if the queue is empty."""
+        if not self._priority:
+            raise IndexError('pop from empty queue')
+
+        while not self._buckets[self._lo]:
+            self._lo += 1
+        return self._pop_from(self._lo)
+
+    def pop_max(self) -> Tuple[T, int]:
+        """Remove and return an (item, priority) of highest priority. Raises an IndexError if the queue is empty."""
+        if not self._priority:
+            raise IndexError('pop from empty queue')
+
+        while not self._buckets[self._hi]:
+            self._hi -= 1
+        return self._pop_from(self._hi)
+
+    def remove(self, item: T) -> int:
+        """Remove an item and return its priority. Raises a KeyError if it is not in the queue."""
+        priority = self._priority.pop(item)
+        del self._buckets[priority][item]
+        return priority
+
+    def discard(self, item: T):
+        if item in self._priority:
+            self.remove(item)
+
+    def clear(self):
+        self._buckets.clear()
+        self._priority.clear()
+        self._lo, self._hi = 0, -1
+
+    def _pop_from(self, priority: int) -> Tuple[T, int]:
+        item, _ = self._buckets[priority].popitem()
+        del self._priority[item]
+
+        if not self._priority:
+            self._lo, self._hi = len(self._buckets), -1
+        return (item, priority)
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, Tuple
+from collections.abc import Sequence, MutableSet
+
+import numpy as np
+
+class SortedArray(Sequence, MutableSet):
+    """A set of numbers kept sorted in one contiguous NumPy array.
+
+    The numeric counterpart of `SortedSet`. Batches of values are looked up
+    with a single `np.searchsorted` and inserted or removed with one
+    vectorized merge, rather than bisecting once per value in Python:
+
+    >>> times = SortedArray(np.array([30, 10, 20]))
+    >>> times.insert_many([25, 15, 10])
+    >>> times.rank_many([12, 30])
+    array([1, 4])
+
+    Single values can also be added and removed, but each shifts the tail of
+    the array, so large updates should go through the batch methods. NaN is
+    not allowed, nor are values the dtype cannot hold exactly, such as 1.5
+    in an integer array.
+
+    Args:
+        values: The initial values.
+        dtype: The array's dtype. By default, that of `values`, or float64
+            if there are none.
+    """
+
+    def __init__(self, values: Iterable[Any] = (), dtype: Any = None):
+        # Only untyped input defaults to float64 when empty, so an empty typed array keeps its dtype
+        typed = isinstance(values, np.ndarray)
+        values = _as_array(values, dtype)
+        if dtype is None and values.size == 0 and not typed:
+            values = values.astype(np.float64)
+
+        self._data = np.empty(0, dtype=values.dtype)
+        self._len = 0
+        self.insert_many(values)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    @property
+    def values(self) -> np.ndarray:
+        """A read-only view of the values, in order."""
+        view = self._data[:self._len]
+        view.flags.writeable = False
+        return view
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.values.tolist())
+
+    def __reversed__(self) -> Iterator[Any]:
+        return iter(self.values[::-1].tolist())
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return self.values[idx].copy()
+
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError('SortedArray index out of range')
+
+        return self._data[idx]
+
+    def __contains__(self, value: object) -> bool:
+        try:
+            return bool(self.contains_many([value])[0])
+        except (TypeError, ValueError):
+            return False
+
+    def add(self, value: Any):
+        # Compare in the array's dtype, so that a value is not stored twice under different types
+        value = self._cast([value])[0]
+        values = self.values
+        pos = int(np.searchsorted(values, value))
+        if pos < self._len and values[pos] == value:
+            return
+
+        self._reserve(self._len + 1)
+        self._data[pos + 1:self._len + 1] = self._data[pos:self._len]
+        self._data[pos] = value
+        self._len += 1
+
+    def discard(self, value: Any):
+        pos = self._find(value)
+        if pos >= 0:
+            self._data[pos:self._len - 1] = self._data[pos + 1:self._len]
+            self._len -= 1
+
+    def remove(self, value: Any):
+        if self._find(value) < 0:
+            raise KeyError(f'{value} does not exist in {self}')
+        self.discard(value)
+
+    def index(self, value: Any, start=0, stop=-1) -> int:
+        if stop == -1:
+            stop = self._len
+
+        pos = self._find(value)
+        if not start <= pos < stop:
+            raise ValueError(f'{value} not in {self}')
+        return pos
+
+    def _find(self, value: Any) -> int:
+        """The position of a value, or -1 if it is absent."""
+        values = self.values
+        pos = int(np.searchsorted(values, value))
+        return pos if pos < self._len and values[pos] == value else -1
+
+    def insert_many(self, values: Iterable[Any]):
+        """Add a batch of values with one merge, in O(n + k log k) for k new values."""
+        batch = self._cast(values).ravel().copy()
+
+        batch.sort()
+        if len(batch):
+            batch = batch[np.concatenate(([True], batch[1:] != batch[:-1]))]
+
+        current = self.values
+        batch = batch[~_member(current, batch)]
+        if not len(batch):
+            return
+
+        # Each new value lands after the current values below it and the new values before it
+        total = self._len + len(batch)
+        is_new = np.zeros(total, dtype=bool)
+        is_new[np.searchsorted(current, batch) + np.arange(len(batch))] = True
+
+        capacity = len(self._data) if total <= len(self._data) else max(total, 2 * len(self._data))
+        merged = np.empty(capacity, dtype=self.dtype)
+        merged[:total][is_new] = batch
+        merged[:total][~is_new] = current
+        self._data, self._len = merged, total
+
+    def remove_many(self, values: Iterable[Any]):
+        """Remove a batch of values, ignoring any that are absent."""
+        found = self._found_in(values)
+        kept = self.values[~found]
+        self._data[:len(kept)] = kept
+        self._len = len(kept)
+
+    def contains_many(self, values: Iterable[Any]) -> np.ndarray:
+        """Returns whether each value is in the set."""
+        return _member(self.values, _as_array(values))
+
+    def index_many(self, values: Iterable[Any]) -> np.ndarray:
+        """Returns the position of each value. Raises a ValueError if any is absent."""
+        values = _as_array(values)
+        positions = _searchsorted(self.values, values)
+        found = _member(self.values, values, positions)
+        if not found.all():
+            raise ValueError(f'{values[~found][0]} not in {self}')
+        return positions
+
+    def rank_many(self, values: Iterable[Any]) -> np.ndarray:
+        """Returns the number of values less than each value."""
+        return _searchsorted(self.values, _as_array(values))
+
+    def _found_in(self, values: Iterable[Any]) -> np.ndarray:
+        """Whether each value of the set is in `values`."""
+        batch = np.sort(_as_array(values).ravel()) # not cast, so that 2.5 does not match 2
+        return _member(batch, self.values)
+
+    def bisect_key_left(self, value) -> int:
+        return int(np.searchsorted(self.values, value, side="left"))
+
+    def bisect_key_right(self, value) -> int:
+        return int(np.searchsorted(self.values, value, side="right"))
+
+    def rank(self, value) -> int:
+        return self.bisect_key_left(value)
+
+    def select(self, k: int) -> Any:
+        return self[k]
+
+    def irange(self, min_key=None, max_key=None, inclusive: Tuple[bool, bool] = (True, True),
+               reverse: bool = False) -> np.ndarray:
+        """Returns a read-only view of the values between `min_key` and `max_key`."""
+        start, stop = self._range(min_key, max_key, inclusive)
+        view = self.values[start:max(start, stop)]
+        return view[::-1] if reverse else view
+
+    def count_range(self, min_key=None, max_key=None, inclusive: Tuple[bool, bool] = (True, True)) -> int:
+        start, stop = self._range(min_key, max_key, inclusive)
+        return max(stop - start, 0)
+
+    def _range(self, min_key, max_key, inclusive: Tuple[bool, bool]) -> Tuple[int, int]:
+        values = self.values
+        start = 0 if min_key is None else int(np.searchsorted(values, min_key, "left" if inclusive[0] else "right"))
+        stop = self._len if max_key is None else int(np.searchsorted(values, max_key, "right" if inclusive[1] else "left"))
+        return start, stop
+
+    def update(self, *s: Iterable[Any]):
+        for values in s:
+            self.insert_many(values)
+
+    def __ior__(self, other):
+        self.insert_many(other)
+        return self
+
+    def __isub__(self, other):
+        if other is self:
+            self.clear()
+        else:
+            self.remove_many(other)
+        return self
+
+    def pop(self) -> Any:
+        if not self._len:
+            raise IndexError('pop from empty SortedArray')
+
+        self._len -= 1
+        return self._data[self._len]
+
+    def clear(self):
+        self._len = 0
+
+    def copy(self) -> SortedArray:
+        return SortedArray(self.values.copy(), dtype=self.dtype)
+
+    def _cast(self, values: Iterable[Any]) -> np.ndarray:
+        """The values in the array's dtype. Raises a ValueError for NaN or values the dtype cannot hold."""
+        raw = _as_array(values)
+        batch = raw.astype(self.dtype, copy=False)
+        if batch.dtype.kind in "fc" and np.isnan(batch).any():
+            raise ValueError("SortedArray values must not be NaN")
+        if batch is not raw and not np.array_equal(batch, raw):
+            raise ValueError(f"SortedArray values must be exactly representable as {self.dtype}")
+
+        return batch
+
+    def _reserve(self, size: int):
+        """Grow the array geometrically to hold at least `size` values."""
+        if size <= len(self._data):
+            return
+
+        grown = np.empty(max(size, 2 * len(self._data), 16), dtype=self.dtype)
+        grown[:self._len] = self._data[:self._len]
+        self._data = grown
+
+    def __str__(self):
+        return f'{{{", ".join(map(str, self))}}}'
+
+    def __repr__(self):
+        return f'SortedArray({self.values!r})'
+
+def _as_array(values: Iterable[Any], dtype: Any = None) -> np.ndarray:
+    return np.asarray(values if isinstance(values, (np.ndarray, list, tuple)) else list(values), dtype=dtype)
+
+def _searchsorted(sorted_values: np.ndarray, probes: np.ndarray) -> np.ndarray:
+    """`np.searchsorted`, with large batches of probes searched in sorted order."""
+    if probes.ndim != 1 or len(probes) < 1024:
+        return np.searchsorted(sorted_values, probes)
+
+    # Probes in order walk the array in order, which is several times faster on large arrays
+    order = np.argsort(probes, kind="stable")
+    positions = np.empty(len(probes), dtype=np.intp)
+    positions[order] = np.searchsorted(sorted_values, probes[order])
+    return positions
+
+def _member(sorted_values: np.ndarray, probes: np.ndarray, positions: np.ndarray | None = None) -> np.ndarray:
+    """Whether each probe is in a sorted array, with one `np.searchsorted`."""
+    if positions is None:
+        positions = _searchsorted(sorted_values, probes)
+    if not len(sorted_values):
+        return np.zeros(np.shape(probes), dtype=bool)
+
+    return sorted_values[np.minimum(positions, len(sorted_values) - 1)] == probes
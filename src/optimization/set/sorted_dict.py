@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import Any, Generic, Iterator, Tuple, TypeVar
+from collections.abc import Callable, MutableMapping
+
+from .sorted_set import SortedSet
+
+K = TypeVar('K')
+T = TypeVar('T')
+
+class SortedDict(Generic[K, T], MutableMapping):
+    """A dict that iterates over its keys in order of `sort_key`.
+
+    Values live in a plain dict and the keys in a `SortedSet`, so lookups are
+    O(1) and the range queries of `SortedSet` apply to the keys.
+
+    >>> d = SortedDict({3: "c", 1: "a", 2: "b"})
+    >>> list(d.irange(2))
+    [2, 3]
+    """
+
+    def __init__(self, items: Any = (), sort_key: Callable[[K], Any] = lambda x: x):
+        self._dict: dict = dict(items)
+        self._keys: SortedSet = SortedSet(self._dict, sort_key=sort_key)
+
+    @property
+    def sort_key(self) -> Callable[[K], Any]:
+        return self._keys.sort_key
+
+    def __getitem__(self, key: K) -> T:
+        return self._dict[key]
+
+    def __setitem__(self, key: K, value: T):
+        if key not in self._dict:
+            self._keys.add(key)
+        self._dict[key] = value
+
+    def __delitem__(self, key: K):
+        del self._dict[key]
+        self._keys.remove(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._dict
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._keys)
+
+    def __reversed__(self) -> Iterator[K]:
+        return reversed(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._dict)
+
+    def update(self, other: Any = (), **kwargs):
+        items = dict(other, **kwargs)
+        self._keys.update([key for key in items if key not in self._dict])
+        self._dict.update(items)
+
+    def clear(self):
+        self._dict.clear()
+        self._keys.clear()
+
+    def copy(self) -> SortedDict[K, T]:
+        new_dict = SortedDict(sort_key=self.sort_key)
+        new_dict._dict = self._dict.copy()
+        new_dict._keys = self._keys.copy()
+
+        return new_dict
+
+    def peekitem(self, index: int = -1) -> Tuple[K, T]:
+        """Returns the (key, value) pair at a position in key order."""
+        key = self._keys[index]
+        return (key, self._dict[key])
+
+    def popitem(self, index: int = -1) -> Tuple[K, T]: # type: ignore
+        """Remove and return the (key, value) pair at a position in key order, by default the last."""
+        if not self._dict:
+            raise KeyError('popitem(): dictionary is empty')
+
+        key = self._keys[index]
+        del self._keys[index]
+        return (key, self._dict.pop(key))
+
+    def irange(self, min_key=None, max_key=None, inclusive: Tuple[bool, bool] = (True, True),
+               reverse: bool = False) -> Iterator[K]:
+        """Iterate lazily over the keys between `min_key` and `max_key`. See `SortedSet.irange`."""
+        return self._keys.irange(min_key, max_key, inclusive, reverse)
+
+    def count_range(self, min_key=None, max_key=None, inclusive: Tuple[bool, bool] = (True, True)) -> int:
+        return self._keys.count_range(min_key, max_key, inclusive)
+
+    def bisect_key_left(self, value) -> int:
+        return self._keys.bisect_key_left(value)
+
+    def bisect_key_right(self, value) -> int:
+        return self._keys.bisect_key_right(value)
+
+    def rank(self, value) -> int:
+        """Returns the number of keys less than `value`."""
+        return self._keys.rank(value)
+
+    def select(self, k: int) -> K:
+        """Returns the k-th smallest key, counting from 0."""
+        return self._keys.select(k)
+
+    def __repr__(self):
+        return f'SortedDict({{{", ".join(f"{k!r}: {v!r}" for k, v in self.items())}}})'
@@ -1,125 +1,375 @@
 from __future__ import annotations
 
-from typing import Any, TypeVar, Generic, Iterable, Optional, Tuple, Iterator
-from collections.abc import Callable, Sequence, MutableSet
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from operator import eq
+from typing import Any, TypeVar, Generic, Iterable, List, Optional, Tuple, Iterator
+from collections.abc import Callable, Sequence, MutableSet, Set, Sized
 
 T = TypeVar('T')
 V = TypeVar('V')
 
 class SortedSet(Generic[T, V], Sequence, MutableSet):
+    """A set kept in order of `sort_key`, with positional access.
+
+    Items are stored in a list of sorted sublists, like the leaf layer of a
+    B+-tree: `_lists` holds the sublists in order, `_keys` the sort key of
+    every item in a parallel sublist, `_maxes` the key of the last item of
+    each, and `_index` a Fenwick tree over their lengths. Finding an item
+    bisects `_maxes` and then one key sublist with the C `bisect` module, and
+    finding a position walks the Fenwick tree, so insertion, removal, indexing
+    and membership are O(log n) plus a memmove within one sublist of at most
+    `2 * load` items. `sort_key` is called once per item added or looked up.
+    """
+
+    load = 1000
+    """The target sublist length. Sublists are split past twice this and merged below half of it."""
+
     def __init__(self, values: Iterable[T] = list(), sort_key: Callable[[T], V] = lambda x: x):
-        self.items = list()
         self.sort_key = sort_key
-        
-        for item in values:
-            self.add(item)
+        self._lists: List[List[T]] = []
+        self._keys: List[List[V]] = []
+        self._maxes: List[V] = []
+        self._index: List[int] = []
+        self._len = 0
+
+        self._set_sorted(*self._sorted(values))
+
+    @property
+    def items(self) -> List[T]:
+        """The items, in order, as a new list. Setting it replaces them with an already-sorted list."""
+        return list(chain.from_iterable(self._lists))
+
+    @items.setter
+    def items(self, items: Iterable[T]):
+        items = list(items)
+        self._set_sorted(items, list(map(self.sort_key, items)))
+
+    def _set_sorted(self, items: List[T], keys: List[V]):
+        """Replace the items with distinct items already in order of their keys."""
+        load = self.load
+        self._lists = [items[i:i + load] for i in range(0, len(items), load)]
+        self._keys = [keys[i:i + load] for i in range(0, len(keys), load)]
+        self._maxes = [sub[-1] for sub in self._keys]
+        self._index = []
+        self._len = len(items)
 
     def add(self, item: T) -> int:
-        do_insert, loc = self._try_insert(item)
-        if do_insert:
-            self.items.insert(loc, item)
+        found, i, j, key = self._find(item)
+        if not found:
+            self._insert(i, j, item, key)
 
     def remove(self, element: Any) -> None:
-        try:
-            idx = self.index(element)
-        except ValueError:
+        found, i, j, _ = self._find(element)
+        if not found:
             raise KeyError(f'{element} does not exist in {self}')
 
-        del self.items[idx]
-        
+        self._delete(i, j)
+
     def discard(self, element: Any) -> None:
-        try:
-            idx = self.index(element)
-        except ValueError:
-            return
-        
-        del self.items[idx]
-    
-    def _try_insert(self, item: T) -> Tuple[bool, int]:
+        found, i, j, _ = self._find(element)
+        if found:
+            self._delete(i, j)
+
+    def _find(self, item: T) -> Tuple[bool, int, int, V]:
+        """Locate an item as (found, sublist, offset, key).
+
+        If the item is absent, the location is where it would be inserted:
+        before any items with an equal key.
+        """
         item_val = self.sort_key(item)
-        lo, hi = 0, len(self.items)
+        lists, keys = self._lists, self._keys
 
-        while lo != hi:
-            mid = (lo + hi) // 2
-            mid_val = self.value_at(mid)
+        i = bisect_left(self._maxes, item_val)
+        if i == len(lists):
+            return (False, i, 0, item_val)
+        j = bisect_left(keys[i], item_val)
 
-            if mid_val < item_val:
-                lo = mid + 1
-            elif mid_val > item_val:
-                hi = mid
-            else:
-                return (self.items[mid] != item, mid)
-            
-        return (True, hi)
-    
-    def index(self, item: T, start=0, stop=-1) -> int:
-        if stop == -1:
-            stop = len(self.items)
+        # Scan the run of items with an equal key, which may cross sublists
+        k, m = i, j
+        while k < len(lists):
+            sub, sub_keys = lists[k], keys[k]
+            while m < len(sub):
+                if sub_keys[m] != item_val:
+                    return (False, i, j, item_val)
+                if sub[m] == item:
+                    return (True, k, m, item_val)
+                m += 1
+            k, m = k + 1, 0
 
-        item_val = self.sort_key(item)
+        return (False, i, j, item_val)
 
-        while start != stop:
-            mid = (start + stop) // 2
-            mid_val = self.value_at(mid)
+    def _bisect(self, value) -> Tuple[int, int]:
+        """The (sublist, offset) of the first item with a key not less than `value`."""
+        i = bisect_left(self._maxes, value)
+        if i == len(self._lists):
+            return (i, 0)
 
-            if mid_val < item_val:
-                start = mid + 1
-            elif mid_val > item_val:
-                stop = mid
-            elif self.items[mid] == item:
-                return mid
-            else:
-                break
+        return (i, bisect_left(self._keys[i], value))
+
+    def _bisect_right(self, value) -> Tuple[int, int]:
+        """The (sublist, offset) of the first item with a key greater than `value`."""
+        i = bisect_right(self._maxes, value)
+        if i == len(self._lists):
+            return (i, 0)
+
+        return (i, bisect_right(self._keys[i], value))
+
+    def _insert(self, i: int, j: int, item: T, key: V):
+        lists, keys = self._lists, self._keys
+        if not lists:
+            lists.append([item])
+            keys.append([key])
+            self._maxes.append(key)
+            self._index = []
+            self._len = 1
+            return
+
+        if i == len(lists):
+            i, j = i - 1, len(lists[i - 1])
+
+        sub, sub_keys = lists[i], keys[i]
+        sub.insert(j, item)
+        sub_keys.insert(j, key)
+        if j == len(sub) - 1:
+            self._maxes[i] = key
+        self._len += 1
+
+        if len(sub) > 2 * self.load:
+            half = len(sub) // 2
+            lists[i:i + 1] = [sub[:half], sub[half:]]
+            keys[i:i + 1] = [sub_keys[:half], sub_keys[half:]]
+            self._maxes.insert(i, sub_keys[half - 1])
+            self._index = []
+        elif self._index:
+            self._fenwick_add(i, 1)
+
+    def _delete(self, i: int, j: int) -> T:
+        lists, keys = self._lists, self._keys
+        sub, sub_keys = lists[i], keys[i]
+        item = sub.pop(j)
+        del sub_keys[j]
+        self._len -= 1
+
+        if not sub:
+            del lists[i]
+            del keys[i]
+            del self._maxes[i]
+            self._index = []
+            return item
+
+        self._maxes[i] = sub_keys[-1]
+        if len(sub) < self.load // 2 and len(lists) > 1:
+            # Merge into a neighbor, splitting again if the result is too long
+            k = i if i + 1 < len(lists) else i - 1
+            merged, merged_keys = lists[k] + lists[k + 1], keys[k] + keys[k + 1]
+            lists[k:k + 2] = [merged]
+            keys[k:k + 2] = [merged_keys]
+            del self._maxes[k]
+            if len(merged) > 2 * self.load:
+                half = len(merged) // 2
+                lists[k:k + 1] = [merged[:half], merged[half:]]
+                keys[k:k + 1] = [merged_keys[:half], merged_keys[half:]]
+                self._maxes.insert(k, merged_keys[half - 1])
+            self._index = []
+        elif self._index:
+            self._fenwick_add(i, -1)
+
+        return item
+
+    def _build_index(self):
+        index = [0] + [len(sub) for sub in self._lists]
+        for k in range(1, len(index)):
+            parent = k + (k & -k)
+            if parent < len(index):
+                index[parent] += index[k]
+        self._index = index
+
+    def _fenwick_add(self, i: int, delta: int):
+        index = self._index
+        k = i + 1
+        while k < len(index):
+            index[k] += delta
+            k += k & -k
+
+    def _position(self, i: int, j: int) -> int:
+        """The global position of offset j in sublist i."""
+        if not self._index:
+            self._build_index()
+
+        index = self._index
+        total, k = j, i
+        while k > 0:
+            total += index[k]
+            k -= k & -k
+        return total
+
+    def _locate(self, idx: int) -> Tuple[int, int]:
+        """The (sublist, offset) of a global position, which may be negative."""
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError('SortedSet index out of range')
+
+        if not self._index:
+            self._build_index()
+
+        # Descend the Fenwick tree to the sublist holding position idx
+        index = self._index
+        i, step = 0, 1 << (len(index) - 1).bit_length()
+        while step:
+            k = i + step
+            if k < len(index) and index[k] <= idx:
+                idx -= index[k]
+                i = k
+            step >>= 1
+
+        return (i, idx)
+
+    def index(self, item: T, start=0, stop=-1) -> int:
+        if stop == -1:
+            stop = len(self)
+
+        found, i, j, _ = self._find(item)
+        if found:
+            pos = self._position(i, j)
+            if start <= pos < stop:
+                return pos
 
         raise ValueError(f'{item} not in {self}')
-    
+
     def search_value(self, value) -> int:
-        lo, hi = 0, len(self.items)
+        return self.bisect_key_left(value)
 
-        while lo != hi:
-            mid = (lo + hi) // 2
-            mid_val = self.value_at(mid)
+    def bisect_key_left(self, value) -> int:
+        """Returns the position of the first item with a key not less than `value`."""
+        return self._position(*self._bisect(value))
 
-            if mid_val < value:
-                lo = mid + 1
-            elif mid_val > value:
-                hi = mid
-            else:
-                return mid
+    def bisect_key_right(self, value) -> int:
+        """Returns the position of the first item with a key greater than `value`."""
+        return self._position(*self._bisect_right(value))
+
+    def irange(self, min_key=None, max_key=None, inclusive: Tuple[bool, bool] = (True, True),
+               reverse: bool = False) -> Iterator[T]:
+        """Iterate lazily over the items with keys between `min_key` and `max_key`.
+
+        Args:
+            min_key: The smallest key, or None for no lower bound.
+            max_key: The largest key, or None for no upper bound.
+            inclusive: Whether the range includes `min_key` and `max_key`.
+            reverse: Yield the items in descending order.
+
+        The set must not be changed while iterating.
+
+        >>> list(SortedSet(range(10)).irange(3, 6, inclusive=(True, False)))
+        [3, 4, 5]
+        """
+        start, stop = self._range(min_key, max_key, inclusive)
+        return chain.from_iterable(self._slices(start, stop, reverse))
+
+    def count_range(self, min_key=None, max_key=None, inclusive: Tuple[bool, bool] = (True, True)) -> int:
+        """Returns the number of items `irange` would yield, in O(log n)."""
+        start, stop = self._range(min_key, max_key, inclusive)
+        return max(self._position(*stop) - self._position(*start), 0)
+
+    def rank(self, value) -> int:
+        """Returns the number of items with a key less than `value`."""
+        return self.bisect_key_left(value)
+
+    def select(self, k: int) -> T:
+        """Returns the k-th smallest item, counting from 0. Raises an IndexError if there is none."""
+        return self[k]
+
+    def _range(self, min_key, max_key, inclusive: Tuple[bool, bool]) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """The (sublist, offset) bounds of a key range, the stop being exclusive."""
+        if min_key is None:
+            start = (0, 0)
+        else:
+            start = self._bisect(min_key) if inclusive[0] else self._bisect_right(min_key)
+
+        if max_key is None:
+            stop = (len(self._lists), 0)
+        else:
+            stop = self._bisect_right(max_key) if inclusive[1] else self._bisect(max_key)
+
+        return start, stop
+
+    def _slices(self, start: Tuple[int, int], stop: Tuple[int, int], reverse: bool) -> Iterator[Iterable[T]]:
+        """Yield the parts of the sublists between two bounds, one sublist at a time."""
+        if start >= stop:
+            return
+
+        (i, j), (k, m) = start, stop
+        lists = self._lists
+        rows = range(k, i - 1, -1) if reverse else range(i, k + 1)
+
+        for row in rows:
+            if row == len(lists):
+                continue
+
+            part = lists[row][j if row == i else 0:m if row == k else None]
+            yield reversed(part) if reverse else part
 
-        return hi
-        
-    
     @property
     def values(self) -> Iterable[V]:
-        return map(self.sort_key, self.items)
-    
+        return chain.from_iterable(self._keys)
+
     def value_at(self, idx) -> V:
-        return self.sort_key(self.items[idx])
-    
+        i, j = self._locate(idx)
+        return self._keys[i][j]
+
     def __contains__(self, item: T) -> bool:
-        return item in self.items
-    
+        try:
+            return self._find(item)[0]
+        except TypeError:
+            # The item's key is not comparable with the keys in the set
+            return False
+
     def __iter__(self) -> Iterator[T]:
-        yield from self.items
+        return chain.from_iterable(self._lists)
 
     def __len__(self) -> int:
-        return len(self.items)
-    
+        return self._len
+
     def __length_hint__(self) -> int:
-        return self.items.__length_hint__()
-    
+        return self._len
+
     def __getitem__(self, idx) -> int:
-        return self.items[idx]
-    
+        if isinstance(idx, slice):
+            positions = range(*idx.indices(self._len))
+            if not positions:
+                return []
+
+            # Copy only the sublists spanning the positions, then step through them
+            lo, hi = min(positions), max(positions) + 1
+            stop = self._locate(hi) if hi < self._len else (len(self._lists), 0)
+            items = list(chain.from_iterable(self._slices(self._locate(lo), stop, False)))
+            return items[positions.start - lo::positions.step]
+
+        i, j = self._locate(idx)
+        return self._lists[i][j]
+
     def __delitem__(self, idx) -> None:
-        del self.items[idx]
+        if isinstance(idx, slice):
+            positions = range(*idx.indices(self._len))
+            if len(positions) > self._len // 2:
+                items = self.items
+                del items[idx]
+                self.items = items
+                return
+
+            # From the last position down, so the earlier ones don't move
+            for position in sorted(positions, reverse=True):
+                self._delete(*self._locate(position))
+            return
+
+        self._delete(*self._locate(idx))
+
+    def __reversed__(self) -> Iterator[T]:
+        return chain.from_iterable(map(reversed, reversed(self._lists)))
 
-    def __reversed__(self, idx) -> Iterator[T]:
-        return reversed(self.items)
-    
     def isdisjoint(self, s: Iterable[Any], sort_key=lambda x: x) -> bool:
-        return set(self.items).isdisjoint(set(s))
+        return set(self).isdisjoint(set(s))
         
     def issubset(self, s: Iterable[Any]) -> bool:
         s = set(s)
@@ -139,64 +389,233 @@ class SortedSet(Generic[T, V], Sequence, MutableSet):
     
     def union(self, *s: Iterable) -> SortedSet[Any]:
         new_set = self.copy()
+        new_set.update(*s)
 
-        for st in s:
-            for item in st:
-                new_set.add(item)
-                
         return new_set
 
     def intersection(self, *s: Iterable[Any]) -> SortedSet:
-        new_set = SortedSet(sort_key=self.sort_key)
-
-        for item in self:
-            for st in map(set, s):
-                if item not in st:
-                    break
-            else: # no break
-                new_set.add(item)
+        new_set = self.copy()
+        new_set.intersection_update(*s)
 
         return new_set
     
     def difference(self, *s: Iterable[Any]) -> SortedSet:
         new_set = self.copy()
+        new_set.difference_update(*s)
 
-        for st in s:
-            for item in st:
-                new_set.discard(item)
-                
         return new_set
 
     def symmetric_difference(self, s: Iterable) -> set:
-        return self.union(s).difference(self.intersection(s))
-    
+        new_set = self.copy()
+        new_set.symmetric_difference_update(s)
+
+        return new_set
+
     def update(self, *s: Iterable) -> None:
         for st in s:
-            for item in st:
-                self.add(item)
+            if self._is_small(st):
+                for item in st:
+                    self.add(item)
+            else:
+                self._merge(st, left=True, both=True, right=True)
 
     def intersection_update(self, *s: Iterable[Any]) -> None:
-        # The lazy way
-        new_set = self.intersection(*s)
-        self.items = new_set.items
+        for st in s:
+            if not self._filter(st, keep=True):
+                self._merge(st, left=False, both=True, right=False)
+
+    def difference_update(self, *s: Iterable[Any]) -> None:
+        for st in s:
+            if self._is_small(st):
+                for item in st:
+                    self.discard(item)
+            elif not self._filter(st, keep=False):
+                self._merge(st, left=True, both=False, right=False)
+
+    def symmetric_difference_update(self, s: Iterable[Any]) -> None:
+        self._merge(s, left=True, both=False, right=True)
+
+    def __or__(self, other):
+        if not isinstance(other, Set):
+            return NotImplemented
+        return self.union(other)
+
+    def __and__(self, other):
+        if not isinstance(other, Set):
+            return NotImplemented
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        if not isinstance(other, Set):
+            return NotImplemented
+        return self.difference(other)
+
+    def __xor__(self, other):
+        if not isinstance(other, Set):
+            return NotImplemented
+        return self.symmetric_difference(other)
+
+    __ror__ = __or__
+    __rand__ = __and__
+    __rxor__ = __xor__
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other):
+        if other is self:
+            self.clear()
+        else:
+            self.difference_update(other)
+        return self
+
+    def __ixor__(self, other):
+        if other is self:
+            self.clear()
+        else:
+            self.symmetric_difference_update(other)
+        return self
+
+    def _is_small(self, s: Iterable[Any]) -> bool:
+        """Whether it is cheaper to add or discard the items of `s` one at a time than to merge."""
+        return isinstance(s, Sized) and len(s) * 16 < self._len
+
+    def _sorted(self, s: Iterable[Any]) -> Tuple[List[Any], List[V]]:
+        """The distinct items of `s` and their keys, in order of key."""
+        if isinstance(s, SortedSet) and s.sort_key is self.sort_key:
+            return s.items, list(s.values)
+
+        items = list(s)
+        keys = list(map(self.sort_key, items))
+        order = sorted(range(len(items)), key=keys.__getitem__)
+        items = [items[i] for i in order]
+        keys = [keys[i] for i in order]
+
+        if not any(map(eq, keys, keys[1:])):
+            return items, keys
+
+        # Drop repeats within each run of equal keys
+        unique_items: List[Any] = []
+        unique_keys: List[V] = []
+        run = 0
+        for item, key in zip(items, keys):
+            if unique_keys and unique_keys[-1] == key:
+                if item in unique_items[run:]:
+                    continue
+            else:
+                run = len(unique_items)
+
+            unique_items.append(item)
+            unique_keys.append(key)
+
+        return unique_items, unique_keys
+
+    def _filter(self, s: Iterable[Any], keep: bool) -> bool:
+        """Keep (or drop) the items found in `s` by hashing, if `s` is a set or dict.
+
+        Returns False if the merge path should be used instead. Other
+        iterables are merged too, rather than copied into a temporary set.
+        """
+        if not isinstance(s, (set, frozenset, dict)):
+            return False
+
+        items, keys = [], []
+        for sub, sub_keys in zip(self._lists, self._keys):
+            for item, key in zip(sub, sub_keys):
+                if (item in s) == keep:
+                    items.append(item)
+                    keys.append(key)
+
+        self._set_sorted(items, keys)
+        return True
+
+    def _merge(self, s: Iterable[Any], left: bool, both: bool, right: bool):
+        """Replace the items with a two-pointer merge against the items of `s`.
+
+        The flags choose which items are kept: those only in this set, those
+        in both, and those only in `s`.
+        """
+        a_items, a_keys = self.items, list(self.values)
+        b_items, b_keys = self._sorted(s)
+        na, nb = len(a_items), len(b_items)
+
+        items: List[Any] = []
+        keys: List[V] = []
+        i = j = 0
+        while i < na and j < nb:
+            ka, kb = a_keys[i], b_keys[j]
+            if ka < kb:
+                if left:
+                    items.append(a_items[i])
+                    keys.append(ka)
+                i += 1
+            elif kb < ka:
+                if right:
+                    items.append(b_items[j])
+                    keys.append(kb)
+                j += 1
+            else:
+                # Compare the items within the runs of this key on both sides
+                i_end, j_end = i + 1, j + 1
+                while i_end < na and a_keys[i_end] == ka:
+                    i_end += 1
+                while j_end < nb and b_keys[j_end] == kb:
+                    j_end += 1
+
+                a_run, b_run = a_items[i:i_end], b_items[j:j_end]
+                for item in a_run:
+                    if (both if item in b_run else left):
+                        items.append(item)
+                        keys.append(ka)
+                if right:
+                    for item in b_run:
+                        if item not in a_run:
+                            items.append(item)
+                            keys.append(kb)
+
+                i, j = i_end, j_end
+
+        if left:
+            items += a_items[i:]
+            keys += a_keys[i:]
+        if right:
+            items += b_items[j:]
+            keys += b_keys[j:]
+
+        self._set_sorted(items, keys)
 
     def pop(self) -> Any:
-        return self.items.pop()
+        if not self._len:
+            raise IndexError('pop from empty SortedSet')
+
+        return self._delete(len(self._lists) - 1, len(self._lists[-1]) - 1)
 
     def clear(self) -> None:
-        self.items.clear()
+        self._lists.clear()
+        self._keys.clear()
+        self._maxes.clear()
+        self._index = []
+        self._len = 0
 
     def copy(self) -> set:
         new_set = SortedSet(sort_key=self.sort_key)
-        new_set.items = self.items.copy()
+        new_set._lists = [sub.copy() for sub in self._lists]
+        new_set._keys = [sub.copy() for sub in self._keys]
+        new_set._maxes = self._maxes.copy()
+        new_set._len = self._len
 
         return new_set
-    
+
     def __str__(self):
-        return f'{{{", ".join(map(str, self.items))}}}'
-    
+        return f'{{{", ".join(map(str, self))}}}'
+
     def __repr__(self):
-        return f'{{{", ".join(map(repr, self.items))}}}'
-    
+        return f'{{{", ".join(map(repr, self))}}}'
+
     def __set__(self):
-        return set(self.items)
+        return set(self)
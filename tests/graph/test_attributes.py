@@ -0,0 +1,124 @@
+import pytest
+import numpy as np
+
+from optimization.graph.graph import Graph, NormalGraph
+from optimization.graph import Edge, DirectedEdge, DirectedGraph, NaiveGraph, AdjacencySet, IncidenceMatrix
+from optimization.graph import AttributeTable, AttributedGraph
+
+@pytest.fixture(params=[NaiveGraph, AdjacencySet, IncidenceMatrix])
+def graph(request):
+    edges = [Edge("a", "b"), Edge("b", "c"), Edge("c", "d")]
+    return Graph.from_types(NormalGraph, request.param, AttributedGraph).from_vertices_and_edges(list("abcd"), edges)
+
+@pytest.fixture
+def table():
+    table = AttributeTable(list("abcde"))
+    table.add_column("cost", default=1.0)
+    table.add_column("kind", dtype=np.int8)
+    table.set("cost", list("abcde"), [4.0, 1.0, 3.0, 5.0, 2.0])
+    table.set("kind", list("abcde"), [0, 1, 0, 1, 1])
+    return table
+
+def test_initial_keys(graph):
+    assert set(graph.vertex_attrs.keys()) == set("abcd")
+    assert len(graph.edge_attrs) == 3
+    assert ("b", "a") in graph.edge_attrs
+
+def test_columns(table):
+    assert table.column_names == ["cost", "kind"]
+    assert table.get("cost", ["c", "a"]).tolist() == [3.0, 4.0]
+
+    table.set("cost", ["a", "b"], 0.0)
+    assert table.get("cost").tolist() == [0.0, 0.0, 3.0, 5.0, 2.0]
+
+    with pytest.raises(ValueError):
+        table.add_column("cost")
+    with pytest.raises(KeyError):
+        table.get("weight")
+    with pytest.raises(ValueError):
+        table.get("cost", ["z"])
+
+def test_filter(table):
+    assert table.filter("cost", lambda cost: (cost > 1) & (cost < 5)) == ["a", "c", "e"]
+
+def test_aggregate(table):
+    assert table.aggregate("cost") == 15.0
+    assert table.aggregate("cost", "max") == 5.0
+    assert table.aggregate("cost", "count") == 5
+
+    groups, sums = table.aggregate("cost", "sum", by="kind")
+    assert groups.tolist() == [0, 1]
+    assert sums.tolist() == [7.0, 8.0]
+
+    _, lowest = table.aggregate("cost", "min", by="kind")
+    assert lowest.tolist() == [3.0, 1.0]
+
+    _, means = table.aggregate("cost", "mean", by="kind")
+    assert means.tolist() == [3.5, 8 / 3]
+
+    with pytest.raises(ValueError):
+        table.aggregate("cost", "median")
+
+def test_removed_rows_are_reused_with_defaults(table):
+    table.remove("b")
+    assert "b" not in table
+    assert len(table) == 4
+
+    table.add("f")
+    assert len(table._keys) == 5
+    assert table.get("cost", ["f"]).tolist() == [1.0]
+    assert table.get("kind", ["f"]).tolist() == [0]
+
+    with pytest.raises(ValueError):
+        table.remove("b")
+
+def test_columns_grow(table):
+    table.add_many(range(100))
+    assert len(table) == 105
+    assert table.get("cost", [0, 99]).tolist() == [1.0, 1.0]
+    assert table.get("cost", ["d"]).tolist() == [5.0]
+
+def test_vertex_sync(graph):
+    graph.vertex_attrs.add_column("demand", dtype=np.int64)
+    graph.vertex_attrs.set("demand", ["a", "b"], [3, 4])
+
+    graph.add_vertex("e")
+    assert graph.vertex_attrs.get("demand", ["e"]).tolist() == [0]
+
+    graph.remove_vertex("b")
+    assert "b" not in graph.vertex_attrs
+    assert ("a", "b") not in graph.edge_attrs
+    assert ("c", "b") not in graph.edge_attrs
+    assert ("c", "d") in graph.edge_attrs
+    assert graph.vertex_attrs.aggregate("demand") == 3
+
+def test_remove_vertex_with_loop(graph):
+    graph.add_edge("a", "a")
+    assert ("a", "a") in graph.edge_attrs
+
+    graph.remove_vertex("a")
+    assert ("a", "a") not in graph.edge_attrs
+    assert graph.edge_attrs.keys() == [("b", "c"), ("c", "d")]
+
+def test_edge_sync(graph):
+    graph.edge_attrs.add_column("capacity", dtype=np.int32, default=1)
+    graph.edge_attrs.set("capacity", [("b", "a")], 10)
+    assert graph.edge_attrs.get("capacity", [("a", "b")]).tolist() == [10]
+
+    graph.add_edge("a", "d")
+    assert graph.edge_attrs.get("capacity", [("d", "a")]).tolist() == [1]
+
+    graph.remove_edge(Edge("b", "a"))
+    assert ("a", "b") not in graph.edge_attrs
+    assert graph.edge_attrs.filter("capacity", lambda c: c > 5) == []
+
+def test_directed():
+    edges = [DirectedEdge("a", "b"), DirectedEdge("b", "a"), DirectedEdge("b", "c")]
+    graph = Graph.from_types(DirectedGraph, NaiveGraph, AttributedGraph).from_vertices_and_edges(list("abc"), edges)
+
+    graph.edge_attrs.add_column("flow")
+    graph.edge_attrs.set("flow", [("a", "b"), ("b", "a")], [1.0, 2.0])
+    assert graph.edge_attrs.get("flow", [("b", "a")]).tolist() == [2.0]
+
+    graph.remove_vertex("a")
+    assert graph.edge_attrs.keys() == [("b", "c")]
@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+
+from optimization.graph.graph import Graph, NormalGraph
+from optimization.graph import Edge, DirectedEdge, DirectedGraph, AbstractGraph
+from optimization.graph import NaiveGraph, AdjacencySet, IncidenceMatrix, CachedGraph
+
+@pytest.fixture(params=[NaiveGraph, AdjacencySet, IncidenceMatrix])
+def any_graph(request) -> type:
+    return Graph.from_types(NormalGraph, request.param)
+
+@pytest.fixture
+def square_graph(any_graph) -> AbstractGraph:
+    edges = [Edge("a", "b"), Edge("b", "c"), Edge("c", "d"), Edge("d", "a"), Edge("a", "c")]
+    return any_graph.from_vertices_and_edges(list("abcde"), edges)
+
+def test_degrees(square_graph):
+    degrees = dict(zip(square_graph.vertices, square_graph.degrees().tolist()))
+    assert degrees == {"a": 3, "b": 2, "c": 3, "d": 2, "e": 0}
+
+def test_is_adjacent_many(square_graph):
+    src = ["a", "a", "b", "e", "d"]
+    dst = ["b", "e", "d", "a", "c"]
+
+    result = square_graph.is_adjacent_many(src, dst)
+    assert result.dtype == bool
+    assert result.tolist() == [square_graph.is_adjacent(v1, v2) for v1, v2 in zip(src, dst)]
+
+    with pytest.raises(ValueError):
+        square_graph.is_adjacent_many(["a"], ["foobar"])
+
+def test_neighbors_of_many(square_graph):
+    vs = ["a", "e", "b"]
+    offsets, values = square_graph.neighbors_of_many(vs)
+
+    assert offsets.tolist()[0] == 0
+    assert len(offsets) == len(vs) + 1
+    for i, v in enumerate(vs):
+        assert set(values[offsets[i]:offsets[i + 1]].tolist()) == square_graph.neighbors_of(v)
+
+    with pytest.raises(ValueError):
+        square_graph.neighbors_of_many(["foobar"])
+
+def test_batch_after_mutation(square_graph):
+    square_graph.degrees()
+    square_graph.add_edge("e", "b")
+
+    assert square_graph.is_adjacent_many(["e"], ["b"]).tolist() == [True]
+    assert dict(zip(square_graph.vertices, square_graph.degrees().tolist()))["e"] == 1
+
+def test_integer_vertices_stay_numeric(any_graph):
+    g = any_graph.from_vertices_and_edges(range(3), [Edge(0, 1), Edge(1, 2)])
+    offsets, values = g.neighbors_of_many([1])
+
+    assert values.dtype.kind == "i"
+    assert sorted(values.tolist()) == [0, 2]
+
+@pytest.mark.parametrize("repr_", [NaiveGraph, AdjacencySet])
+def test_directed_is_adjacent_many(repr_):
+    g = Graph.from_types(DirectedGraph, repr_).from_vertices_and_edges("ab", [DirectedEdge("a", "b")])
+    assert g.is_adjacent_many(["a", "b"], ["b", "a"]).tolist() == [True, False]
+
+def test_cached_degrees():
+    cls = Graph.from_types(NormalGraph, AdjacencySet, CachedGraph)
+    g = cls.from_vertices_and_edges("abc", [Edge("a", "b")])
+
+    assert g.degrees() is g.degrees()
+    g.add_edge("b", "c")
+    assert g.degrees().tolist() == [1, 2, 1]
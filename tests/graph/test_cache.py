@@ -0,0 +1,87 @@
+import pytest
+
+from optimization.graph.graph import Graph, NormalGraph
+from optimization.graph import Edge, DirectedEdge, DirectedGraph, WeightedGraph, WeightedEdge
+from optimization.graph import NaiveGraph, AdjacencySet, IncidenceMatrix, CachedGraph
+
+@pytest.fixture(params=[NaiveGraph, AdjacencySet, IncidenceMatrix])
+def cached_graph(request):
+    edges = [Edge("a", "b"), Edge("b", "c"), Edge("c", "d"), Edge("d", "a")]
+    return Graph.from_types(NormalGraph, request.param, CachedGraph).from_vertices_and_edges(list("abcd"), edges)
+
+def test_hits_and_misses(cached_graph):
+    assert cached_graph.neighbors_of("a") == {"b", "d"}
+    assert cached_graph.neighbors_of("a") == {"b", "d"}
+
+    info = cached_graph.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.version == 0
+
+def test_selective_invalidation(cached_graph):
+    cached_graph.neighbors_of("a")
+    cached_graph.neighbors_of("b")
+
+    cached_graph.add_edge("a", "c")
+    assert cached_graph.version == 1
+
+    assert cached_graph.neighbors_of("b") == {"a", "c"}
+    assert cached_graph.cache_info().hits == 1
+
+    assert cached_graph.neighbors_of("a") == {"b", "c", "d"}
+    assert cached_graph.cache_info().misses == 3
+
+def test_degree(cached_graph):
+    assert cached_graph.degree("a") == 2
+    cached_graph.remove_edge(Edge("a", "b"))
+    assert cached_graph.degree("a") == 1
+    assert cached_graph.degree("b") == 1
+
+def test_remove_vertex_touches_neighbors(cached_graph):
+    assert cached_graph.neighbors_of("b") == {"a", "c"}
+    cached_graph.remove_vertex("a")
+    assert cached_graph.neighbors_of("b") == {"c"}
+
+    with pytest.raises(ValueError):
+        cached_graph.neighbors_of("a")
+
+def test_memoize_whole_graph(cached_graph):
+    calls = []
+    def compute():
+        calls.append(1)
+        return cached_graph.vertex_count
+
+    assert cached_graph.memoize("count", compute) == 4
+    assert cached_graph.memoize("count", compute) == 4
+    assert len(calls) == 1
+
+    cached_graph.add_vertex("e")
+    assert cached_graph.memoize("count", compute) == 5
+    assert len(calls) == 2
+
+def test_lru_bound():
+    cls = Graph.from_types(NormalGraph, AdjacencySet, CachedGraph)
+    g = cls.from_vertices_and_edges(range(10), [])
+    g._query_cache.maxsize = 3
+
+    for v in range(10):
+        g.neighbors_of(v)
+
+    assert g.cache_info().currsize == 3
+
+def test_directed_remove_vertex():
+    cls = Graph.from_types(DirectedGraph, AdjacencySet, CachedGraph)
+    g = cls.from_vertices_and_edges("abc", [DirectedEdge("a", "b"), DirectedEdge("c", "b")])
+
+    assert g.neighbors_of("a") == {"b"}
+    g.remove_vertex("b")
+    assert g.neighbors_of("a") == set()
+
+def test_weight_change_invalidates():
+    cls = Graph.from_types(WeightedGraph, AdjacencySet, CachedGraph)
+    g = cls.from_vertices_and_edges("ab", [WeightedEdge("a", "b", 1)])
+
+    total = lambda: g.get_edge_weight("a", "b")
+    assert g.memoize("total", total) == 1
+    g.set_edge_weight("a", "b", 3)
+    assert g.memoize("total", total) == 3
@@ -0,0 +1,94 @@
+import pytest
+import numpy as np
+
+from optimization.graph.graph import Graph, NormalGraph, DirectedGraph, WeightedGraph
+from optimization.graph import Edge, DirectedEdge, WeightedEdge, AdjacencySet, NaiveGraph, EdgeArrays
+from optimization.graph.generators import erdos_renyi
+from optimization.graph.algorithms import betweenness_centrality
+
+def path(n, directed=False):
+    return EdgeArrays(range(n), np.arange(n - 1), np.arange(1, n), directed=directed)
+
+def brute_force(arrays):
+    n = arrays.vertex_count
+    adjacency = [set() for _ in range(n)]
+    for i, j in zip(arrays.src.tolist(), arrays.dst.tolist()):
+        adjacency[i].add(j)
+        if not arrays.directed:
+            adjacency[j].add(i)
+
+    dist = np.full((n, n), -1)
+    sigma = np.zeros((n, n))
+    for s in range(n):
+        dist[s, s], sigma[s, s] = 0, 1
+        frontier = [s]
+        while frontier:
+            following = []
+            for v in frontier:
+                for w in adjacency[v] - {v}:
+                    if dist[s, w] < 0:
+                        dist[s, w] = dist[s, v] + 1
+                        following.append(w)
+                    if dist[s, w] == dist[s, v] + 1:
+                        sigma[s, w] += sigma[s, v]
+            frontier = following
+
+    scores = np.zeros(n)
+    for v in range(n):
+        for s in range(n):
+            for t in range(n):
+                if len({s, v, t}) == 3 and dist[s, t] > 0 and dist[s, v] >= 0 and dist[v, t] >= 0 \
+                        and dist[s, v] + dist[v, t] == dist[s, t]:
+                    scores[v] += sigma[s, v] * sigma[v, t] / sigma[s, t]
+    return scores
+
+def test_path():
+    assert betweenness_centrality(path(4), normalized=False).tolist() == [0, 2, 2, 0]
+    assert betweenness_centrality(path(4, directed=True), normalized=False).tolist() == [0, 2, 2, 0]
+    assert betweenness_centrality(path(4)).tolist() == pytest.approx([0, 2 / 3, 2 / 3, 0])
+
+def test_matches_brute_force():
+    arrays = erdos_renyi(40, 0.1, seed=3)
+    expected = brute_force(arrays) / (39 * 38)
+    assert betweenness_centrality(arrays) == pytest.approx(expected)
+
+    directed = erdos_renyi(40, 0.08, seed=4, directed=True)
+    expected = brute_force(directed)
+    assert betweenness_centrality(directed, normalized=False) == pytest.approx(expected)
+
+def test_weighted():
+    # The heavy edge a-c is longer than the detour through b
+    cls = Graph.from_types(WeightedGraph, AdjacencySet)
+    g = cls.from_vertices_and_edges(list("abc"), [WeightedEdge("a", "b", 1), WeightedEdge("b", "c", 1),
+                                                  WeightedEdge("a", "c", 5)])
+
+    scores = dict(zip(g.vertices, betweenness_centrality(g, normalized=False).tolist()))
+    assert scores == {"a": 0, "b": 1, "c": 0}
+
+    scores = dict(zip(g.vertices, betweenness_centrality(g, normalized=False, weighted=False).tolist()))
+    assert scores == {"a": 0, "b": 0, "c": 0}
+
+def test_weighted_matches_unweighted_for_unit_weights():
+    arrays = erdos_renyi(60, 0.08, seed=5)
+    weighted = EdgeArrays(arrays.vertices, arrays.src, arrays.dst, np.ones(arrays.edge_count))
+
+    assert betweenness_centrality(weighted) == pytest.approx(betweenness_centrality(arrays))
+
+    with pytest.raises(ValueError):
+        betweenness_centrality(EdgeArrays(range(2), [0], [1], [-1.0]))
+
+def test_sampling():
+    arrays = erdos_renyi(200, 0.05, seed=6)
+    exact = betweenness_centrality(arrays)
+
+    assert betweenness_centrality(arrays, sample=200) == pytest.approx(exact)
+
+    estimate = betweenness_centrality(arrays, sample=100, seed=0)
+    assert np.corrcoef(estimate, exact)[0, 1] > 0.9
+
+def test_workers():
+    arrays = erdos_renyi(150, 0.05, seed=7)
+    weighted = EdgeArrays(arrays.vertices, arrays.src, arrays.dst, np.random.default_rng(0).random(arrays.edge_count))
+
+    assert betweenness_centrality(arrays, workers=2) == pytest.approx(betweenness_centrality(arrays))
+    assert betweenness_centrality(weighted, workers=2) == pytest.approx(betweenness_centrality(weighted))
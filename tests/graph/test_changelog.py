@@ -0,0 +1,150 @@
+import asyncio
+import pickle
+import zlib
+
+import pytest
+
+from optimization.graph.graph import Graph, NormalGraph
+from optimization.graph import Edge, WeightedGraph, DirectedGraph, NaiveGraph, AdjacencySet, IncidenceMatrix
+from optimization.graph import Change, ChangeLog, ObservableGraph
+from optimization.graph.changelog import ChangeLogOverflow, apply_changes, encode_changes, decode_changes
+
+@pytest.fixture(params=[NaiveGraph, AdjacencySet, IncidenceMatrix])
+def graph(request):
+    return Graph.from_types(NormalGraph, request.param, ObservableGraph).from_str("a-b b-c")
+
+def mutate(graph):
+    graph.add_vertex("d")
+    graph.add_edge("c", "d")
+    graph.remove_edge(Edge("a", "b"))
+    graph.remove_edge(Edge("b", "c"))
+    graph.remove_vertex("b")
+
+def test_records_mutations(graph):
+    mutate(graph)
+
+    assert list(graph.changes.iter_changes()) == [
+        Change(1, "add_vertex", "d"),
+        Change(2, "add_edge", "c", "d"),
+        Change(3, "remove_edge", "a", "b"),
+        Change(4, "remove_edge", "b", "c"),
+        Change(5, "remove_vertex", "b"),
+    ]
+    assert [c.seq for c in graph.changes.iter_changes(since=3)] == [4, 5]
+    assert graph.changes.last_seq == 5
+
+def test_failed_mutations_are_not_recorded(graph):
+    with pytest.raises(ValueError):
+        graph.add_edge("a", "z")
+    assert graph.changes.last_seq == 0
+
+def test_observers(graph):
+    seen = []
+    graph.add_observer(seen.append)
+    graph.add_vertex("d")
+    graph.remove_observer(seen.append)
+    graph.add_vertex("e")
+
+    assert seen == [Change(1, "add_vertex", "d")]
+
+def test_replay(graph):
+    replica = type(graph).from_str("a-b b-c")
+    mutate(graph)
+
+    assert apply_changes(replica, graph.changes.iter_changes()) == 5
+    assert set(replica.vertices) == set(graph.vertices)
+    assert set(replica.edges) == set(graph.edges)
+
+def test_ring_buffer_overflow():
+    log = ChangeLog(capacity=3)
+    for v in range(5):
+        log.append("add_vertex", v)
+
+    assert len(log) == 3
+    assert log.first_seq == 3
+    assert [c.v1 for c in log.iter_changes(since=2)] == [2, 3, 4]
+    with pytest.raises(ChangeLogOverflow):
+        list(log.iter_changes(since=1))
+
+def test_subscription_polls():
+    log = ChangeLog()
+    log.append("add_vertex", "a")
+
+    subscription = log.subscribe()
+    assert subscription.poll() == []
+
+    log.append("add_vertex", "b")
+    log.append("add_edge", "a", "b")
+    assert [c.seq for c in subscription] == [2, 3]
+    assert list(subscription) == []
+
+def test_async_subscription():
+    log = ChangeLog()
+
+    async def consume():
+        seen = []
+        async for change in log.subscribe():
+            seen.append(change.v1)
+            if len(seen) == 3:
+                return seen
+
+    async def produce():
+        for v in "abc":
+            await asyncio.sleep(0)
+            log.append("add_vertex", v)
+
+    async def main():
+        consumer = asyncio.ensure_future(consume())
+        await produce()
+        return await consumer
+
+    assert asyncio.run(main()) == ["a", "b", "c"]
+
+def test_encoding_round_trip():
+    cls = Graph.from_types(WeightedGraph, AdjacencySet, ObservableGraph)
+    graph = cls.from_vertices_and_edges(["a", "b"], [cls.create_edge_from_vertices("a", "b", 1)])
+    graph.add_vertex("c")
+    graph.add_edge("b", "c", 2.5)
+    graph.set_edge_weight("a", "b", 4)
+    graph.remove_edge(graph.create_edge_from_vertices("b", "c", 2.5))
+
+    changes = list(graph.changes.iter_changes())
+    assert decode_changes(encode_changes(changes)) == changes
+    assert decode_changes(encode_changes([])) == []
+
+    labels = [Change(1, "add_edge", 0, 1, "heavy"), Change(5, "add_vertex", (2, 3))]
+    assert decode_changes(encode_changes(labels)) == labels
+
+class _Exploit:
+    def __reduce__(self):
+        return (print, ("unpickled",))
+
+def test_decoding_rejects_pickles(capsys):
+    with pytest.raises(ValueError):
+        decode_changes(zlib.compress(pickle.dumps(_Exploit())))
+    with pytest.raises(ValueError):
+        decode_changes(b"not a batch")
+    assert capsys.readouterr().out == ""
+
+def test_batches():
+    graph = Graph.from_types(DirectedGraph, NaiveGraph, ObservableGraph).from_str("")
+    replica = type(graph).from_str("")
+    for v in range(10):
+        graph.add_vertex(v)
+    for v in range(9):
+        graph.add_edge(v, v + 1)
+
+    batches = list(graph.changes.batches(size=8))
+    assert len(batches) == 3
+
+    for batch in batches:
+        apply_changes(replica, decode_changes(batch))
+    assert set(replica.edges) == set(graph.edges)
+
+def test_nested_mutations_are_recorded_once():
+    # AdjacencySet.add_edge sets the weight through set_edge_weight
+    cls = Graph.from_types(WeightedGraph, AdjacencySet, ObservableGraph)
+    graph = cls.from_vertices_and_edges(["a", "b"], [])
+    graph.add_edge("a", "b", 2.0)
+
+    assert list(graph.changes.iter_changes()) == [Change(1, "add_edge", "a", "b", 2.0)]
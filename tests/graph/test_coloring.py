@@ -0,0 +1,71 @@
+import pytest
+import numpy as np
+
+from optimization.graph.graph import Graph, NormalGraph
+from optimization.graph import Edge, AdjacencySet, EdgeArrays
+from optimization.graph.generators import erdos_renyi, grid_graph
+from optimization.graph.algorithms import greedy_coloring, dsatur_coloring, tabu_coloring, is_proper_coloring
+
+def cycle(n):
+    return EdgeArrays(range(n), np.arange(n), (np.arange(n) + 1) % n)
+
+def crown(n):
+    # K_{n,n} minus a perfect matching: bipartite, but greedy in the order
+    # a0, b0, a1, b1, ... uses n colors
+    edges = [Edge(f"a{i}", f"b{j}") for i in range(n) for j in range(n) if i != j]
+    vertices = [v for i in range(n) for v in (f"a{i}", f"b{i}")]
+    return Graph.from_types(NormalGraph, AdjacencySet).from_vertices_and_edges(vertices, edges)
+
+@pytest.mark.parametrize("strategy", ["largest_first", "smallest_last", "random"])
+def test_greedy_is_proper(strategy):
+    arrays = erdos_renyi(300, 0.05, seed=1)
+    colors = greedy_coloring(arrays, strategy, restarts=3, seed=2)
+
+    assert colors.shape == (300,)
+    assert is_proper_coloring(arrays, colors)
+
+def test_greedy_explicit_order():
+    g = crown(5)
+    assert greedy_coloring(g, list(g.vertices)).max() + 1 == 5
+
+    with pytest.raises(ValueError):
+        greedy_coloring(g, ["a0", "a0"])
+    with pytest.raises(ValueError):
+        greedy_coloring(g, "foobar")
+
+def test_smallest_last_bound():
+    # Grids are 2-degenerate, so smallest-last needs at most 3 colors
+    colors = greedy_coloring(grid_graph((20, 30)), "smallest_last")
+    assert colors.max() + 1 <= 3
+
+def test_dsatur():
+    assert dsatur_coloring(crown(5)).max() + 1 == 2
+    assert dsatur_coloring(cycle(7)).max() + 1 == 3
+    assert dsatur_coloring(grid_graph((10, 10))).max() + 1 == 2
+
+    arrays = erdos_renyi(500, 0.02, seed=3)
+    assert is_proper_coloring(arrays, dsatur_coloring(arrays))
+
+def test_tabu_improves():
+    g = crown(6)
+    start = greedy_coloring(g, list(g.vertices))
+    assert start.max() + 1 == 6
+
+    colors = tabu_coloring(g, start, seed=0)
+    assert is_proper_coloring(g, colors)
+    assert colors.max() + 1 == 2
+
+def test_tabu_never_worse():
+    arrays = erdos_renyi(200, 0.1, seed=4)
+    start = dsatur_coloring(arrays)
+    colors = tabu_coloring(arrays, start, max_iterations=2000, seed=5)
+
+    assert is_proper_coloring(arrays, colors)
+    assert colors.max() <= start.max()
+
+def test_is_proper_coloring():
+    assert not is_proper_coloring(cycle(4), [0, 1, 1, 0])
+    assert is_proper_coloring(cycle(4), [0, 1, 0, 1])
+
+    with pytest.raises(ValueError):
+        is_proper_coloring(cycle(4), [0, 1])
@@ -0,0 +1,144 @@
+import pytest
+import numpy as np
+import scipy.sparse
+
+from optimization.graph.graph import Graph, NormalGraph
+from optimization.graph import Edge, DirectedEdge, WeightedEdge, DirectedGraph, WeightedGraph, DirectedWeightedGraph
+from optimization.graph import NaiveGraph, AdjacencySet, IncidenceMatrix
+from optimization.graph import convert, to_scipy_sparse, from_scipy_sparse
+
+representations = [NaiveGraph, AdjacencySet, IncidenceMatrix]
+
+@pytest.fixture(params=representations)
+def source(request) -> type:
+    return request.param
+
+@pytest.fixture(params=representations)
+def target(request) -> type:
+    return request.param
+
+@pytest.fixture
+def edges():
+    return [Edge("a", "b"), Edge("b", "c"), Edge("c", "d"), Edge("d", "a")]
+
+def test_convert(source, target, edges):
+    g = Graph.from_types(NormalGraph, source).from_vertices_and_edges("abcde", edges)
+    h = convert(g, target)
+
+    assert isinstance(h, target)
+    assert isinstance(h, NormalGraph)
+    assert set(h.vertices) == set("abcde")
+    assert set(h.edges) == set(edges)
+
+def test_to(source, target, edges):
+    g = Graph.from_types(NormalGraph, source).from_vertices_and_edges("abcd", edges)
+    h = g.to(Graph.from_types(NormalGraph, target))
+
+    assert h.neighbors_of("a") == {"b", "d"}
+
+@pytest.mark.parametrize("source", [NaiveGraph, AdjacencySet])
+@pytest.mark.parametrize("target", [NaiveGraph, AdjacencySet])
+def test_convert_directed(source, target):
+    edges = [DirectedEdge("a", "b"), DirectedEdge("b", "c")]
+    g = Graph.from_types(DirectedGraph, source).from_vertices_and_edges("abc", edges)
+    h = g.to(target)
+
+    assert isinstance(h, DirectedGraph)
+    assert h.is_adjacent("a", "b")
+    assert not h.is_adjacent("b", "a")
+
+def test_directed_through_incidence_matrix(source):
+    # Arcs pointing from a later vertex to an earlier one must survive the matrix
+    edges = [DirectedEdge("c", "a"), DirectedEdge("b", "c"), DirectedEdge("b", "b")]
+    g = Graph.from_types(DirectedGraph, source).from_vertices_and_edges("abc", edges)
+    h = g.to(IncidenceMatrix)
+    h.add_edge("c", "b")
+
+    back = h.to(source)
+    assert sorted(back.to_edge_arrays()) == sorted([("c", "a"), ("b", "c"), ("b", "b"), ("c", "b")])
+    assert sorted(h.to_edge_arrays()) == sorted(back.to_edge_arrays())
+    assert h.neighbors_of("a") == {"c"}
+
+def test_incidence_matrix_edge_lookup():
+    cls = Graph.from_types(DirectedWeightedGraph, IncidenceMatrix)
+    g = cls.from_vertices_and_edges([0, 1, 2], [cls.create_edge_from_vertices(0, 1, 3.0),
+                                                cls.create_edge_from_vertices(2, 1, 4.0)])
+
+    assert g.get_edge_weight(0, 1) == 3.0
+    assert g.is_adjacent(2, 1) and not g.is_adjacent(1, 2)
+    assert not g.is_adjacent(1, 1)
+    for v1, v2 in [(1, 0), (0, 0), (1, 1)]:
+        with pytest.raises(ValueError):
+            g.get_edge_weight(v1, v2)
+    with pytest.raises(ValueError):
+        g.remove_edge(cls.create_edge_from_vertices(1, 0, 3.0))
+
+    g.add_edge(1, 1, 5.0)
+    assert g.get_edge_weight(1, 1) == 5.0
+
+def test_incidence_matrix_remove_vertex():
+    g = Graph.from_types(DirectedGraph, IncidenceMatrix).from_vertices_and_edges(
+        [0, 1, 2, 3], [DirectedEdge(0, 1), DirectedEdge(1, 2), DirectedEdge(2, 3)])
+    g.remove_vertex(1)
+
+    assert g.edge_count == 1
+    assert sorted(g.to_edge_arrays()) == [(2, 3)]
+
+@pytest.mark.parametrize("source", [NaiveGraph, IncidenceMatrix])
+def test_unknown_endpoint(source):
+    cls = Graph.from_types(NormalGraph, source)
+    with pytest.raises(ValueError):
+        cls.from_vertices_and_edges("ab", [Edge("a", "z")]).to_edge_arrays()
+
+def test_convert_weighted(source, target):
+    edges = [WeightedEdge("a", "b", 2.0), WeightedEdge("b", "c", 3.0)]
+    g = Graph.from_types(WeightedGraph, source).from_vertices_and_edges("abc", edges)
+    h = g.to(target)
+
+    assert h.get_edge_weight("a", "b") == 2.0
+    assert h.get_edge_weight("c", "b") == 3.0
+
+    h.set_edge_weight("a", "b", 5.0)
+    assert h.get_edge_weight("a", "b") == 5.0
+
+def test_edge_arrays_round_trip(source, edges):
+    cls = Graph.from_types(NormalGraph, source)
+    arrays = cls.from_vertices_and_edges("abcd", edges).to_edge_arrays()
+
+    assert arrays.edge_count == 4
+    assert set(cls.from_edge_arrays(arrays).edges) == set(edges)
+
+def test_scipy_round_trip(source, edges):
+    g = Graph.from_types(NormalGraph, source).from_vertices_and_edges("abcd", edges)
+    matrix = to_scipy_sparse(g)
+    order = list(g.vertices)
+
+    assert matrix.shape == (4, 4)
+    assert matrix.sum() == 8
+    assert matrix[order.index("a"), order.index("b")] == 1
+
+    h = from_scipy_sparse(Graph.from_types(NormalGraph, source), matrix, order)
+    assert set(h.edges) == set(edges)
+
+def test_adjacency_matrix_cached():
+    g = Graph.from_types(NormalGraph, NaiveGraph).from_vertices_and_edges("abc", [Edge("a", "b")])
+    matrix = g.adjacency_matrix
+
+    assert g.adjacency_matrix is matrix
+    assert not matrix.flags.writeable
+    assert matrix.sum() == 2
+
+    g.add_edge("b", "c")
+    assert g.adjacency_matrix is not matrix
+    assert g.adjacency_matrix.sum() == 4
+
+def test_from_adjacency_matrix():
+    cls = Graph.from_types(NormalGraph, NaiveGraph)
+    dense = np.array([[0, 1, 0], [1, 0, 1], [0, 1, 1]])
+
+    for matrix in (dense, scipy.sparse.csr_array(dense)):
+        g = cls.from_adjacency_matrix(matrix)
+        assert set(g.edges) == {Edge(0, 1), Edge(1, 2), Edge(2, 2)}
+
+    with pytest.raises(ValueError):
+        cls.from_adjacency_matrix(np.zeros((2, 3)))
@@ -0,0 +1,71 @@
+import pytest
+import numpy as np
+
+from optimization.graph.graph import Graph, NormalGraph
+from optimization.graph import Edge, AdjacencySet, IncidenceMatrix, EdgeArrays
+from optimization.graph.generators import erdos_renyi
+from optimization.graph.algorithms import core_numbers, degeneracy, degeneracy_ordering, k_core
+
+@pytest.fixture
+def graph():
+    # A 4-clique {a, b, c, d}, a triangle {d, e, f} hanging off it and a path f - g - h
+    edges = [Edge(*pair) for pair in ["ab", "ac", "ad", "bc", "bd", "cd", "de", "df", "ef", "fg", "gh"]]
+    return Graph.from_types(NormalGraph, AdjacencySet).from_vertices_and_edges(list("abcdefghi"), edges)
+
+def brute_force_cores(arrays):
+    adjacency = {v: set() for v in range(arrays.vertex_count)}
+    for i, j in zip(arrays.src.tolist(), arrays.dst.tolist()):
+        if i != j:
+            adjacency[i].add(j)
+            adjacency[j].add(i)
+
+    cores = [0] * arrays.vertex_count
+    k = 0
+    while adjacency:
+        k += 1
+        while (low := [v for v, nbrs in adjacency.items() if len(nbrs) < k]):
+            for v in low:
+                cores[v] = k - 1
+                for w in adjacency.pop(v):
+                    adjacency.get(w, set()).discard(v)
+
+    return cores
+
+def test_core_numbers(graph):
+    cores = dict(zip(graph.vertices, core_numbers(graph).tolist()))
+    assert cores == {"a": 3, "b": 3, "c": 3, "d": 3, "e": 2, "f": 2, "g": 1, "h": 1, "i": 0}
+    assert degeneracy(graph) == 3
+
+def test_matches_brute_force():
+    arrays = erdos_renyi(300, 0.04, seed=7)
+    assert core_numbers(arrays).tolist() == brute_force_cores(arrays)
+
+def test_degeneracy_ordering(graph):
+    order = degeneracy_ordering(graph)
+    assert sorted(order) == sorted(graph.vertices)
+
+    position = {v: i for i, v in enumerate(order)}
+    later = [sum(position[w] > position[v] for w in graph.neighbors_of(v)) for v in order]
+    assert max(later) <= degeneracy(graph)
+
+def test_k_core(graph):
+    core = k_core(graph, 2)
+
+    assert type(core) is type(graph)
+    assert set(core.vertices) == set("abcdef")
+    assert core.edge_count == 9
+    assert set(graph.vertices) == set("abcdefghi")
+
+    assert set(k_core(graph, 3).vertices) == set("abcd")
+    assert k_core(graph, 4).vertex_count == 0
+
+def test_k_core_arrays():
+    arrays = EdgeArrays(["x", "y", "z", "w"], [0, 1, 2, 2], [1, 2, 0, 3], weights=[1.0, 2.0, 3.0, 4.0])
+    core = k_core(arrays, 2)
+
+    assert list(core.vertices) == ["x", "y", "z"]
+    assert core.weights.tolist() == [1.0, 2.0, 3.0]
+
+def test_k_core_incidence_matrix(graph):
+    g = graph.to(IncidenceMatrix)
+    assert set(k_core(g, 3).vertices) == set("abcd")
@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+
+from optimization.graph.graph import Graph, DirectedGraph, NormalGraph
+from optimization.graph import DirectedEdge, Edge, AdjacencySet, NaiveGraph, EdgeArrays
+from optimization.graph.algorithms import strongly_connected_components, condensation, topological_sort, is_acyclic
+from optimization.graph.algorithms import CycleError
+
+def directed(vertices, arcs, repr_=AdjacencySet):
+    cls = Graph.from_types(DirectedGraph, repr_)
+    return cls.from_vertices_and_edges(list(vertices), [DirectedEdge(*arc) for arc in arcs])
+
+@pytest.fixture
+def graph():
+    # {a, b, c} -> {d, e} -> f, plus an isolated vertex g
+    return directed("abcdefg", ["ab", "bc", "ca", "cd", "de", "ed", "ef", "af"])
+
+def test_scc(graph):
+    components = strongly_connected_components(graph)
+    assert sorted(map(sorted, components)) == [["a", "b", "c"], ["d", "e"], ["f"], ["g"]]
+
+    position = {v: i for i, c in enumerate(components) for v in c}
+    assert position["a"] < position["d"] < position["f"]
+
+def test_condensation(graph):
+    result = condensation(graph)
+    labels = dict(zip(graph.vertices, result.labels.tolist()))
+    arcs = set(zip(result.dag.src.tolist(), result.dag.dst.tolist()))
+
+    assert arcs == {(labels["a"], labels["d"]), (labels["a"], labels["f"]), (labels["d"], labels["f"])}
+    assert result.dag.directed
+    assert all(i < j for i, j in arcs)
+
+def test_topological_sort():
+    g = directed("abcde", ["ab", "ac", "bd", "cd", "de"], NaiveGraph)
+    order = topological_sort(g)
+
+    assert sorted(order) == list("abcde")
+    assert all(order.index(v1) < order.index(v2) for v1, v2 in g.edges)
+    assert is_acyclic(g)
+
+def test_cycle_reported(graph):
+    with pytest.raises(CycleError) as info:
+        topological_sort(graph)
+
+    cycle = info.value.cycle
+    arcs = {tuple(e) for e in graph.edges}
+    assert all((cycle[i], cycle[(i + 1) % len(cycle)]) in arcs for i in range(len(cycle)))
+    assert not is_acyclic(graph)
+
+def test_loop_is_cycle():
+    g = directed("ab", ["ab", "bb"])
+    with pytest.raises(CycleError) as info:
+        topological_sort(g)
+    assert info.value.cycle == ["b"]
+
+def test_undirected_components():
+    g = Graph.from_types(NormalGraph, AdjacencySet).from_vertices_and_edges([1, 2, 3, 4], [Edge(1, 2), Edge(3, 2)])
+    assert sorted(map(sorted, strongly_connected_components(g))) == [[1, 2, 3], [4]]
+
+def test_long_path_is_not_recursive():
+    n = 200_000
+    arrays = EdgeArrays(range(n), np.arange(n - 1), np.arange(1, n), directed=True)
+
+    assert topological_sort(arrays) == list(range(n))
+
+    cycle = EdgeArrays(range(n), np.arange(n), (np.arange(n) + 1) % n, directed=True)
+    assert len(strongly_connected_components(cycle)) == 1
@@ -0,0 +1,142 @@
+import heapq
+import math
+import random
+
+import pytest
+
+from optimization.graph.graph import Graph, NormalGraph
+from optimization.graph import DirectedWeightedGraph, AdjacencySet, EdgeArrays
+from optimization.graph import Change, ObservableGraph
+from optimization.graph.algorithms import DynamicShortestPaths, DynamicReachability
+
+def dijkstra(edges, vertices, source, directed):
+    adjacency = {v: [] for v in vertices}
+    for (u, v), w in edges.items():
+        adjacency[u].append((v, w))
+        if not directed:
+            adjacency[v].append((u, w))
+
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in adjacency[u]:
+            if d + w < dist.get(v, math.inf):
+                dist[v] = d + w
+                heapq.heappush(heap, (d + w, v))
+
+    return dist
+
+def check_tree(paths, edges, directed):
+    for v, d in paths.distances().items():
+        p = paths.parent(v)
+        if p is None:
+            assert v == paths.source
+            continue
+        w = edges.get((p, v), edges.get((v, p)) if not directed else None)
+        assert paths.distance(p) + w == d
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_random_updates_match_dijkstra(directed):
+    rng = random.Random(3)
+    n = 60
+    vertices = list(range(n))
+    edges = {}
+    while len(edges) < 150:
+        u, v = rng.sample(vertices, 2)
+        if (u, v) not in edges and (v, u) not in edges:
+            edges[(u, v)] = float(rng.randint(0, 9))
+
+    arrays = EdgeArrays(vertices, [u for u, _ in edges], [v for _, v in edges], list(edges.values()), directed=directed)
+    paths = DynamicShortestPaths(arrays, 0, recompute_fraction=1.0)
+
+    for seq in range(1, 400):
+        op = rng.random()
+        if op < 0.4 or not edges:
+            u, v = rng.sample(vertices, 2)
+            if (u, v) in edges or (v, u) in edges:
+                continue
+            edges[(u, v)] = w = float(rng.randint(0, 9))
+            paths.apply(Change(seq, "add_edge", u, v, w))
+        elif op < 0.7:
+            u, v = rng.choice(list(edges))
+            w = edges.pop((u, v))
+            paths.apply(Change(seq, "remove_edge", u, v, w))
+        else:
+            u, v = rng.choice(list(edges))
+            edges[(u, v)] = w = float(rng.randint(0, 9))
+            paths.apply(Change(seq, "set_edge_weight", u, v, w))
+
+        assert paths.distances() == dijkstra(edges, vertices, 0, directed)
+        check_tree(paths, edges, directed)
+
+    assert paths.recomputes == 1
+
+def test_follows_observable_graph():
+    cls = Graph.from_types(DirectedWeightedGraph, AdjacencySet, ObservableGraph)
+    graph = cls.from_vertices_and_edges(list("sabc"), [cls.create_edge_from_vertices("s", "a", 1.0),
+                                                        cls.create_edge_from_vertices("a", "b", 1.0),
+                                                        cls.create_edge_from_vertices("s", "b", 5.0)])
+    paths = DynamicShortestPaths(graph, "s")
+    assert paths.distance("b") == 2.0
+    assert paths.distance("c") == math.inf
+    assert paths.path_to("c") is None
+
+    graph.add_edge("b", "c", 1.0)
+    assert paths.path_to("c") == ["s", "a", "b", "c"]
+
+    graph.remove_edge(cls.create_edge_from_vertices("a", "b", 1.0))
+    assert paths.path_to("c") == ["s", "b", "c"]
+    assert paths.distance("c") == 6.0
+
+    graph.set_edge_weight("s", "b", 0.5)
+    assert paths.distance("c") == 1.5
+
+    graph.remove_vertex("b")
+    assert paths.distance("c") == math.inf
+    with pytest.raises(ValueError):
+        paths.distance("b")
+
+    paths.close()
+    graph.add_edge("s", "c", 1.0)
+    assert paths.distance("c") == math.inf
+
+def test_alternative_parent_spares_subtree():
+    # Two equally short routes to m, and a long tail behind it
+    n = 100
+    src = [0, 0, 1, 2, 3] + list(range(4, n + 3))
+    dst = [1, 2, 3, 3, 4] + list(range(5, n + 4))
+    arrays = EdgeArrays(["s", "a", "b", "m", *range(n)], src, dst, directed=True)
+    paths = DynamicShortestPaths(arrays, "s", recompute_fraction=0.1)
+
+    parent = paths.parent("m")
+    paths.apply(Change(1, "remove_edge", parent, "m"))
+    assert paths.distance(n - 1) == n + 2
+    assert paths.parent("m") != parent
+    assert paths.recomputes == 1
+
+def test_recompute_past_threshold():
+    arrays = EdgeArrays(list(range(50)), list(range(49)), list(range(1, 50)), directed=True)
+    paths = DynamicShortestPaths(arrays, 0, recompute_fraction=0.1)
+
+    paths.apply(Change(1, "remove_edge", 0, 1))
+    assert paths.recomputes == 2
+    assert paths.distances() == {0: 0.0}
+
+def test_reachability():
+    cls = Graph.from_types(NormalGraph, AdjacencySet, ObservableGraph)
+    graph = cls.from_str("a-b b-c d-e")
+    reach = DynamicReachability(graph, "a")
+    assert reach.reachable() == {"a", "b", "c"}
+
+    graph.add_edge("c", "d")
+    assert reach.is_reachable("e")
+
+    graph.remove_vertex("c")
+    assert reach.reachable() == {"a", "b"}
+
+def test_unknown_source():
+    with pytest.raises(ValueError):
+        DynamicShortestPaths(EdgeArrays(["a"], [], []), "b")
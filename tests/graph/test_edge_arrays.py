@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+
+from optimization.graph.edge_arrays import EdgeArrays
+
+@pytest.fixture
+def square():
+    return EdgeArrays(["a", "b", "c", "d"], [0, 1, 2, 3], [1, 2, 3, 0])
+
+def test_iter(square):
+    assert list(square) == [("a", "b"), ("b", "c"), ("c", "d"), ("d", "a")]
+    assert len(square) == 4
+
+def test_contains(square):
+    assert ("a", "b") in square
+    assert ("b", "a") in square
+    assert ("a", "c") not in square
+    assert ("a", "foobar") not in square
+
+def test_directed_contains():
+    arrays = EdgeArrays(range(3), [0], [1], directed=True)
+    assert (0, 1) in arrays
+    assert (1, 0) not in arrays
+
+def test_to_csr(square):
+    csr = square.to_csr()
+    assert csr.vertex_count == 4
+    assert csr.row(0).tolist() == [1, 3]
+    assert csr.degrees().tolist() == [2, 2, 2, 2]
+
+    csr = square.to_csr(symmetric=False)
+    assert csr.row(0).tolist() == [1]
+
+def test_weights_follow_csr_order():
+    arrays = EdgeArrays(range(3), [0, 0], [2, 1], weights=[5.0, 7.0], directed=True)
+    csr = arrays.to_csr()
+    assert csr.row(0).tolist() == [1, 2]
+    assert csr.data.tolist() == [7.0, 5.0]
+
+def test_mismatched_arrays():
+    with pytest.raises(ValueError):
+        EdgeArrays(range(3), [0, 1], [1])
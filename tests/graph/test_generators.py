@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+
+from optimization.graph.graph import Graph, NormalGraph
+from optimization.graph import AdjacencySet
+from optimization.graph.edge_arrays import EdgeArrays
+from optimization.graph.generators import erdos_renyi, barabasi_albert, random_regular, grid_graph, random_geometric
+
+def edge_keys(arrays: EdgeArrays) -> np.ndarray:
+    n = arrays.vertex_count
+    return np.minimum(arrays.src, arrays.dst) * n + np.maximum(arrays.src, arrays.dst)
+
+def assert_simple(arrays: EdgeArrays):
+    keys = edge_keys(arrays)
+    assert len(np.unique(keys)) == len(keys)
+    assert np.all(arrays.src != arrays.dst)
+
+def test_erdos_renyi_reproducible():
+    a = erdos_renyi(200, 0.1, seed=7)
+    b = erdos_renyi(200, 0.1, seed=7)
+
+    assert np.array_equal(a.src, b.src)
+    assert np.array_equal(a.dst, b.dst)
+
+def test_erdos_renyi_density():
+    a = erdos_renyi(500, 0.05, seed=1)
+    assert_simple(a)
+    assert abs(a.edge_count / (500 * 499 / 2) - 0.05) < 0.005
+
+def test_erdos_renyi_extremes():
+    assert erdos_renyi(10, 0, seed=1).edge_count == 0
+    assert erdos_renyi(10, 1, seed=1).edge_count == 45
+    assert erdos_renyi(10, 1, seed=1, directed=True).edge_count == 90
+
+    with pytest.raises(ValueError):
+        erdos_renyi(10, 1.5)
+
+def test_barabasi_albert():
+    a = barabasi_albert(1000, 3, seed=3)
+    assert_simple(a)
+    assert a.edge_count <= 3 + 3 * (1000 - 4)
+    assert np.all(np.bincount(np.concatenate((a.src, a.dst)), minlength=1000) >= 1)
+
+def test_random_regular():
+    a = random_regular(100, 5 * 2, seed=4)
+    assert_simple(a)
+    assert np.all(np.bincount(np.concatenate((a.src, a.dst))) == 10)
+
+    with pytest.raises(ValueError):
+        random_regular(5, 3)
+
+def test_grid_graph():
+    assert grid_graph((3, 4)).edge_count == 3 * 3 + 2 * 4
+    assert grid_graph((2, 2, 2)).edge_count == 12
+    assert grid_graph((4, 4), periodic=True).edge_count == 32
+
+    csr = grid_graph((3, 3)).to_csr()
+    assert set(csr.row(4).tolist()) == {1, 3, 5, 7}
+
+def test_random_geometric_matches_brute_force():
+    arrays, positions = random_geometric(300, 0.15, seed=5, return_positions=True)
+    assert_simple(arrays)
+
+    close = np.sum((positions[:, None] - positions[None]) ** 2, axis=-1) <= 0.15 ** 2
+    expected = {(i, j) for i, j in zip(*np.nonzero(np.triu(close, 1)))}
+    assert set(zip(*np.sort(np.stack((arrays.src, arrays.dst)), axis=0).tolist())) == expected
+
+def test_bulk_load():
+    arrays = erdos_renyi(30, 0.2, seed=6)
+    g = Graph.from_types(NormalGraph, AdjacencySet).from_vertices_and_edges(arrays.vertices, arrays)
+
+    assert g.vertex_count == 30
+    assert g.edge_count == arrays.edge_count
+    for v1, v2 in arrays:
+        assert g.is_adjacent(v1, v2)
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Microseconds. Importing the package takes about a third of this without NumPy; NumPy alone takes more
+IMPORT_BUDGET = 60_000
+
+def import_times(code: str) -> dict:
+    """Run `code` in a fresh interpreter and return the cumulative import time of each module."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    env.pop("OPTIMIZATION_GRAPH_INSTRUMENT", None)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            env=env, capture_output=True, text=True, check=True)
+
+    times = dict()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+    return times
+
+@pytest.mark.parametrize("code", [
+    "import optimization.graph",
+    "import optimization.set",
+    "from optimization.graph import AdjacencySet, NaiveGraph, CachedGraph, ObservableGraph",
+    "from optimization.set import SortedSet, SortedDict, IndexedHeap, BucketQueue",
+])
+def test_import_does_not_load_numpy(code):
+    modules = import_times(code)
+    assert "numpy" not in modules
+    assert "scipy" not in modules
+
+def test_array_backed_names_load_on_access():
+    modules = import_times("import optimization.graph as g; g.IncidenceMatrix")
+    assert "numpy" in modules
+
+    modules = import_times("from optimization.set import SortedArray")
+    assert "numpy" in modules
+
+def test_lazy_attributes():
+    import optimization.graph
+    import optimization.set
+    from optimization.graph.incidence_matrix_graph import IncidenceMatrix
+    from optimization.set.sorted_array import SortedArray
+
+    assert optimization.graph.IncidenceMatrix is IncidenceMatrix
+    assert optimization.set.SortedArray is SortedArray
+    assert "EdgeArrays" in dir(optimization.graph)
+
+    with pytest.raises(AttributeError):
+        optimization.graph.NoSuchGraph
+    with pytest.raises(AttributeError):
+        optimization.set.NoSuchSet
+
+def test_star_imports():
+    names: dict = dict()
+    exec("from optimization.graph import *; from optimization.set import *", names)
+
+    for name in ["AdjacencySet", "ObservableGraph", "IncidenceMatrix", "EdgeArrays", "convert",
+                 "AttributedGraph", "share", "SortedSet", "SortedArray"]:
+        assert name in names
+
+def test_import_time_budget():
+    # The best of a few runs, so a busy machine doesn't fail the test
+    best = min(import_times("import optimization.graph, optimization.set")["optimization.graph"] for _ in range(3))
+    assert best < IMPORT_BUDGET, f"importing optimization.graph took {best / 1000:.1f} ms"
@@ -0,0 +1,72 @@
+import pytest
+
+from optimization.graph.graph import Graph, NormalGraph
+from optimization.graph import AdjacencySet, NaiveGraph, Edge
+from optimization.graph import instrumentation
+from optimization.graph.instrumentation import instrumented
+
+@pytest.fixture
+def square_graph():
+    edges = [Edge("a", "b"), Edge("b", "c"), Edge("c", "d"), Edge("d", "a")]
+    return Graph.from_types(NormalGraph, AdjacencySet).from_vertices_and_edges("abcd", edges)
+
+def test_disabled_by_default():
+    assert not instrumentation.is_enabled()
+    assert AdjacencySet.__dict__["neighbors_of"].__name__ == "neighbors_of"
+    assert not hasattr(AdjacencySet.__dict__["neighbors_of"], "__wrapped__")
+
+def test_counts_calls_and_sizes(square_graph):
+    with instrumented() as stats:
+        square_graph.neighbors_of("a")
+        square_graph.neighbors_of("b")
+        square_graph.is_adjacent("a", "b")
+
+    d = stats.as_dict()
+    assert d["AdjacencySet.neighbors_of"]["calls"] == 2
+    assert d["AdjacencySet.neighbors_of"]["total_size"] == 4
+    assert d["AdjacencySet.neighbors_of"]["max_size"] == 2
+    assert d["AdjacencySet.is_adjacent"]["calls"] == 1
+    assert d["AdjacencySet.is_adjacent"]["seconds"] >= 0
+
+def test_restores_methods(square_graph):
+    original = AdjacencySet.__dict__["neighbors_of"]
+
+    with instrumented():
+        assert AdjacencySet.__dict__["neighbors_of"] is not original
+
+    assert AdjacencySet.__dict__["neighbors_of"] is original
+
+    square_graph.neighbors_of("a")
+    assert "AdjacencySet.neighbors_of" not in instrumentation.recorder.as_dict()
+
+def test_counts_failed_calls(square_graph):
+    with instrumented() as stats:
+        with pytest.raises(ValueError):
+            square_graph.neighbors_of("foobar")
+
+    assert stats.as_dict()["AdjacencySet.neighbors_of"]["calls"] == 1
+    assert stats.as_dict()["AdjacencySet.neighbors_of"]["sized_calls"] == 0
+
+def test_classmethods_and_new_classes():
+    with instrumented() as stats:
+        cls = Graph.from_types(NormalGraph, NaiveGraph)
+        cls.from_vertices_and_edges(["a", "b"], [Edge("a", "b")])
+
+    assert stats.as_dict()["NaiveGraph.from_vertices_and_edges"]["total_size"] == 1
+
+def test_nesting():
+    with instrumented():
+        with instrumented(reset=False):
+            pass
+        assert instrumentation.is_enabled()
+
+    assert not instrumentation.is_enabled()
+
+def test_prometheus(square_graph):
+    with instrumented() as stats:
+        square_graph.neighbors_of("a")
+
+    text = stats.to_prometheus()
+    assert "# TYPE optimization_graph_calls_total counter" in text
+    assert 'optimization_graph_calls_total{class="AdjacencySet",method="neighbors_of"} 1' in text
+    assert 'optimization_graph_input_size_max{class="AdjacencySet",method="neighbors_of"} 2' in text
@@ -0,0 +1,104 @@
+import pytest
+import numpy as np
+from functools import lru_cache
+
+from optimization.graph.graph import Graph, NormalGraph, WeightedGraph
+from optimization.graph import Edge, WeightedEdge, AdjacencySet, EdgeArrays
+from optimization.graph.generators import erdos_renyi
+from optimization.graph.algorithms import maximum_matching, maximum_weight_matching, bipartition
+
+def is_matching(arrays, pairs):
+    edges = {frozenset(e) for e in arrays}
+    used = [v for pair in pairs for v in pair]
+    return len(used) == len(set(used)) and all(frozenset(pair) in edges for pair in pairs)
+
+def brute_force(arrays, weighted=False):
+    n = arrays.vertex_count
+    weights = arrays.weights if arrays.weights is not None else np.ones(arrays.edge_count)
+    best = dict()
+    for i, j, w in zip(arrays.src.tolist(), arrays.dst.tolist(), weights.tolist()):
+        if i != j:
+            key = (min(i, j), max(i, j))
+            best[key] = max(best.get(key, -np.inf), w if weighted else 1)
+
+    @lru_cache(None)
+    def solve(free):
+        if not free:
+            return 0
+        v = (free & -free).bit_length() - 1
+        rest = free & ~(1 << v)
+        value = solve(rest)
+        for (i, j), w in best.items():
+            if v in (i, j):
+                u = j if v == i else i
+                if rest >> u & 1 and w > 0:
+                    value = max(value, w + solve(rest & ~(1 << u)))
+        return value
+
+    return solve((1 << n) - 1)
+
+def random_bipartite(n_left, n_right, p, seed, weights=False):
+    rng = np.random.default_rng(seed)
+    i, j = np.nonzero(rng.random((n_left, n_right)) < p)
+    w = rng.integers(1, 20, len(i)).astype(float) if weights else None
+    return EdgeArrays(range(n_left + n_right), i, j + n_left, w)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_bipartite(seed):
+    arrays = random_bipartite(7, 6, 0.3, seed)
+    pairs = maximum_matching(arrays)
+
+    assert is_matching(arrays, pairs)
+    assert len(pairs) == brute_force(arrays)
+    assert all(v < 7 for v, _ in pairs)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_general(seed):
+    arrays = erdos_renyi(13, 0.25, seed=seed)
+    pairs = maximum_matching(arrays)
+
+    assert is_matching(arrays, pairs)
+    assert len(pairs) == brute_force(arrays)
+
+def test_blossom():
+    # Two triangles joined by a path: a perfect matching needs to go through both blossoms
+    edges = [Edge(*e) for e in ["ab", "bc", "ca", "cd", "de", "ef", "fg", "ge"]]
+    g = Graph.from_types(NormalGraph, AdjacencySet).from_vertices_and_edges(list("abcdefgh"), edges)
+
+    pairs = maximum_matching(g)
+    assert len(pairs) == 3
+    assert is_matching(g.to_edge_arrays(), pairs)
+
+def test_left():
+    arrays = EdgeArrays(list("abcd"), [0, 0, 1], [2, 3, 2])
+    assert sorted(maximum_matching(arrays, left=["c", "d"])) == [("c", "b"), ("d", "a")]
+
+    with pytest.raises(ValueError):
+        maximum_matching(arrays, left=["a", "b", "c"])
+
+def test_bipartition():
+    left, right = bipartition(EdgeArrays(range(5), [0, 1, 2], [1, 2, 3]))
+    assert (left, right) == ([0, 2, 4], [1, 3])
+
+    assert bipartition(EdgeArrays(range(3), [0, 1, 2], [1, 2, 0])) is None
+
+@pytest.mark.parametrize("p", [0.15, 0.9])
+def test_weighted(p):
+    # Low density goes through the sparse reduction, high density through the Hungarian algorithm
+    for seed in range(4):
+        arrays = random_bipartite(6, 7, p, seed, weights=True)
+        pairs = maximum_weight_matching(arrays)
+        weight = {frozenset(e): w for e, w in zip(arrays, arrays.weights.tolist())}
+
+        assert is_matching(arrays, pairs)
+        assert sum(weight[frozenset(pair)] for pair in pairs) == brute_force(arrays, weighted=True)
+
+def test_weighted_graph():
+    cls = Graph.from_types(WeightedGraph, AdjacencySet)
+    g = cls.from_vertices_and_edges(list("abcd"), [WeightedEdge("a", "c", 3), WeightedEdge("a", "d", 5),
+                                                   WeightedEdge("b", "d", 4)])
+
+    assert sorted(maximum_weight_matching(g)) == [("a", "c"), ("b", "d")]
+
+    with pytest.raises(ValueError):
+        maximum_weight_matching(erdos_renyi(5, 1.0))
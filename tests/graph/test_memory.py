@@ -0,0 +1,92 @@
+import tracemalloc
+
+import pytest
+import numpy as np
+
+from optimization.graph.graph import Graph, NormalGraph
+from optimization.graph import WeightedGraph, EdgeArrays, NaiveGraph, AdjacencySet, IncidenceMatrix
+from optimization.graph import CachedGraph, AttributedGraph, ObservableGraph
+from optimization.graph import MemoryUsage, recommend_representation
+from optimization.graph.memory import sizeof
+
+def build(repr_, *mixins, n=200, m=600, type_=NormalGraph):
+    rng = np.random.default_rng(0)
+    arrays = EdgeArrays([f"v{i}" for i in range(n)], rng.integers(0, n, m), rng.integers(0, n, m))
+    return Graph.from_types(type_, repr_, *mixins).from_edge_arrays(arrays)
+
+@pytest.mark.parametrize("repr_", [NaiveGraph, AdjacencySet, IncidenceMatrix])
+def test_components(repr_):
+    g = build(repr_)
+    usage = g.memory_usage()
+
+    assert isinstance(usage, MemoryUsage)
+    assert usage.total == sum(usage)
+    assert usage.vertices > 200 * 50 # the vertex strings
+    assert usage.attributes == 0
+    assert g.memory_usage(deep=False).total < usage.total
+
+    if repr_ is NaiveGraph:
+        assert usage.edges > 600 * 50
+    elif repr_ is AdjacencySet:
+        assert usage.adjacency > 200 * 200 # a set per vertex
+    else:
+        assert usage.arrays >= g.matrix.nbytes
+
+    assert build(repr_, m=1200).memory_usage().total > usage.total
+
+def test_mixins():
+    g = build(AdjacencySet, CachedGraph, AttributedGraph, ObservableGraph)
+    g.vertex_attrs.add_column("cost", default=1.0)
+    usage = g.memory_usage()
+
+    assert usage.attributes > 200 * 8
+    assert usage.other > build(AdjacencySet).memory_usage().other
+    assert usage.adjacency == build(AdjacencySet).memory_usage().adjacency
+
+def test_weights_are_edges():
+    g = build(AdjacencySet, type_=WeightedGraph)
+    for v1, v2 in list(g.edges):
+        g.set_edge_weight(v1, v2, 1.5)
+    assert g.memory_usage().edges > 600 * 50
+
+def test_matches_tracemalloc():
+    tracemalloc.start()
+    g = build(AdjacencySet, n=2000, m=8000)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert g.memory_usage().total == pytest.approx(traced, rel=0.25)
+
+def test_sizeof():
+    shared = "x" * 1000
+    assert sizeof([shared, shared]) < 2 * sizeof(shared)
+    assert sizeof([shared], deep=False) < sizeof(shared)
+
+    array = np.zeros(1000)
+    assert sizeof(array) >= array.nbytes
+    assert sizeof([array, array[10:]]) < 2 * array.nbytes
+
+def test_recommend_representation():
+    assert recommend_representation(100_000, 500_000).representation is AdjacencySet
+    assert recommend_representation(100_000, 500_000, "mutate").representation is AdjacencySet
+    assert recommend_representation(10, 5, "memory").representation is IncidenceMatrix
+    assert recommend_representation(100_000, 200_000, "memory").representation is NaiveGraph
+
+    recommendation = recommend_representation(1000, 5000, "query")
+    assert recommendation.estimated_bytes == recommendation.estimates["AdjacencySet"]
+
+    limit = recommendation.estimates["NaiveGraph"]
+    if limit < recommendation.estimated_bytes:
+        assert recommend_representation(1000, 5000, "query", memory_limit=limit).representation is NaiveGraph
+
+    # Without AdjacencySet, a small graph is queried faster by scanning its few edges, but changed
+    # faster by copying its small matrix
+    assert recommend_representation(30, 20, "query", memory_limit=7000).representation is NaiveGraph
+    assert recommend_representation(30, 20, "mutate", memory_limit=7000).representation is IncidenceMatrix
+    assert recommend_representation(30, 20, "mutate").seconds["AdjacencySet"] < \
+        recommend_representation(30, 20, "mutate").seconds["NaiveGraph"]
+
+    with pytest.raises(ValueError):
+        recommend_representation(1000, 5000, memory_limit=10)
+    with pytest.raises(ValueError):
+        recommend_representation(1000, 5000, "unknown")
@@ -0,0 +1,113 @@
+import pytest
+import numpy as np
+from itertools import permutations
+
+from optimization.graph.graph import Graph, WeightedGraph
+from optimization.graph import WeightedEdge, AdjacencySet, EdgeArrays
+from optimization.graph.algorithms import solve_tsp, tour_cost, clarke_wright
+
+def euclidean(n, seed, directed=False):
+    points = np.random.default_rng(seed).random((n, 2))
+    i, j = np.nonzero(~np.eye(n, dtype=bool)) if directed else np.triu_indices(n, 1)
+    weights = np.linalg.norm(points[i] - points[j], axis=1)
+    if directed:
+        # Going "up" costs extra
+        weights += np.maximum(points[j, 1] - points[i, 1], 0)
+    return EdgeArrays(range(n), i, j, weights, directed=directed)
+
+def optimum(arrays):
+    n = arrays.vertex_count
+    cost = np.zeros((n, n))
+    cost[arrays.src, arrays.dst] = cost[arrays.dst, arrays.src] = arrays.weights
+
+    tours = np.array([(0,) + rest for rest in permutations(range(1, n))])
+    return cost[tours, np.roll(tours, -1, axis=1)].sum(axis=1).min()
+
+def is_tour(arrays, order):
+    return sorted(order) == sorted(arrays.vertices)
+
+@pytest.mark.parametrize("construction", ["nearest_neighbor", "christofides"])
+def test_small_tours_near_optimal(construction):
+    for seed in range(3):
+        arrays = euclidean(8, seed)
+        tour = solve_tsp(arrays, construction=construction, seed=seed)
+
+        assert is_tour(arrays, tour.order)
+        assert tour.cost == pytest.approx(tour_cost(arrays, tour.order))
+        assert tour.cost <= optimum(arrays) * 1.1
+
+def test_local_search_improves():
+    arrays = euclidean(200, 1)
+    constructed = solve_tsp(arrays, local_search=False)
+    improved = solve_tsp(arrays, seed=0)
+
+    assert is_tour(arrays, improved.order)
+    assert improved.cost < constructed.cost
+
+def test_start_and_vertices():
+    cls = Graph.from_types(WeightedGraph, AdjacencySet)
+    g = cls.from_vertices_and_edges(list("abcd"), [WeightedEdge("a", "b", 1), WeightedEdge("b", "c", 1),
+                                                   WeightedEdge("c", "d", 1), WeightedEdge("d", "a", 1),
+                                                   WeightedEdge("a", "c", 5), WeightedEdge("b", "d", 5)])
+    tour = solve_tsp(g, start="c")
+
+    assert tour.order[0] == "c"
+    assert tour.cost == 4
+
+    with pytest.raises(ValueError):
+        solve_tsp(g, start="foobar")
+    with pytest.raises(ValueError):
+        solve_tsp(g, construction="foobar")
+
+def test_missing_edges():
+    # A ring without its closing edge still gets a tour, paying for the missing link
+    arrays = EdgeArrays(range(5), [0, 1, 2, 3], [1, 2, 3, 4], [1.0, 1.0, 1.0, 1.0])
+    tour = solve_tsp(arrays, missing_cost=10)
+
+    assert is_tour(arrays, tour.order)
+    assert tour.cost == 14
+
+def test_directed():
+    arrays = euclidean(30, 2, directed=True)
+    constructed = solve_tsp(arrays, local_search=False)
+    tour = solve_tsp(arrays, seed=0)
+
+    assert is_tour(arrays, tour.order)
+    assert tour.cost <= constructed.cost
+    assert tour.cost == pytest.approx(tour_cost(arrays, tour.order))
+
+    with pytest.raises(ValueError):
+        solve_tsp(arrays, construction="christofides")
+
+def test_time_limit_and_restarts():
+    arrays = euclidean(100, 3)
+    tour = solve_tsp(arrays, time_limit=0.0)
+    assert is_tour(arrays, tour.order)
+
+    single = solve_tsp(arrays, seed=4)
+    best = solve_tsp(arrays, restarts=4, workers=2, seed=4)
+    assert is_tour(arrays, best.order)
+    assert best.cost <= single.cost + 1e-9
+
+def test_clarke_wright():
+    arrays = euclidean(25, 5)
+    demands = {v: 1 + v % 3 for v in range(1, 25)}
+    result = clarke_wright(arrays, 0, demands, capacity=10)
+
+    stops = [v for route in result.routes for v in route]
+    assert sorted(stops) == list(range(1, 25))
+    assert all(sum(demands[v] for v in route) <= 10 for route in result.routes)
+    assert result.cost == pytest.approx(sum(tour_cost(arrays, [0] + route) for route in result.routes))
+
+    # Merging beats sending a vehicle to every stop
+    assert result.cost < sum(tour_cost(arrays, [0, v]) for v in range(1, 25))
+
+    with pytest.raises(ValueError):
+        clarke_wright(arrays, 0, {1: 11}, capacity=10)
+
+def test_clarke_wright_single_vehicle():
+    arrays = euclidean(12, 6)
+    result = clarke_wright(arrays, 0)
+
+    assert len(result.routes) == 1
+    assert sorted(result.routes[0]) == list(range(1, 12))
@@ -0,0 +1,112 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+import numpy as np
+
+from optimization.graph.graph import Graph, NormalGraph
+from optimization.graph import DirectedGraph, WeightedGraph, DirectedWeightedGraph
+from optimization.graph import NaiveGraph, AdjacencySet, IncidenceMatrix
+from optimization.graph import CachedGraph, AttributedGraph, ObservableGraph, EdgeArrays, CSR
+from optimization.graph import share, attach
+
+types = [NormalGraph, WeightedGraph, DirectedGraph, DirectedWeightedGraph]
+representations = [NaiveGraph, AdjacencySet, IncidenceMatrix]
+
+def make(type_, repr_, *mixins, vertices="abcde"):
+    cls = Graph.from_types(type_, repr_, *mixins)
+    vertices = list(vertices)
+    pairs = [(vertices[0], vertices[1], 1.5), (vertices[1], vertices[2], 2.0), (vertices[3], vertices[2], 0.5)]
+    return cls.from_vertices_and_edges(vertices, [cls.create_edge_from_vertices(*pair) for pair in pairs])
+
+def assert_same(g, h):
+    assert type(h) is type(g)
+    assert set(h.vertices) == set(g.vertices)
+    assert sorted(map(tuple, h.edges), key=repr) == sorted(map(tuple, g.edges), key=repr)
+    if isinstance(g, WeightedGraph):
+        for v1, v2 in g.edges:
+            assert h.get_edge_weight(v1, v2) == g.get_edge_weight(v1, v2)
+
+@pytest.mark.parametrize("type_", types)
+@pytest.mark.parametrize("repr_", representations)
+def test_pickle_round_trip(type_, repr_):
+    g = make(type_, repr_)
+    assert_same(g, pickle.loads(pickle.dumps(g)))
+
+@pytest.mark.parametrize("vertices", [range(5), [10, 3, 7, 0, 5], [-1, 2, 3, 4, 2**70], ["a", 1, 2.5, None, (1, 2)]])
+def test_vertex_tables(vertices):
+    g = make(NormalGraph, AdjacencySet, vertices=vertices)
+    h = pickle.loads(pickle.dumps(g))
+    assert_same(g, h)
+    assert list(h.vertices) == list(g.vertices)
+
+def test_out_of_band_buffers():
+    g = make(WeightedGraph, AdjacencySet, vertices=range(1000, 1005))
+    buffers = []
+    data = pickle.dumps(g, protocol=5, buffer_callback=buffers.append)
+
+    assert buffers
+    assert_same(g, pickle.loads(data, buffers=buffers))
+
+def test_smaller_than_default_pickle():
+    rng = np.random.default_rng(0)
+    edges = rng.integers(0, 2000, size=(10000, 2))
+    g = Graph.from_types(NormalGraph, AdjacencySet).from_edge_arrays(EdgeArrays(range(2000), edges[:, 0], edges[:, 1]))
+
+    assert len(pickle.dumps(g)) < len(pickle.dumps(g.__dict__)) / 2
+
+def test_mixins():
+    g = make(NormalGraph, AdjacencySet, CachedGraph, AttributedGraph, ObservableGraph)
+    g.vertex_attrs.add_column("cost", default=1.0)
+    g.vertex_attrs.set("cost", ["a"], [4.0])
+    g.degree("a")
+    g.add_vertex("f")
+
+    h = pickle.loads(pickle.dumps(g))
+    assert_same(g, h)
+    assert h.vertex_attrs.get("cost", ["a", "f"]).tolist() == [4.0, 1.0]
+    assert h.cache_info().currsize == 0
+    assert h.changes.last_seq == 0
+
+    h.add_edge("a", "f")
+    assert h.is_adjacent("f", "a")
+    assert ("a", "f") in h.edge_attrs
+
+def test_share_and_attach():
+    g = make(WeightedGraph, AdjacencySet)
+    with share(g) as shared:
+        arrays = attach(shared.handle)
+        assert isinstance(arrays, EdgeArrays)
+        assert sorted(arrays) == sorted(map(tuple, g.edges))
+        assert not arrays.src.flags.writeable
+        assert attach(shared.handle) is arrays
+
+        assert_same(g, attach(shared.handle, rebuild=True))
+
+    csr = EdgeArrays(range(3), [0, 1], [1, 2]).to_csr()
+    with share(csr) as shared:
+        attached = attach(shared.handle)
+        assert isinstance(attached, CSR)
+        assert attached.indices.tolist() == csr.indices.tolist()
+        assert attached.data is None
+
+        with pytest.raises(ValueError):
+            attach(shared.handle, rebuild=True)
+
+@pytest.mark.parametrize("repr_", [NaiveGraph, AdjacencySet])
+def test_share_missing_weights(repr_):
+    g = make(WeightedGraph, repr_)
+    g.add_edge("d", "e")
+    assert g.to_edge_arrays().weights.dtype.hasobject
+
+    with share(g) as shared:
+        assert_same(g, attach(shared.handle, rebuild=True))
+        assert None in attach(shared.handle).weights.tolist()
+
+def _count_edges(handle):
+    return attach(handle).edge_count, attach(handle, rebuild=True).vertex_count
+
+def test_workers():
+    g = make(DirectedGraph, AdjacencySet, vertices=["x", "y", "z", "w", "v"])
+    with share(g) as shared, ProcessPoolExecutor(2) as pool:
+        assert list(pool.map(_count_edges, [shared.handle] * 4)) == [(3, 5)] * 4
@@ -0,0 +1,80 @@
+import tracemalloc
+
+import pytest
+import numpy as np
+
+from optimization.graph.graph import Graph, NormalGraph
+from optimization.graph import Edge, AdjacencySet, NaiveGraph, CachedGraph, EdgeArrays
+from optimization.graph.generators import erdos_renyi
+from optimization.graph.algorithms import triangle_count, triangles, local_clustering, global_clustering
+from optimization.graph.algorithms import common_neighbors, jaccard
+
+@pytest.fixture
+def graph():
+    # Two triangles sharing the edge b-c, plus a pendant vertex e
+    edges = [Edge("a", "b"), Edge("a", "c"), Edge("b", "c"), Edge("b", "d"), Edge("c", "d"), Edge("d", "e")]
+    return Graph.from_types(NormalGraph, AdjacencySet).from_vertices_and_edges(list("abcde"), edges)
+
+def by_vertex(graph, values):
+    return dict(zip(graph.vertices, np.asarray(values).tolist()))
+
+def test_triangle_count(graph):
+    assert triangle_count(graph) == 2
+
+def test_triangles(graph):
+    assert by_vertex(graph, triangles(graph)) == {"a": 1, "b": 2, "c": 2, "d": 1, "e": 0}
+
+def test_clustering(graph):
+    clustering = by_vertex(graph, local_clustering(graph))
+    assert clustering["a"] == 1.0
+    assert clustering["b"] == pytest.approx(2 / 3)
+    assert clustering["d"] == pytest.approx(1 / 3)
+    assert clustering["e"] == 0.0
+
+    # 6 closed triples out of 1 + 3 + 3 + 3 wedges
+    assert global_clustering(graph) == pytest.approx(6 / 10)
+
+def test_common_neighbors_and_jaccard(graph):
+    assert common_neighbors(graph, ["a", "b", "a"], ["d", "c", "e"]).tolist() == [2, 2, 0]
+    assert jaccard(graph, ["a", "e"], ["d", "a"]).tolist() == pytest.approx([2 / 3, 0.0])
+
+    with pytest.raises(ValueError):
+        common_neighbors(graph, ["a"], ["foobar"])
+
+def test_matches_brute_force_in_blocks():
+    arrays = erdos_renyi(120, 0.15, seed=11)
+    dense = np.zeros((120, 120), dtype=np.int64)
+    dense[arrays.src, arrays.dst] = dense[arrays.dst, arrays.src] = 1
+    expected = np.diag(dense @ dense @ dense) // 2
+
+    assert triangle_count(arrays, block_wedges=50) == expected.sum() // 3
+    assert triangles(arrays, block_wedges=50).tolist() == expected.tolist()
+
+def test_hub_in_small_blocks():
+    # Every leaf points at the hub in the degree ordering, so the hub has a huge in-degree
+    n = 20001
+    leaves = np.arange(1, n)
+    arrays = EdgeArrays(range(n), np.concatenate((np.zeros(n - 1, dtype=np.int64), leaves[::2])),
+                        np.concatenate((leaves, leaves[1::2])))
+
+    tracemalloc.start()
+    counts = triangles(arrays, block_wedges=10_000)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert counts[0] == (n - 1) // 2
+    assert (counts[1:] == 1).all()
+    assert triangle_count(arrays, block_wedges=10_000) == (n - 1) // 2
+    assert peak < 20 * 2**20
+
+def test_cached_graph_reuses_adjacency(graph):
+    cls = Graph.from_types(NormalGraph, NaiveGraph, CachedGraph)
+    g = cls.from_edge_arrays(graph.to_edge_arrays())
+
+    assert triangle_count(g) == 2
+    misses = g.cache_info().misses
+    assert triangle_count(g) == 2
+    assert g.cache_info().misses == misses
+
+    g.add_edge("a", "d")
+    assert triangle_count(g) == 4
@@ -0,0 +1,162 @@
+import heapq
+import random
+
+import pytest
+
+from optimization.set import BucketQueue, IndexedHeap
+
+@pytest.mark.parametrize("arity", [2, 3, 4])
+def test_against_heapq(arity):
+    rng = random.Random(arity)
+    heap = IndexedHeap(((i, rng.random()) for i in range(200)), arity=arity)
+    current = {i: heap.priority(i) for i in range(200)}
+
+    for _ in range(1000):
+        i, p = rng.randrange(300), rng.random()
+        op = rng.random()
+        if op < 0.4:
+            heap.update(i, p)
+            current[i] = p
+        elif op < 0.7:
+            if heap.decrease_key(i, p):
+                assert p < current.get(i, float("inf"))
+                current[i] = p
+            else:
+                assert current[i] <= p
+        elif op < 0.8:
+            heap.discard(i)
+            current.pop(i, None)
+        else:
+            item, priority = heap.pop_min()
+            assert priority == min(current.values())
+            assert current.pop(item) == priority
+
+        assert len(heap) == len(current)
+
+    assert list(heap) == sorted(current, key=current.get)
+    expected = sorted((p, i) for i, p in current.items())
+    assert [heap.pop_min() for _ in range(len(heap))] == [(i, p) for p, i in expected]
+
+def test_operations():
+    heap = IndexedHeap([("a", 5), ("b", 3), ("c", 4)])
+    assert len(heap) == 3 and "a" in heap and "z" not in heap
+    assert heap.peek_min() == ("b", 3)
+
+    assert heap.decrease_key("a", 1)
+    assert not heap.decrease_key("a", 2)
+    assert heap.priority("a") == 1
+
+    heap.update("a", 10)
+    assert heap.remove("c") == 4
+    assert list(heap) == ["b", "a"]
+    assert heap.pop_min() == ("b", 3)
+
+    heap.clear()
+    assert not heap
+
+def test_errors():
+    with pytest.raises(ValueError):
+        IndexedHeap(arity=1)
+    with pytest.raises(ValueError):
+        IndexedHeap([("a", 1), ("a", 2)])
+
+    heap = IndexedHeap([("a", 1)])
+    with pytest.raises(ValueError):
+        heap.push("a", 0)
+    with pytest.raises(KeyError):
+        heap.remove("z")
+    with pytest.raises(KeyError):
+        heap.priority("z")
+
+    heap.pop_min()
+    with pytest.raises(IndexError):
+        heap.pop_min()
+    with pytest.raises(IndexError):
+        heap.peek_min()
+
+def test_dijkstra():
+    rng = random.Random(0)
+    n = 300
+    adjacency = [[(rng.randrange(n), rng.random()) for _ in range(4)] for _ in range(n)]
+
+    expected = [float("inf")] * n
+    expected[0] = 0
+    lazy = [(0, 0)]
+    while lazy:
+        d, u = heapq.heappop(lazy)
+        if d > expected[u]:
+            continue
+        for v, w in adjacency[u]:
+            if d + w < expected[v]:
+                expected[v] = d + w
+                heapq.heappush(lazy, (d + w, v))
+
+    dist = [float("inf")] * n
+    dist[0] = 0
+    heap = IndexedHeap([(0, 0)], arity=4)
+    while heap:
+        u, d = heap.pop_min()
+        for v, w in adjacency[u]:
+            if d + w < dist[v]:
+                dist[v] = d + w
+                heap.decrease_key(v, d + w)
+
+    assert dist == expected
+
+def test_bucket_queue():
+    queue = BucketQueue([("a", 2), ("b", 0), ("c", 2), ("d", 5)])
+    assert len(queue) == 4 and "a" in queue
+    assert list(queue) == ["b", "c", "a", "d"]
+
+    assert queue.pop_min() == ("b", 0)
+    assert queue.pop_min() == ("c", 2)  # most recently pushed first
+    assert queue.pop_max() == ("d", 5)
+
+    queue.update("a", 7)
+    queue.push("e", 1)
+    assert queue.priority("a") == 7
+    assert queue.pop_min() == ("e", 1)
+    assert queue.pop_max() == ("a", 7)
+    assert not queue
+
+    queue.push("f", 3)
+    assert queue.pop_max() == ("f", 3)
+    queue.push("g", 0)
+    assert queue.pop_min() == ("g", 0)
+
+def test_bucket_queue_against_sorted():
+    rng = random.Random(1)
+    queue = BucketQueue()
+    current = dict()
+
+    for _ in range(2000):
+        op = rng.random()
+        if op < 0.5:
+            i, p = rng.randrange(100), rng.randrange(20)
+            queue.update(i, p)
+            current[i] = p
+        elif op < 0.6:
+            i = rng.randrange(100)
+            queue.discard(i)
+            current.pop(i, None)
+        elif current:
+            item, p = queue.pop_min() if op < 0.8 else queue.pop_max()
+            assert p == (min if op < 0.8 else max)(current.values())
+            assert current.pop(item) == p
+
+    assert [current[i] for i in queue] == sorted(current.values())
+
+def test_bucket_queue_errors():
+    queue = BucketQueue([("a", 1)])
+    with pytest.raises(ValueError):
+        queue.push("a", 2)
+    with pytest.raises(ValueError):
+        queue.update("b", -1)
+    with pytest.raises(KeyError):
+        queue.remove("z")
+
+    queue.clear()
+    with pytest.raises(IndexError):
+        queue.pop_min()
+    with pytest.raises(IndexError):
+        queue.pop_max()
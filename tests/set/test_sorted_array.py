@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from optimization.set import SortedArray
+
+def test_create():
+    s = SortedArray([3, 1, 2, 3])
+    assert list(s) == [1, 2, 3]
+    assert s.dtype == np.int64
+    assert SortedArray().dtype == np.float64
+    assert SortedArray(np.array([], dtype=np.int32)).dtype == np.int32
+
+    empty = SortedArray([1, 2])
+    empty.remove_many([1, 2])
+    copied = empty.copy()
+    copied.add(3)
+    assert copied.dtype == np.int64 and copied.values.tolist() == [3]
+
+    with pytest.raises(ValueError):
+        SortedArray([1.0, np.nan])
+
+def test_single_updates():
+    s = SortedArray([10, 20, 30])
+    s.add(15)
+    s.add(20)
+    s.discard(30)
+    s.discard(99)
+
+    assert list(s) == [10, 15, 20]
+    assert 15 in s and 30 not in s and "x" not in s
+    assert s.index(20) == 2
+    assert s[-1] == 20
+    assert s.pop() == 20
+
+    with pytest.raises(KeyError):
+        s.remove(99)
+    with pytest.raises(ValueError):
+        s.index(99)
+    with pytest.raises(IndexError):
+        s[5]
+
+def test_values_are_cast_before_comparing():
+    s = SortedArray([1, 3])
+    s.add(1.0)
+    assert len(s) == 2
+
+    with pytest.raises(ValueError):
+        s.add(1.5)
+    with pytest.raises(ValueError):
+        s.insert_many([2, 2.5])
+    assert list(s) == [1, 3]
+
+    s.remove_many([1.5, 3.0])
+    assert list(s) == [1]
+
+def test_batches_against_python_set():
+    rng = np.random.default_rng(0)
+    s = SortedArray(dtype=np.int64)
+    reference = set()
+
+    for _ in range(50):
+        batch = rng.integers(0, 1000, rng.integers(0, 100))
+        s.insert_many(batch)
+        reference.update(batch.tolist())
+
+        removed = rng.integers(0, 1000, 20)
+        s.remove_many(removed)
+        reference.difference_update(removed.tolist())
+
+        assert list(s) == sorted(reference)
+
+    probes = rng.integers(0, 1000, 200)
+    assert s.contains_many(probes).tolist() == [p in reference for p in probes.tolist()]
+
+    ordered = sorted(reference)
+    assert s.rank_many(probes).tolist() == [sum(x < p for x in ordered) for p in probes.tolist()]
+    assert s.index_many(ordered[::3]).tolist() == list(range(0, len(ordered), 3))
+
+    with pytest.raises(ValueError):
+        s.index_many([-1])
+
+def test_ranges():
+    s = SortedArray(np.arange(0.0, 10.0))
+
+    assert s.irange(2, 5).tolist() == [2, 3, 4, 5]
+    assert s.irange(2, 5, inclusive=(False, False), reverse=True).tolist() == [4, 3]
+    assert s.count_range(2.5, 100) == 7
+    assert s.bisect_key_right(3) == 4
+    assert s.rank(3) == 3
+    assert s.select(4) == 4.0
+    assert not s.irange().flags.writeable
+
+def test_set_operators():
+    s = SortedArray([1, 2, 3])
+    s |= {5, 4}
+    s -= {1}
+    assert list(s) == [2, 3, 4, 5]
+    assert s == {2, 3, 4, 5}
@@ -0,0 +1,55 @@
+import pytest
+
+from optimization.set import SortedDict
+
+def test_mapping():
+    d = SortedDict({3: "c", 1: "a"})
+    d[2] = "b"
+    d[3] = "C"
+
+    assert list(d) == [1, 2, 3]
+    assert list(d.items()) == [(1, "a"), (2, "b"), (3, "C")]
+    assert list(reversed(d)) == [3, 2, 1]
+    assert d == {1: "a", 2: "b", 3: "C"}
+
+    del d[1]
+    assert list(d.keys()) == [2, 3]
+    with pytest.raises(KeyError):
+        del d[1]
+
+def test_update_and_copy():
+    d = SortedDict(sort_key=lambda k: -k)
+    d.update({1: "a", 5: "e"})
+    d.update([(3, "c"), (1, "A")])
+
+    assert list(d.items()) == [(5, "e"), (3, "c"), (1, "A")]
+
+    e = d.copy()
+    e[4] = "d"
+    assert 4 not in d
+    assert list(e) == [5, 4, 3, 1]
+
+def test_positions():
+    d = SortedDict((k, str(k)) for k in range(10))
+
+    assert d.peekitem() == (9, "9")
+    assert d.peekitem(0) == (0, "0")
+    assert d.popitem() == (9, "9")
+    assert d.popitem(0) == (0, "0")
+    assert len(d) == 8
+
+    assert d.select(2) == 3
+    assert d.rank(5) == 4
+
+    d.clear()
+    with pytest.raises(KeyError):
+        d.popitem()
+
+def test_ranges():
+    d = SortedDict((t, t * 10) for t in [5, 1, 9, 3, 7])
+
+    assert list(d.irange(3, 7)) == [3, 5, 7]
+    assert list(d.irange(3, 7, inclusive=(False, True), reverse=True)) == [7, 5]
+    assert d.count_range(2, 8) == 3
+    assert d.bisect_key_left(5) == 2
+    assert d.bisect_key_right(5) == 3
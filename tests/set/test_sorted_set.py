@@ -1,38 +1,47 @@
+import random
+
 import pytest
 
 from optimization.set.sorted_set import SortedSet
 
+def try_insert(s, item):
+    """Whether an item would be inserted, and at which position (or the position it is at)."""
+    if item in s:
+        return (False, s.index(item))
+
+    return (True, s.bisect_key_left(s.sort_key(item)))
+
 def test_find_insert():
     s = SortedSet(list())
     s.items = [0, 1, 2]
 
-    assert s._try_insert(-1) == (True, 0)
-    assert s._try_insert(0) == (False, 0)
-    assert s._try_insert(1) == (False, 1)
-    assert s._try_insert(2) == (False, 2)
-    assert s._try_insert(3) == (True, 3)
+    assert try_insert(s, -1) == (True, 0)
+    assert try_insert(s, 0) == (False, 0)
+    assert try_insert(s, 1) == (False, 1)
+    assert try_insert(s, 2) == (False, 2)
+    assert try_insert(s, 3) == (True, 3)
     
-    assert s._try_insert(0.5) == (True, 1)
-    assert s._try_insert(1.5) == (True, 2)
+    assert try_insert(s, 0.5) == (True, 1)
+    assert try_insert(s, 1.5) == (True, 2)
 
     s = SortedSet(list())
     s.items = [0, 1, 2, 3]
     
-    assert s._try_insert(-1) == (True, 0)
-    assert s._try_insert(0) == (False, 0)
-    assert s._try_insert(1) == (False, 1)
-    assert s._try_insert(4) == (True, 4)
+    assert try_insert(s, -1) == (True, 0)
+    assert try_insert(s, 0) == (False, 0)
+    assert try_insert(s, 1) == (False, 1)
+    assert try_insert(s, 4) == (True, 4)
     
-    assert s._try_insert(0.5) == (True, 1)
-    assert s._try_insert(1.5) == (True, 2)
-    assert s._try_insert(2.5) == (True, 3)
+    assert try_insert(s, 0.5) == (True, 1)
+    assert try_insert(s, 1.5) == (True, 2)
+    assert try_insert(s, 2.5) == (True, 3)
 
-def test_try_insert_with_tuples():
+def test_find_insert_with_tuples():
     s = SortedSet(sort_key=lambda t: t[0])
     s.items = [(1, 2)]
 
-    assert s._try_insert((1, 2)) == (False, 0)
-    assert s._try_insert((1, 3)) == (True, 0)
+    assert try_insert(s, (1, 2)) == (False, 0)
+    assert try_insert(s, (1, 3)) == (True, 0)
 
 def test_create():
     assert SortedSet([1, 2, 3]).items == [1, 2, 3]
@@ -87,4 +96,177 @@ def test_symmetric_difference():
     s2 = SortedSet([2, 3])
 
     assert s1.symmetric_difference(s2).items == [1, 3]
-    assert (s1 ^ s2).items == [1, 3]
\ No newline at end of file
+    assert (s1 ^ s2).items == [1, 3]
+
+def test_slices():
+    s = SortedSet(range(50))
+    s.load = 4
+    s.items = list(range(50))
+    reference = list(range(50))
+
+    for idx in [slice(10, 20), slice(None, 7), slice(45, None), slice(3, 40, 7), slice(None, None, -3),
+                slice(30, 5, -4), slice(20, 10), slice(-5, None), slice(100, 200)]:
+        assert s[idx] == reference[idx]
+
+    for idx in [slice(5, 9), slice(0, 40, 9), slice(None, None, -10), slice(3, 30)]:
+        del s[idx]
+        del reference[idx]
+        assert s.items == reference
+        assert [s.index(x) for x in reference] == list(range(len(reference)))
+
+def test_chunked_against_list():
+    rng = random.Random(0)
+
+    s = SortedSet()
+    s.load = 4
+    reference = []
+
+    for _ in range(3000):
+        x = rng.randrange(300)
+        if rng.random() < 0.6:
+            s.add(x)
+            if x not in reference:
+                reference.append(x)
+                reference.sort()
+        elif reference and rng.random() < 0.5:
+            i = rng.randrange(-len(reference), len(reference))
+            assert s[i] == reference[i]
+            del s[i]
+            del reference[i]
+        else:
+            s.discard(x)
+            if x in reference:
+                reference.remove(x)
+
+        assert len(s) == len(reference)
+
+    assert s.items == reference
+    assert list(reversed(s)) == reference[::-1]
+    assert [s.index(x) for x in reference] == list(range(len(reference)))
+    assert max(len(sub) for sub in s._lists) <= 2 * s.load
+
+def test_positions_with_equal_keys():
+    s = SortedSet(sort_key=lambda t: t[0])
+    s.load = 2
+    for item in [(1, "a"), (2, "a"), (2, "b"), (2, "c"), (2, "d"), (3, "a")]:
+        s.add(item)
+
+    # Items with an equal key go before the existing ones
+    assert s.items == [(1, "a"), (2, "d"), (2, "c"), (2, "b"), (2, "a"), (3, "a")]
+    assert s.index((2, "a")) == 4
+    assert (2, "c") in s
+    assert try_insert(s, (2, "e")) == (True, 1)
+    assert s.search_value(3) == 5
+
+    s.remove((2, "b"))
+    assert s.items == [(1, "a"), (2, "d"), (2, "c"), (2, "a"), (3, "a")]
+    assert s[-1] == (3, "a")
+    assert s.pop() == (3, "a")
+
+    with pytest.raises(KeyError):
+        s.remove((2, "b"))
+    with pytest.raises(IndexError):
+        s[10]
+
+def test_sort_key_called_once_per_item():
+    calls = []
+    def key(x):
+        calls.append(x)
+        return -x
+
+    s = SortedSet(range(100), sort_key=key)
+    assert len(calls) == 100
+
+    calls.clear()
+    assert 50 in s
+    assert s.index(50) == 49
+    assert list(s.values)[:3] == [-99, -98, -97]
+    assert s.value_at(0) == -99
+    assert calls == [50, 50]
+
+def test_contains_with_equal_keys():
+    s = SortedSet([(1, "a"), (1, "b"), (1, "c"), (2, "a")], sort_key=lambda t: t[0])
+
+    assert (1, "c") in s
+    assert (1, "d") not in s
+    assert (3, "a") not in s
+    assert "x" not in SortedSet([1, 2, 3])
+    assert s.issuperset([(1, "b"), (2, "a")])
+
+def test_bulk_construction():
+    s = SortedSet([5, 3, 5, 1, 3])
+    assert s.items == [1, 3, 5]
+
+    s = SortedSet([(1, "a"), (0, "b"), (1, "a"), (1, "c")], sort_key=lambda t: t[0])
+    assert s.items == [(0, "b"), (1, "a"), (1, "c")]
+
+@pytest.mark.parametrize("operand", ["sorted_set", "set", "list"])
+def test_set_algebra_against_builtin_sets(operand):
+    rng = random.Random(1)
+    key = lambda t: t[0]
+
+    for _ in range(50):
+        a = {(rng.randrange(20), rng.randrange(3)) for _ in range(rng.randrange(30))}
+        b = {(rng.randrange(20), rng.randrange(3)) for _ in range(rng.randrange(30))}
+        s = SortedSet(a, sort_key=key)
+        other = {"sorted_set": SortedSet(b, sort_key=key), "set": b, "list": [*b, *list(b)[:3]]}[operand]
+
+        results = [(s.union(other), a | b), (s.intersection(other), a & b),
+                   (s.difference(other), a - b), (s.symmetric_difference(other), a ^ b)]
+        if operand != "list": # like set, the operators only take sets
+            results += [(s | other, a | b), (s & other, a & b), (s - other, a - b), (s ^ other, a ^ b)]
+
+        for result, expected in results:
+            assert set(result) == expected
+            assert len(result) == len(expected)
+            assert list(result.values) == sorted(map(key, expected))
+
+        for method, expected in [("update", a | b), ("intersection_update", a & b),
+                                 ("difference_update", a - b), ("symmetric_difference_update", a ^ b)]:
+            t = s.copy()
+            getattr(t, method)(other)
+            assert set(t) == expected
+            assert [t.index(x) for x in t] == list(range(len(t)))
+
+def test_in_place_operators():
+    s = SortedSet([1, 2, 3])
+    s |= {4}
+    s &= {1, 2, 4}
+    s -= {1}
+    s ^= {2, 5}
+    assert s.items == [4, 5]
+
+    s -= s
+    assert len(s) == 0
+
+def test_range_queries():
+    s = SortedSet(range(0, 100, 2))
+    s.load = 4
+    s.items = list(range(0, 100, 2))
+
+    assert list(s.irange(10, 20)) == [10, 12, 14, 16, 18, 20]
+    assert list(s.irange(10, 20, inclusive=(False, False))) == [12, 14, 16, 18]
+    assert list(s.irange(11, 19)) == [12, 14, 16, 18]
+    assert list(s.irange(90)) == [90, 92, 94, 96, 98]
+    assert list(s.irange(max_key=4, reverse=True)) == [4, 2, 0]
+    assert list(s.irange(20, 10)) == []
+    assert list(s.irange(5, 5)) == []
+
+    assert s.count_range(10, 20) == 6
+    assert s.count_range(10, 20, inclusive=(False, True)) == 5
+    assert s.count_range(20, 10) == 0
+    assert s.count_range() == 50
+
+    assert s.bisect_key_left(10) == 5
+    assert s.bisect_key_right(10) == 6
+    assert s.bisect_key_right(11) == 6
+    assert s.rank(1000) == 50
+    assert s.select(7) == 14
+
+def test_range_queries_with_equal_keys():
+    s = SortedSet([(1, "a"), (2, "a"), (2, "b"), (3, "a")], sort_key=lambda t: t[0])
+
+    assert set(s.irange(2, 2)) == {(2, "a"), (2, "b")}
+    assert s.bisect_key_left(2) == 1
+    assert s.bisect_key_right(2) == 3
+    assert s.count_range(2, 3, inclusive=(True, False)) == 2